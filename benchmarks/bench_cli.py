@@ -0,0 +1,217 @@
+"""
+Benchmark the CLI commands against the mock Konnect API on synthetic API products.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_cli [--docs 10,100,1000] [--versions 5,50]
+        [--portals 2,10] [--rounds N] [--output FILE] [--compare BASELINE]
+
+For each combination of sizes, a synthetic product is written and a fresh mock server is
+started, see `benchmarks.mock_server`. Then `sync` is run on the empty mock (cold) and
+again with nothing to change (warm), followed by `diff` and `validate`. The wall time,
+number of requests and peak memory of each command are written as JSON with the commit
+they were measured on. `--compare` prints the change of each measure against the JSON
+results of an earlier run, e.g. of another commit.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_startup import MAIN
+from kptl.gen import write_product
+
+COMMANDS = ["sync-cold", "sync-warm", "diff", "validate"]
+MEASURES = ["wall_time", "requests", "peak_rss_kib"]
+
+
+def sizes(value: str) -> List[int]:
+    """
+    Parse a comma-separated list of sizes.
+    """
+    return [int(size) for size in value.split(",")]
+
+
+def wait_for_port(port: int, timeout: float = 30) -> None:
+    """
+    Wait for a server to listen on a local port.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"The mock server did not start on port {port}")
+
+
+def start_mock(port: int, portals: int) -> subprocess.Popen:
+    """
+    Start a mock server with no API products.
+    """
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.mock_server",
+                               "--port", str(port), "--portals", str(portals)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(port)
+    return server
+
+
+def run_command(command: List[str], calls_file: Optional[str] = None, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run a CLI command, returning its wall time in seconds, its number of requests, and the
+    peak resident memory of its process in KiB.
+    """
+    if calls_file:
+        command = command + ["--report-calls", calls_file]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=cwd, env=cli_env())
+    # wait4 gives the resource usage of this child alone
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    requests = 0
+    if calls_file:
+        with open(calls_file, encoding="utf-8") as f:
+            requests = json.load(f)["requests"]
+    return {"wall_time": wall_time, "requests": requests, "peak_rss_kib": usage.ru_maxrss,
+            "returncode": process.returncode}
+
+
+def cli_env() -> Dict[str, str]:
+    """
+    Return the environment of the CLI, with `src` on the Python path whatever its working directory.
+    """
+    paths = [os.path.abspath("src")] + [os.path.abspath(path) for path in
+                                        os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(paths))
+
+
+def run_scenario(docs: int, versions: int, portals: int, rounds: int, port: int) -> List[Dict[str, Any]]:
+    """
+    Run the commands on a synthetic product, keeping the best of each measure over the rounds.
+    """
+    cli = [sys.executable, os.path.abspath(MAIN)]
+    remote = ["--konnect-url", f"http://127.0.0.1:{port}", "--konnect-token", "benchmark"]
+    best: Dict[str, Dict[str, Any]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = write_product(tmp, f"Benchmark {docs} docs {versions} versions {portals} portals",
+                              docs, versions, portals, spec_format="json")
+        calls_file = os.path.join(tmp, "calls.json")
+        commands = {
+            "sync-cold": cli + ["sync", state] + remote,
+            "sync-warm": cli + ["sync", state] + remote,
+            "diff": cli + ["diff", state] + remote,
+            "validate": cli + ["validate", state],
+        }
+
+        for _ in range(rounds):
+            server = start_mock(port, portals)
+            # each round runs in its own working directory, so that the cold sync does not
+            # find the docs index written by the previous round
+            workdir = tempfile.mkdtemp(dir=tmp)
+            try:
+                for name in COMMANDS:
+                    result = run_command(commands[name], calls_file if name != "validate" else None, workdir)
+                    if name not in best:
+                        best[name] = result
+                    else:
+                        for measure in MEASURES:
+                            best[name][measure] = min(best[name][measure], result[measure])
+                        best[name]["returncode"] = max(best[name]["returncode"], result["returncode"])
+            finally:
+                server.terminate()
+                server.wait()
+
+    scenario = {"docs": docs, "versions": versions, "portals": portals}
+    return [{"scenario": scenario, "command": name, **best[name]} for name in COMMANDS]
+
+
+def git_commit() -> Optional[str]:
+    """
+    Return the commit of the working tree, if it is a git repository.
+    """
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False)
+    return result.stdout.strip() or None
+
+
+def result_key(result: Dict[str, Any]) -> tuple:
+    """
+    Return the scenario and command of a result, to match results across runs.
+    """
+    scenario = result["scenario"]
+    return scenario["docs"], scenario["versions"], scenario["portals"], result["command"]
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Print the results, with the change of each measure against the baseline results.
+    """
+    previous = {result_key(result): result for result in (baseline or {}).get("results", [])}
+
+    def change(result, measure):
+        before = previous.get(result_key(result), {}).get(measure)
+        return f"{(result[measure] - before) / before * 100:+6.1f}%" if before else ""
+
+    print(f"{'docs':>5} {'versions':>8} {'portals':>7} {'command':<10} {'wall time':>10} {'':>7} "
+          f"{'requests':>8} {'':>7} {'peak rss':>10} {'':>7}")
+    for result in results:
+        scenario = result["scenario"]
+        failed = " (failed)" if result["returncode"] else ""
+        print(f"{scenario['docs']:>5} {scenario['versions']:>8} {scenario['portals']:>7} {result['command']:<10} "
+              f"{result['wall_time'] * 1000:8.0f}ms {change(result, 'wall_time'):>7} "
+              f"{result['requests']:>8} {change(result, 'requests'):>7} "
+              f"{result['peak_rss_kib'] / 1024:8.1f}MB {change(result, 'peak_rss_kib'):>7}{failed}")
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=sizes, default=[10, 100, 1000], help="Numbers of documents")
+    parser.add_argument("--versions", type=sizes, default=[5, 50], help="Numbers of versions")
+    parser.add_argument("--portals", type=sizes, default=[2, 10], help="Numbers of portals")
+    parser.add_argument("--rounds", type=int, default=1, help="Number of rounds per scenario")
+    parser.add_argument("--port", type=int, default=8081, help="Port of the mock server")
+    parser.add_argument("--output", default="benchmark-results.json", help="File to write the JSON results to")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = []
+    for docs, versions, portals in itertools.product(args.docs, args.versions, args.portals):
+        results.extend(run_scenario(docs, versions, portals, args.rounds, args.port))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": args.rounds,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results, baseline)
+    if baseline:
+        print(f"\nCompared with {baseline.get('commit') or args.compare}")
+    print(f"\nResults written to {args.output}")
+    if any(result["returncode"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark preparing the pages of a large documents directory.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_documents [--pages N] [--size BYTES] [--rounds N] [DIRECTORY]
+
+A synthetic documents directory (or the given one) is parsed with a single reader thread
+and with the default thread pool, reporting the best time of each.
+"""
+
+import argparse
+import tempfile
+
+from benchmarks.bench_yaml_loaders import best_time
+from kptl.gen import write_docs
+from kptl.helpers import api_product_documents
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", nargs="?", help="Documents directory, defaults to a synthetic one")
+    parser.add_argument("--pages", type=int, default=2000, help="Number of pages of the synthetic directory")
+    parser.add_argument("--size", type=int, default=8192, help="Size in bytes of each synthetic page")
+    parser.add_argument("--rounds", type=int, default=3, help="Number of rounds per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.directory
+        if not directory:
+            directory = tmp
+            write_docs(directory, args.pages, args.size, children=9)
+
+        def parse(max_workers):
+            return lambda: list(api_product_documents.iter_directory(directory, max_workers))
+
+        sequential = best_time(parse(1), args.rounds)
+        threaded = best_time(parse(None), args.rounds)
+
+    print(f"{'pages':>8} {'1 thread':>12} {f'{api_product_documents.DEFAULT_WORKERS} threads':>12} {'speedup':>8}")
+    print(f"{args.pages if not args.directory else '-':>8} {sequential * 1000:10.1f}ms "
+          f"{threaded * 1000:10.1f}ms {sequential / threaded:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
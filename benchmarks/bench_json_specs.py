@@ -0,0 +1,62 @@
+"""
+Benchmark parsing JSON OpenAPI specs with the YAML loader, the standard library and orjson.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_json_specs [--paths N] [--schemas N] [--rounds N] [SPEC ...]
+
+The example specs converted to JSON and a synthetic large JSON spec are parsed with the
+libyaml loader (how JSON specs were parsed before), `json` and `orjson` when installed,
+reporting the best time of each and the speedup of `kptl.helpers.utils.parse_oas`.
+"""
+
+import argparse
+import json
+
+import yaml
+
+from benchmarks.bench_yaml_loaders import best_time
+from benchmarks.specs import add_spec_arguments, load_documents
+from kptl.helpers import utils
+
+
+def dump_json(spec: object) -> bytes:
+    """
+    Serialize a spec as JSON.
+    """
+    return json.dumps(spec, indent=2).encode("utf-8")
+
+
+def to_json(spec_file: str, content: bytes) -> bytes:
+    """
+    Convert a spec to JSON, unless it already is.
+    """
+    return content if utils.is_json_content(spec_file, content) else dump_json(utils.parse_yaml(content))
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_spec_arguments(parser, "Number of rounds per parser")
+    args = parser.parse_args()
+
+    if utils.orjson_module() is None:
+        print("orjson is not installed, parse_oas uses the standard library json module.")
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    print(f"{'document':<50} {'size':>10} {'yaml':>12} {'json':>12} {'orjson':>12} {'speedup':>8}")
+    for name, content in load_documents(args, dump_json, to_json):
+        yaml_time = best_time(lambda c=content: yaml.load(c, Loader=loader), args.rounds)
+        json_time = best_time(lambda c=content: json.loads(c), args.rounds)
+        if utils.orjson_module() is not None:
+            orjson_time = best_time(lambda c=content: utils.orjson_module().loads(c), args.rounds)
+            orjson_column = f"{orjson_time * 1000:10.1f}ms"
+        else:
+            orjson_time, orjson_column = json_time, f"{'n/a':>12}"
+        print(f"{name:<50} {len(content) / 1024:8.0f}KB {yaml_time * 1000:10.1f}ms "
+              f"{json_time * 1000:10.1f}ms {orjson_column} {yaml_time / orjson_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark the startup time of the packaged distributions of the CLI.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_packaging [--rounds N] [STATE]
+
+Build the distributions to compare first, e.g. `make package package-onedir zipapp`.
+The wall time of `kptl --version` and `kptl validate` on the example state file (or the
+given one) is measured for each distribution that exists in `dist`, and for the sources.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Tuple
+
+from benchmarks.bench_startup import MAIN, best_run_time
+
+DIST_DIR = "dist"
+
+
+def distributions() -> List[Tuple[str, List[str]]]:
+    """
+    Return the name and command of the sources and of each built distribution.
+    """
+    candidates = [
+        ("sources", [sys.executable, MAIN]),
+        ("pyinstaller --onefile", [os.path.join(DIST_DIR, "kptl")]),
+        ("pyinstaller --onedir", [os.path.join(DIST_DIR, "onedir", "kptl", "kptl")]),
+        ("zipapp", [sys.executable, os.path.join(DIST_DIR, "kptl.pyz")]),
+    ]
+    return [(name, command) for name, command in candidates
+            if name == "sources" or os.path.isfile(command[-1])]
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("state", nargs="?", default="examples/products/httpbin/state.yaml",
+                        help="State file to validate")
+    parser.add_argument("--rounds", type=int, default=10, help="Number of rounds per distribution")
+    args = parser.parse_args()
+
+    print(f"{'distribution':<24} {'--version':>12} {'validate':>12}")
+    for name, command in distributions():
+        version = best_run_time(command + ["--version"], args.rounds)
+        validate = best_run_time(command + ["validate", args.state], args.rounds)
+        print(f"{name:<24} {version * 1000:10.1f}ms {validate * 1000:10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark the startup time of the CLI.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_startup [--rounds N] [--top N] [--budget MS] [STATE]
+
+The import time of `kptl.main` and of each command module is measured in fresh interpreters
+with `python -X importtime`, along with the wall time of `kptl validate` on the example state
+file (or the given one) and of a bare interpreter. The heaviest imports of `kptl validate` are
+listed, and the benchmark exits with status 1 if its wall time is over the `--budget`.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+MODULES = [
+    "kptl.main",
+    "kptl.commands.validate",
+    "kptl.commands.explain",
+    "kptl.commands.sync",
+    "kptl.commands.diff",
+    "kptl.commands.drift",
+    "kptl.commands.delete",
+]
+MAIN = os.path.join("src", "kptl", "main.py")
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """
+    Run code in a fresh interpreter with `-X importtime`, returning the cumulative import
+    time in microseconds of each module it imported.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=False)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def best_import_time(module: str, rounds: int) -> float:
+    """
+    Return the best import time of a module in a fresh interpreter, in seconds.
+    """
+    return min(import_times(f"import {module}").get(module, 0) for _ in range(rounds)) / 1e6
+
+
+def best_run_time(command: List[str], rounds: int) -> float:
+    """
+    Return the best wall time of a command, in seconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=False)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def heaviest_imports(state: str, top: int) -> List[Tuple[str, int]]:
+    """
+    Return the top-level imports of `kptl validate` with the highest cumulative import time.
+    """
+    code = ("import sys, runpy; sys.argv = ['kptl', 'validate', %r]\n"
+            "try:\n    runpy.run_path(%r, run_name='__main__')\nexcept SystemExit:\n    pass") % (state, MAIN)
+    times = import_times(code)
+    top_level = {}
+    for module, cumulative in times.items():
+        root = module.split(".")[0] if not module.startswith("kptl") else ".".join(module.split(".")[:2])
+        top_level[root] = max(top_level.get(root, 0), cumulative)
+    return sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("state", nargs="?", default="examples/products/httpbin/state.yaml",
+                        help="State file to validate")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of rounds per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest imports to list")
+    parser.add_argument("--budget", type=float, default=None, metavar="MS",
+                        help="Exit with status 1 if `kptl validate` takes longer than this")
+    args = parser.parse_args()
+
+    print(f"{'import':<26} {'time':>10}")
+    for module in MODULES:
+        print(f"{module:<26} {best_import_time(module, args.rounds) * 1000:8.1f}ms")
+
+    interpreter = best_run_time([sys.executable, "-c", "pass"], args.rounds)
+    validate = best_run_time([sys.executable, MAIN, "validate", args.state], args.rounds)
+    print()
+    print(f"{'python -c pass':<26} {interpreter * 1000:8.1f}ms")
+    print(f"{'kptl validate':<26} {validate * 1000:8.1f}ms")
+
+    print()
+    print(f"{'heaviest imports':<26} {'time':>10}")
+    for module, cumulative in heaviest_imports(args.state, args.top):
+        print(f"{module:<26} {cumulative / 1000:8.1f}ms")
+
+    if args.budget is not None and validate * 1000 > args.budget:
+        print(f"\n`kptl validate` took {validate * 1000:.1f}ms, over the budget of {args.budget:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
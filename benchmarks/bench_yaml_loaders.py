@@ -0,0 +1,63 @@
+"""
+Benchmark the pure-Python and libyaml YAML loaders on OpenAPI specs.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_yaml_loaders [--paths N] [--schemas N] [--rounds N] [SPEC ...]
+
+The example specs and a synthetic large spec are parsed with both loaders, reporting
+the best time of each and the speedup of the libyaml loader.
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import yaml
+
+from benchmarks.specs import add_spec_arguments, load_documents
+
+
+def best_time(function: Callable[[], object], rounds: int) -> float:
+    """
+    Return the best wall time of a function over a number of rounds.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def dump_yaml(spec: object) -> bytes:
+    """
+    Serialize a spec as YAML.
+    """
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(spec, Dumper=dumper, sort_keys=False).encode("utf-8")
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_spec_arguments(parser, "Number of rounds per loader")
+    args = parser.parse_args()
+
+    if not yaml.__with_libyaml__:
+        print("PyYAML was built without libyaml, only the pure-Python loader is available.")
+
+    print(f"{'document':<50} {'size':>10} {'SafeLoader':>12} {'CSafeLoader':>12} {'speedup':>8}")
+    for name, content in load_documents(args, dump_yaml):
+        python_time = best_time(lambda c=content: yaml.load(c, Loader=yaml.SafeLoader), args.rounds)
+        if yaml.__with_libyaml__:
+            c_time = best_time(lambda c=content: yaml.load(c, Loader=yaml.CSafeLoader), args.rounds)
+            c_column, speedup = f"{c_time * 1000:10.1f}ms", f"{python_time / c_time:7.1f}x"
+        else:
+            c_column, speedup = f"{'n/a':>12}", f"{'n/a':>8}"
+        print(f"{name:<50} {len(content) / 1024:8.0f}KB {python_time * 1000:10.1f}ms {c_column} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
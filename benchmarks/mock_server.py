@@ -0,0 +1,39 @@
+"""
+Run the mock Konnect API of `mock/app.py` for benchmarks.
+
+Usage:
+    python -m benchmarks.mock_server [--port PORT] [--portals N]
+
+Unlike `python mock/app.py`, the server runs without the debugger and reloader, does not
+log every request, and has `--portals` portals: the two portals of the mock, `dev_portal`
+and `prod_portal`, then `portal_2`, `portal_3`, ... Latency and faults are injected as
+configured by the `MOCK_*` environment variables, see `mock/faults.py`.
+"""
+
+import argparse
+import logging
+
+from kptl.gen import portal_names
+from mock import app as mock_app
+
+
+def main() -> None:
+    """
+    Run the server.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument("--portals", type=int, default=2, help="Number of portals")
+    args = parser.parse_args()
+
+    portals = mock_app.data_stores["portals"]
+    for name in portal_names(args.portals):
+        if not portals.find({"name": name}):
+            portals.create({"name": name, "description": f"Portal {name}"})
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    mock_app.app.run(host="127.0.0.1", port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+OpenAPI specs to benchmark the spec parsers on: the given or example specs, and a synthetic
+large spec.
+"""
+
+import argparse
+import glob
+from typing import Any, Callable, List, Optional, Tuple
+
+from kptl.gen import synthetic_spec
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser, rounds_help: str) -> None:
+    """
+    Add the arguments selecting the specs to benchmark and the number of rounds to a parser.
+    """
+    parser.add_argument("specs", nargs="*", help="Spec files to benchmark, defaults to the example specs")
+    parser.add_argument("--paths", type=int, default=2000, help="Number of paths of the synthetic spec")
+    parser.add_argument("--schemas", type=int, default=500, help="Number of schemas of the synthetic spec")
+    parser.add_argument("--rounds", type=int, default=3, help=rounds_help)
+
+
+def load_documents(args: argparse.Namespace, dump: Callable[[Any], bytes],
+                   convert: Optional[Callable[[str, bytes], bytes]] = None) -> List[Tuple[str, bytes]]:
+    """
+    Load the documents to benchmark: the given or example specs, passed through `convert` when
+    given, and a synthetic spec serialized with `dump`.
+    """
+    documents = []
+    for spec_file in args.specs or sorted(glob.glob("examples/api-specs/**/*.yaml", recursive=True)):
+        with open(spec_file, "rb") as f:
+            content = f.read()
+        documents.append((spec_file, convert(spec_file, content) if convert else content))
+
+    synthetic = dump(synthetic_spec(args.paths, args.schemas))
+    documents.append((f"synthetic ({args.paths} paths, {args.schemas} schemas)", synthetic))
+
+    return documents
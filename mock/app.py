@@ -1,14 +1,25 @@
 """
 This module provides a mock implementation of the Konnect API using Flask and OpenAPI.
 It includes endpoints for managing portals, API products, product versions, and related documents.
+
+The stores are indexed by ID and by parent ID, the server handles requests from threads,
+and latency and errors can be injected with environment variables, see `mock/faults.py`.
 """
 
-import uuid
 import base64
+import os
+import sys
 from flask import jsonify, request
 from flask_openapi3 import OpenAPI
 import yaml
 
+if __package__ in (None, ""):
+    # Run as `python mock/app.py`, import the sibling modules from the package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock.faults import Faults
+from mock.store import Store
+
 # Load OpenAPI Spec
 def load_openapi_spec(file_path):
     """Load OpenAPI specification from a YAML file."""
@@ -19,9 +30,11 @@ spec = load_openapi_spec("mock/specs/api_products.yaml")
 
 app = OpenAPI(__name__, info=spec['info'])
 
-# In-memory data stores
+faults = Faults.from_env()
+
+# In-memory data stores, indexed by the fields they are filtered on
 data_stores = {
-    "portals": {"data": [{
+    "portals": Store(["name"], [{
         "id": "66445d7c-c4aa-40d5-a683-97a5de16cd55",
         "name": "dev_portal",
         "description": "My Development Portal"
@@ -29,18 +42,15 @@ data_stores = {
         "id": "4162d3be-5c74-45f8-9a10-0c78867f6729",
         "name": "prod_portal",
         "description": "My Production Portal"
-    }]},
-    "api_products": {"data": []},
-    "api_product_versions": {"data": []},
-    "api_product_version_specifications": {"data": []},
-    "api_product_documents": {"data": []},
-    "portal_product_versions": {"data": []}
+    }]),
+    "api_products": Store(["name"]),
+    "api_product_versions": Store(["api_product_id", "name"]),
+    "api_product_version_specifications": Store(["api_product_version_id"]),
+    "api_product_documents": Store(["api_product_id"]),
+    "portal_product_versions": Store(["portal_id", "product_version_id"])
 }
 
 # Helper functions
-def generate_uuid():
-    """Generate a new UUID."""
-    return str(uuid.uuid4())
 
 def decode_base64(content):
     """Decode a base64 encoded string."""
@@ -48,57 +58,66 @@ def decode_base64(content):
 
 def get_filtered_data(store, filters):
     """Get filtered data from a store based on multiple key-value pairs."""
-    return [item for item in data_stores[store]["data"] if all(item.get(k) == v for k, v in filters.items())]
+    return data_stores[store].filter(filters)
 
 def get_item_by_key(store, key, value):
     """Get an item from a store by key and value."""
-    for item in data_stores[store]["data"]:
-        if item[key] == value:
-            return item
-    return None
+    return data_stores[store].find({key: value})
 
 def get_item_by_keys(store, key_values):
     """Get an item from a store by multiple key-value pairs."""
-    for item in data_stores[store]["data"]:
-        if all(item.get(k) == v for k, v in key_values.items()):
-            return item
-    return None
+    return data_stores[store].find(key_values)
 
 def create_item(store, item):
     """Create a new item in a store."""
-    item["id"] = generate_uuid()
-    data_stores[store]["data"].append(item)
-    return item
+    return data_stores[store].create(item)
 
 def update_item(store, key_values, updates):
     """Update an item in a store."""
     item = get_item_by_keys(store, key_values)
     if item:
-        item.update(updates)
-        return item
+        return data_stores[store].update(item, updates)
     return None
 
 def delete_item(store, item_id):
     """Delete an item from a store."""
-    item = get_item_by_key(store, "id", item_id)
-    if item:
-        data_stores[store]["data"].remove(item)
-        return True
-    return False
+    return data_stores[store].delete(item_id)
+
+def with_portals(product):
+    """Add the 'portals' of an API product, derived from its 'portal_ids' like in Konnect."""
+    portals = [get_item_by_key("portals", "id", portal_id) for portal_id in product.get("portal_ids", [])]
+    return dict(product, portals=[{"portal_id": p["id"], "portal_name": p["name"]} for p in portals if p])
+
+def version_with_portals(version):
+    """Add the 'portals' of an API product version, derived from its portal product versions like in Konnect."""
+    portals = []
+    for item in get_filtered_data("portal_product_versions", {"product_version_id": version["id"]}):
+        portal = get_item_by_key("portals", "id", item["portal_id"])
+        portals.append({
+            "portal_id": item["portal_id"],
+            "portal_name": portal["name"] if portal else None,
+            "portal_product_version_id": item["id"],
+            "publish_status": item.get("publish_status", "published"),
+            "deprecated": item.get("deprecated", False),
+            "application_registration_enabled": item.get("application_registration_enabled", False),
+            "auto_approve_registration": item.get("auto_approve_registration", False),
+            "auth_strategies": [{"id": strategy_id} for strategy_id in item.get("auth_strategy_ids", [])]
+        })
+    return dict(version, portals=portals)
 
 # Endpoint handlers
 def handle_get_api_products():
     """Handle GET requests for API products."""
     if request.args.get("filter[name]"):
         filtered_products = get_filtered_data("api_products", {"name": request.args.get("filter[name]")})
-        return jsonify({"data": filtered_products}), 200
-    return jsonify(data_stores["api_products"]), 200
+        return jsonify({"data": [with_portals(p) for p in filtered_products]}), 200
+    return jsonify({"data": [with_portals(p) for p in data_stores["api_products"].all()]}), 200
 
 def handle_get_api_product_by_id(product_id):
     """Handle GET requests for a specific API product by ID."""
     item = get_item_by_key("api_products", "id", product_id)
     if item:
-        return jsonify(item)
+        return jsonify(with_portals(item))
     return jsonify({"message": "Product not found"}), 404
 
 def handle_post_api_products():
@@ -119,9 +138,9 @@ def handle_delete_api_products(product_id):
         return jsonify({"message": "Product deleted"}), 204
     return jsonify({"message": "Product not found"}), 404
 
-def handle_get_api_product_documents():
+def handle_get_api_product_documents(product_id):
     """Handle GET requests for API product documents."""
-    return jsonify(data_stores["api_product_documents"]), 200
+    return jsonify({"data": get_filtered_data("api_product_documents", {"api_product_id": product_id})}), 200
 
 def handle_get_api_product_document(document_id):
     """Handle GET requests for a specific API product document by ID."""
@@ -130,9 +149,10 @@ def handle_get_api_product_document(document_id):
         return jsonify(item)
     return jsonify({"message": "Document not found"}), 404
 
-def handle_post_api_product_documents():
+def handle_post_api_product_documents(product_id):
     """Handle POST requests to create a new API product document."""
     request.json["content"] = decode_base64(request.json["content"])
+    request.json["api_product_id"] = product_id
     item = create_item("api_product_documents", request.json)
     return jsonify(item), 201
 
@@ -149,22 +169,24 @@ def handle_delete_api_product_document(document_id):
         return jsonify({"message": "Document deleted"}), 204
     return jsonify({"message": "Document not found"}), 404
 
-def handle_get_api_product_versions():
+def handle_get_api_product_versions(product_id):
     """Handle GET requests for API product versions."""
+    filters = {"api_product_id": product_id}
     if request.args.get("filter[name]"):
-        filtered_versions = get_filtered_data("api_product_versions", {"name": request.args.get("filter[name]")})
-        return jsonify({"data": filtered_versions}), 200
-    return jsonify(data_stores["api_product_versions"]), 200
+        filters["name"] = request.args.get("filter[name]")
+    versions = get_filtered_data("api_product_versions", filters)
+    return jsonify({"data": [version_with_portals(v) for v in versions]}), 200
 
 def handle_get_api_product_version(version_id):
     """Handle GET requests for a specific API product version by ID."""
     item = get_item_by_key("api_product_versions", "id", version_id)
     if item:
-        return jsonify(item)
+        return jsonify(version_with_portals(item))
     return jsonify({"message": "Version not found"}), 404
 
-def handle_post_api_product_versions():
+def handle_post_api_product_versions(product_id):
     """Handle POST requests to create a new API product version."""
+    request.json["api_product_id"] = product_id
     item = create_item("api_product_versions", request.json)
     return jsonify(item), 201
 
@@ -181,9 +203,10 @@ def handle_delete_api_product_version(version_id):
         return jsonify({"message": "Version deleted"}), 204
     return jsonify({"message": "Version not found"}), 404
 
-def handle_get_api_product_version_specifications():
+def handle_get_api_product_version_specifications(version_id):
     """Handle GET requests for API product version specifications."""
-    return jsonify(data_stores["api_product_version_specifications"]), 200
+    specifications = get_filtered_data("api_product_version_specifications", {"api_product_version_id": version_id})
+    return jsonify({"data": specifications}), 200
 
 def handle_get_api_product_version_specification(specification_id):
     """Handle GET requests for a specific API product version specification by ID."""
@@ -192,9 +215,10 @@ def handle_get_api_product_version_specification(specification_id):
         return jsonify(item)
     return jsonify({"message": "Specification not found"}), 404
 
-def handle_post_api_product_version_specifications():
+def handle_post_api_product_version_specifications(version_id):
     """Handle POST requests to create a new API product version specification."""
     request.json["content"] = decode_base64(request.json["content"])
+    request.json["api_product_version_id"] = version_id
     item = create_item("api_product_version_specifications", request.json)
     return jsonify(item), 201
 
@@ -211,6 +235,16 @@ def handle_delete_api_product_version_specification(specification_id):
         return jsonify({"message": "Specification deleted"}), 204
     return jsonify({"message": "Specification not found"}), 404
 
+@app.before_request
+def inject_faults():
+    """Delay the request, then answer it with an error if one is injected."""
+    faults.delay()
+    fault = faults.fault()
+    if fault:
+        status, headers = fault
+        return jsonify({"status": status, "title": "Injected fault"}), status, headers
+    return None
+
 # Define Mock Endpoints from OpenAPI Spec
 base_path = "/" + spec.get("servers", [{}])[0].get("url", "").rstrip("/").split("/")[-1]
 
@@ -223,15 +257,15 @@ def create_mock_function(route, method):
             if route == "/api-products/<id>":
                 return handle_get_api_product_by_id(kwargs["id"])
             if route == "/api-products/<apiProductId>/documents":
-                return handle_get_api_product_documents()
+                return handle_get_api_product_documents(kwargs["apiProductId"])
             if route == "/api-products/<apiProductId>/documents/<id>":
                 return handle_get_api_product_document(kwargs["id"])
             if route == "/api-products/<apiProductId>/product-versions":
-                return handle_get_api_product_versions()
+                return handle_get_api_product_versions(kwargs["apiProductId"])
             if route == "/api-products/<apiProductId>/product-versions/<id>":
                 return handle_get_api_product_version(kwargs["id"])
             if route == "/api-products/<apiProductId>/product-versions/<apiProductVersionId>/specifications":
-                return handle_get_api_product_version_specifications()
+                return handle_get_api_product_version_specifications(kwargs["apiProductVersionId"])
             if route == "/api-products/<apiProductId>/product-versions/<apiProductVersionId>/specifications/<id>":
                 return handle_get_api_product_version_specification(kwargs["id"])
 
@@ -239,11 +273,11 @@ def create_mock_function(route, method):
             if route == "/api-products":
                 return handle_post_api_products()
             if route == "/api-products/<apiProductId>/documents":
-                return handle_post_api_product_documents()
+                return handle_post_api_product_documents(kwargs["apiProductId"])
             if route == "/api-products/<apiProductId>/product-versions":
-                return handle_post_api_product_versions()
+                return handle_post_api_product_versions(kwargs["apiProductId"])
             if route == "/api-products/<apiProductId>/product-versions/<apiProductVersionId>/specifications":
-                return handle_post_api_product_version_specifications()
+                return handle_post_api_product_version_specifications(kwargs["apiProductVersionId"])
 
         if method.upper() == "PATCH":
             if route == "/api-products/<id>":
@@ -293,7 +327,15 @@ def get_portals():
     if request.args.get("filter[name]"):
         filtered_portals = get_filtered_data("portals", {"name": request.args.get("filter[name]")})
         return jsonify({"data": filtered_portals}), 200
-    return jsonify(data_stores["portals"]), 200
+    return jsonify({"data": data_stores["portals"].all()}), 200
+
+@app.route("/v2/portals/<portal_id>", methods=["GET"])
+def get_portal(portal_id):
+    """Get a portal by ID."""
+    item = get_item_by_key("portals", "id", portal_id)
+    if item:
+        return jsonify(item), 200
+    return jsonify({"message": "Portal not found"}), 404
 
 @app.route("/v2/portals/<portal_id>/product-versions", methods=["GET"])
 def get_portal_product_versions(portal_id):
@@ -326,4 +368,4 @@ def update_portal_product_version(portal_id, id):
     return jsonify({"message": "Portal Product Version not found"}), 404
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port="8080", debug=True)
+    app.run(host="0.0.0.0", port="8080", debug=True, threaded=True)
@@ -0,0 +1,92 @@
+"""
+Latency and fault injection of the mock Konnect API, configured by environment variables:
+
+- `MOCK_LATENCY`: the distribution of the latency added to each request, in milliseconds:
+  `constant:MS`, `uniform:MIN:MAX`, `normal:MEAN:STDDEV` or `exponential:MEAN`.
+  No latency is added by default.
+- `MOCK_RATE_429`: the fraction of requests answered with 429 Too Many Requests, e.g. `0.05`.
+- `MOCK_RATE_5XX`: the fraction of requests answered with a 500, 502 or 503 error.
+- `MOCK_RETRY_AFTER`: the value of the `Retry-After` header of the 429 and 503 responses,
+  in seconds. The header is not sent by default.
+- `MOCK_SEED`: the seed of the random generator, to inject the same faults on every run.
+
+Faults are injected before the request is handled, so a failed request changes nothing.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+SERVER_ERRORS = (500, 502, 503)
+
+
+def parse_latency(value: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Parse a latency distribution, returning a function sampling a latency in seconds.
+
+    Raises:
+        ValueError: If the distribution is unknown or its parameters are invalid.
+    """
+    name, _, params = value.partition(":")
+    args = [float(param) / 1000 for param in params.split(":")] if params else []
+    distributions = {
+        "constant": (1, lambda ms: ms),
+        "uniform": (2, rng.uniform),
+        "normal": (2, rng.gauss),
+        "exponential": (1, lambda mean: rng.expovariate(1 / mean) if mean else 0.0),
+    }
+    if name not in distributions or len(args) != distributions[name][0]:
+        raise ValueError(f"Invalid latency distribution '{value}', expected constant:MS, uniform:MIN:MAX, "
+                         "normal:MEAN:STDDEV or exponential:MEAN")
+    sample = distributions[name][1]
+    return lambda: max(sample(*args), 0.0)
+
+
+class Faults:
+    """
+    The latency and faults injected in the requests of the mock server.
+    """
+
+    def __init__(self, latency: Optional[str] = None, rate_429: float = 0.0, rate_5xx: float = 0.0,
+                 retry_after: Optional[str] = None, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.latency = parse_latency(latency, self.rng) if latency else None
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Faults":
+        """Get the faults configured by the environment variables."""
+        seed = environ.get("MOCK_SEED")
+        return cls(
+            latency=environ.get("MOCK_LATENCY") or None,
+            rate_429=float(environ.get("MOCK_RATE_429", 0)),
+            rate_5xx=float(environ.get("MOCK_RATE_5XX", 0)),
+            retry_after=environ.get("MOCK_RETRY_AFTER") or None,
+            seed=int(seed) if seed else None,
+        )
+
+    def delay(self) -> None:
+        """Wait for the latency of a request."""
+        if self.latency:
+            with self.lock:
+                latency = self.latency()
+            time.sleep(latency)
+
+    def fault(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        """Get the status and headers of the error to answer a request with, if any."""
+        if not self.rate_429 and not self.rate_5xx:
+            return None
+        with self.lock:
+            roll = self.rng.random()
+            status = self.rng.choice(SERVER_ERRORS)
+        if roll < self.rate_429:
+            status = 429
+        elif roll >= self.rate_429 + self.rate_5xx:
+            return None
+        headers = {"Retry-After": self.retry_after} if self.retry_after and status in (429, 503) else {}
+        return status, headers
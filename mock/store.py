@@ -0,0 +1,103 @@
+"""
+In-memory stores of the mock Konnect API, indexed by ID and by the fields they are
+filtered on, such as the ID of their parent, so that lookups do not scan every item.
+"""
+
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Store:
+    """
+    Items of one kind, by ID, with an index per filtered field.
+
+    The stores are shared by the threads of the server, so every access holds a lock.
+    """
+
+    def __init__(self, indexed: Iterable[str] = (), items: Iterable[Dict[str, Any]] = ()):
+        """
+        Args:
+            indexed (Iterable[str]): The fields to index, e.g. "api_product_id".
+            items (Iterable[Dict[str, Any]]): The initial items, with their ID.
+        """
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[Any, Dict[str, Dict[str, Any]]]] = {field: {} for field in indexed}
+        self.lock = threading.RLock()
+        for item in items:
+            self.add(item)
+
+    def _index(self, item: Dict[str, Any]) -> None:
+        for field, index in self.indexes.items():
+            index.setdefault(item.get(field), {})[item["id"]] = item
+
+    def _unindex(self, item: Dict[str, Any]) -> None:
+        for field, index in self.indexes.items():
+            items = index.get(item.get(field))
+            if items is not None:
+                items.pop(item["id"], None)
+                if not items:
+                    del index[item.get(field)]
+
+    def add(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Add an item that has an ID."""
+        with self.lock:
+            self.items[item["id"]] = item
+            self._index(item)
+        return item
+
+    def create(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Add an item with a new ID."""
+        item["id"] = str(uuid.uuid4())
+        return self.add(item)
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Get an item by ID."""
+        with self.lock:
+            return self.items.get(item_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get every item, in creation order."""
+        with self.lock:
+            return list(self.items.values())
+
+    def filter(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the items matching every key-value pair.
+
+        The candidates are taken from the index of a filtered field when there is one,
+        then checked against the other pairs.
+        """
+        with self.lock:
+            if "id" in filters:
+                item = self.items.get(filters["id"])
+                candidates = [item] if item else []
+            else:
+                indexed = next((field for field in filters if field in self.indexes), None)
+                if indexed is None:
+                    candidates = self.items.values()
+                else:
+                    candidates = self.indexes[indexed].get(filters[indexed], {}).values()
+            return [item for item in candidates if all(item.get(k) == v for k, v in filters.items())]
+
+    def find(self, filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the first item matching every key-value pair."""
+        items = self.filter(filters)
+        return items[0] if items else None
+
+    def update(self, item: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the fields of an item of the store."""
+        with self.lock:
+            self._unindex(item)
+            item.update(updates)
+            self._index(item)
+        return item
+
+    def delete(self, item_id: str) -> bool:
+        """Delete an item by ID, returning whether it existed."""
+        with self.lock:
+            item = self.items.pop(item_id, None)
+            if item is None:
+                return False
+            self._unindex(item)
+            return True
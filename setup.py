@@ -16,22 +16,26 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     include_package_data=True,
+    package_data={"kptl": ["schemas/*.json"]},
     install_requires=[
         "PyYAML==6.0.2",
+        "fastjsonschema==2.22.2",
         "requests==2.32.3",
     ],
     extras_require={
         "dev": ["pytest"],
+        "speedups": ["orjson"],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     entry_points={
         "console_scripts": [
             "kptl=kptl.main:main",
+            "kptl-gen=kptl.gen:main",
         ]
     },
 )
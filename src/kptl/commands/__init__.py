@@ -1,6 +1,28 @@
 # commands/__init__.py
 
-from .diff import DiffCommand
-from .delete import DeleteCommand
-from .explain import ExplainCommand
-from .sync import SyncCommand
\ No newline at end of file
+# Commands are imported on first access, so that running one command does not import
+# the dependencies of the others (e.g. `requests` and `deepdiff` for `validate`).
+import importlib
+
+_COMMANDS = {
+    "DiffCommand": ".diff",
+    "DeleteCommand": ".delete",
+    "DriftCommand": ".drift",
+    "ExplainCommand": ".explain",
+    "SyncCommand": ".sync",
+    "ValidateCommand": ".validate",
+}
+
+__all__ = list(_COMMANDS)
+
+
+def __getattr__(name):
+    if name in _COMMANDS:
+        command = getattr(importlib.import_module(_COMMANDS[name], __name__), name)
+        globals()[name] = command
+        return command
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
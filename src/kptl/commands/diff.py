@@ -3,16 +3,16 @@ Module for diffing local and remote API product states.
 """
 
 import argparse
-import copy
-import dataclasses
 import difflib
 import sys
-from typing import Callable
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from deepdiff import DeepDiff
 import yaml
 
 from kptl.config import logger
-from kptl.helpers import api_product_documents, utils
+from kptl.helpers import api_product_documents, git, metrics, utils
+from kptl.helpers.content_handle import ContentHandle
+from kptl.helpers.docs_index import DocsIndex
 from kptl.konnect.api import KonnectApi
 from kptl.konnect.models.schema import ApiProduct, ApiProductPortal, ApiProductState, ApiProductVersion, ApiProductVersionAuthStrategy, ApiProductVersionPortal, GatewayService
 
@@ -26,9 +26,10 @@ class DiffCommand:
     Command to diff local and remote API product states.
     """
 
-    def __init__(self, konnect: KonnectApi):
+    def __init__(self, konnect: Optional[KonnectApi]):
         """
         Initialize the DiffCommand with a KonnectApi instance.
+        No instance is needed when diffing against a git revision.
         """
         self.konnect = konnect
 
@@ -36,49 +37,146 @@ class DiffCommand:
         """
         Execute the diff command.
         """
-        state = utils.load_state(args.state)
-        local_state = ApiProductState().from_dict(state)
+        local_state = self.load_local_state(args.state)
+
+        if getattr(args, "against", None):
+            # The files of the revision are read while comparing, through one git process
+            with git.GitRevision(args.against) as revision:
+                with metrics.phase(metrics.LOAD):
+                    remote_state = self.load_revision_state(args.state, revision)
+                self.compare_and_render(remote_state, local_state)
+        else:
+            with metrics.phase(metrics.FETCH):
+                remote_state = self.load_remote_state(
+                    local_state, self._should_sync_docs(local_state))
+            self.compare_and_render(remote_state, local_state)
+
+    def compare_and_render(self, remote_state: ApiProductState, local_state: ApiProductState) -> None:
+        """
+        Print the diff and the summary of the changes between the remote and local states.
+        """
+        with metrics.phase(metrics.COMPARE):
+            remote_state_dict_clean, local_state_dict_clean = self.prepare_states(
+                remote_state, local_state)
+            changes = self.get_changes(remote_state_dict_clean, local_state_dict_clean)
+
+        with metrics.phase(metrics.RENDER):
+            print(
+                self._get_edits_string(
+                    yaml.dump(remote_state_dict_clean, indent=2, sort_keys=True),
+                    yaml.dump(local_state_dict_clean, indent=2, sort_keys=True)
+                )
+            )
 
-        should_sync_docs = local_state.documents and local_state.documents.sync and local_state.documents.directory
+            print(self._get_summary_of_changes(changes))
 
-        if should_sync_docs:
-            local_docs = api_product_documents.parse_directory(
-                local_state.documents.directory)
-            local_state.documents.set_data(local_docs)
+    def load_local_state(self, state_file: str) -> ApiProductState:
+        """
+        Load the local state file along with its documents.
+        """
+        with metrics.phase(metrics.LOAD):
+            state = self.load_state_file(state_file)
+            local_state = ApiProductState().from_dict(state)
 
-        remote_state = self.load_remote_state(local_state, should_sync_docs)
+        if self._should_sync_docs(local_state):
+            with metrics.phase(metrics.PREPARE):
+                directory = local_state.documents.directory
+                # Unchanged files are compared by their indexed digest, without being read
+                local_state.documents.set_data(api_product_documents.iter_page_handles(
+                    directory, index=DocsIndex.for_directory(directory)))
 
+        return local_state
+
+    def load_state_file(self, state_file: str) -> dict:
+        """
+        Load and validate a state file, exiting if it is invalid.
+        """
+        return utils.load_state(state_file)
+
+    def prepare_states(self, remote_state: ApiProductState, local_state: ApiProductState) -> Tuple[dict, dict]:
+        """
+        Turn the remote and local states into dictionaries that can be compared.
+        """
         # Before the diff, there are a couple of things we need to do:
         # ============================================================
 
-        # 1. Encode the OAS spec content for the local state versions so that it can be compared with the remote state.
-        local_state.encode_versions_spec_content()
+        # 1. Resolve the OAS spec content of the local state versions so that it can be compared with the remote state.
+        with metrics.phase(metrics.PREPARE):
+            local_state.resolve_versions_spec_content()
 
         # 2. Clean up state dictionaries in preparation for the diff.
-        remote_state_dict_clean = self._prepare_for_diff(
-            dataclasses.asdict(remote_state))
-        local_state_dict_clean = self._prepare_for_diff(
-            dataclasses.asdict(local_state))
-
-        print(
-            self._get_edits_string(
-                yaml.dump(remote_state_dict_clean, indent=2, sort_keys=True),
-                yaml.dump(local_state_dict_clean, indent=2, sort_keys=True)
-            )
-        )
+        remote_state_dict_clean = self._prepare_for_diff(remote_state.to_dict())
+        local_state_dict_clean = self._prepare_for_diff(local_state.to_dict())
+
+        return remote_state_dict_clean, local_state_dict_clean
 
-        print(self._get_summary_of_changes(
-            remote_state_dict_clean, local_state_dict_clean))
+    def load_revision_state(self, state_file: str, revision: git.GitRevision) -> ApiProductState:
+        """
+        Load the state file, specs and documents as they are at the given git revision.
+
+        Everything is read straight from the git object database, so no checkout
+        and no network calls are needed. The contents are read again from the
+        revision when the states are compared, so it must still be open then.
+        """
+        state_content = revision.read(state_file)
+        if state_content is None:
+            logger.Logger().warning(
+                "State file '%s' does not exist at revision '%s'", state_file, revision.ref)
+            return ApiProductState()
+
+        state = utils.parse_yaml(state_content)
+        utils.validate_state(state)
+
+        spec_contents = {}
+        for version in state.get('versions', []):
+            spec_content = revision.read(version['spec'])
+            if spec_content is None:
+                logger.Logger().error("File not found at revision '%s': %s",
+                                      revision.ref, version['spec'])
+                sys.exit(1)
+            spec_contents[version['spec']] = spec_content
+
+            # Resolve version names here so that ApiProductState doesn't read specs from the working tree.
+            if not version.get('name'):
+                version['name'] = utils.extract_oas_version(spec_content)
+            if not version.get('name'):
+                version['name'] = utils.parse_oas(
+                    spec_content, version['spec']).get('info', {}).get('version')
+
+        revision_state = ApiProductState().from_dict(state)
+
+        for version in revision_state.versions:
+            version.spec = self._revision_content_handle(
+                revision, version.spec, spec_contents[version.spec])
+
+        documents = revision_state.documents
+        if documents.sync and documents.directory:
+            # Files are read through a single git process, so a single thread is enough.
+            pages = api_product_documents.iter_pages(
+                (f for f in revision.list_files(
+                    documents.directory) if f.endswith('.md')),
+                lambda file_path: revision.read(file_path).decode('utf-8'),
+                max_workers=1)
+            documents.set_data(
+                dict(page, content=self._revision_page_handle(revision, page)) for page in pages)
+
+        return revision_state
 
     def load_remote_state(self, local_state, should_sync_docs):
+        return self.build_remote_state(self.list_remote_state(local_state, should_sync_docs))
 
-        remote_state = ApiProductState()
+    def list_remote_state(self, local_state: ApiProductState, should_sync_docs: bool) -> Optional[dict]:
+        """
+        List the API product, portals, documents and versions of the remote state, without
+        the bodies of the documents and specs.
 
-        api_product = self.konnect.find_api_product_by_name(
-            local_state.info.name)
+        Returns:
+            Optional[dict]: The listings, or None if the API product does not exist.
+        """
+        api_product = self._find_api_product(local_state.info.name)
 
         if not api_product:
-            return remote_state
+            return None
 
         api_product['portal_ids'] = [p['portal_id']
                                      for p in api_product['portals']]
@@ -86,20 +184,34 @@ class DiffCommand:
         portals = [self._find_konnect_portal(
             p['portal_id']) for p in api_product['portals']]
 
+        remote_docs = None
         if should_sync_docs:
             remote_docs = self.konnect.list_api_product_documents(
                 api_product['id'])
 
-            for doc in remote_docs:
-                full_doc = self.konnect.get_api_product_document(
-                    api_product['id'], doc['id'])
-                doc['content'] = utils.encode_content(full_doc['content'])
-
-            remote_state.documents.set_data(remote_docs)
-
         product_versions = self.konnect.list_api_product_versions(
             api_product['id'])
 
+        return {"api_product": api_product, "portals": portals,
+                "documents": remote_docs, "versions": product_versions}
+
+    def build_remote_state(self, listings: Optional[dict], with_contents: bool = True) -> ApiProductState:
+        """
+        Build the remote state from the listings of `list_remote_state`, fetching the bodies
+        of its documents and specs unless `with_contents` is false, in which case they are None.
+        """
+        remote_state = ApiProductState()
+
+        if listings is None:
+            return remote_state
+
+        api_product, portals, product_versions = listings['api_product'], listings['portals'], listings['versions']
+
+        if listings['documents'] is not None:
+            remote_state.documents.set_data(
+                dict(doc, content=self._remote_document_handle(api_product['id'], doc) if with_contents else None)
+                for doc in listings['documents'])
+
         remote_state.info = ApiProduct(
             name=api_product['name'],
             description=api_product['description']
@@ -112,8 +224,8 @@ class DiffCommand:
 
         remote_state.versions = sorted([ApiProductVersion(
             name=v['name'],
-            spec=self._get_encoded_api_product_version_spec_content(
-                api_product['id'], v['id']),
+            spec=self._get_api_product_version_spec_handle(
+                api_product['id'], v['id']) if with_contents else None,
             gateway_service=GatewayService(
                 id=v['gateway_service']['id'],
                 control_plane_id=v['gateway_service']['control_plane_id']
@@ -158,20 +270,17 @@ class DiffCommand:
 
         return result
 
-    def _get_summary_of_changes(self, old: dict, new: dict) -> str:
+    def get_changes(self, old: dict, new: dict) -> Dict[str, List[str]]:
         """
-        Get a summary of the changes between the old and new state dictionaries.
+        Get the paths that were added, removed or updated between the old and new state dictionaries.
         """
         diff = DeepDiff(old, new)
-        summary = {
+        changes = {
             "added": [],
             "removed": [],
             "updated": []
         }
 
-        if not diff:
-            return "Summary:\n==================\nNo changes detected.\n"
-
         change_types = {
             'dictionary_item_added': 'added',
             'dictionary_item_removed': 'removed',
@@ -181,35 +290,44 @@ class DiffCommand:
             'type_changes': 'updated'
         }
 
-        for diff_key, summary_key in change_types.items():
+        for diff_key, change_type in change_types.items():
             if diff_key in diff:
                 for key in diff[diff_key]:
-                    color_func = GREEN if summary_key == 'added' else RED if summary_key == 'removed' else YELLOW
-                    summary[summary_key].append(
-                        color_func(f"  - {key.replace('root', '')}"))
+                    changes[change_type].append(key.replace('root', ''))
+
+        return changes
+
+    def _get_summary_of_changes(self, changes: Dict[str, List[str]]) -> str:
+        """
+        Get a summary of the changes between the old and new state dictionaries, as returned by `get_changes`.
+        """
+
+        if not any(changes.values()):
+            return "Summary:\n==================\nNo changes detected.\n"
 
         human_readable_summary = ""
-        for change_type, items in summary.items():
+        for change_type, items in changes.items():
             if items:
                 color_func = GREEN if change_type == 'added' else RED if change_type == 'removed' else YELLOW
                 human_readable_summary += color_func(
                     f"{change_type.capitalize()} ({len(items)}):\n")
-                human_readable_summary += "\n".join(items) + "\n"
+                human_readable_summary += "\n".join(
+                    color_func(f"  - {item}") for item in items) + "\n"
 
         return f"Summary:\n==================\n{human_readable_summary}"
 
     def _prepare_for_diff(self, state_dict: dict) -> dict:
         """
         Prepare the state dictionary for diffing.
-        """
-        new_state_dict = copy.deepcopy(state_dict)
 
+        The dictionary is modified in place, as `ApiProductState.to_dict` builds a new one.
+        """
         # Remove portal IDs from the state dictionaries to ensure they don't affect the diff.
         # Portal names are unique and portal-related lists are sorted by portal name.
         # @TODO: Maybe there's a better way to handle this.
-        for portal in new_state_dict.get('portals', []):
+        for portal in state_dict.get('portals', []):
             portal.pop('portal_id', None)
-        for version in new_state_dict.get('versions', []):
+        for version in state_dict.get('versions', []):
             for portal in version.get('portals', []):
                 portal.pop('portal_id', None)
 
@@ -219,14 +337,14 @@ class DiffCommand:
             #     version.pop('gateway_service', None)
 
         # We only need documents data (pages) to show in diff.
-        if new_state_dict.get('documents', None):
-            new_state_dict['documents'] = new_state_dict['documents']['data']
+        if state_dict.get('documents', None):
+            state_dict['documents'] = state_dict['documents']['data']
 
-        return new_state_dict
+        return state_dict
 
-    def _get_encoded_api_product_version_spec_content(self, api_product_id: str, api_product_version_id: str) -> str:
+    def _get_api_product_version_spec_handle(self, api_product_id: str, api_product_version_id: str) -> Union[str, ContentHandle]:
         """
-        Get the encoded API product version spec.
+        Get a handle on the API product version spec, which is fetched again only when loaded.
         """
         spec = self.konnect.get_api_product_version_spec(
             api_product_id, api_product_version_id)
@@ -234,7 +352,52 @@ class DiffCommand:
         if not spec:
             return ""
 
-        return utils.encode_content(spec['content'])
+        return ContentHandle.from_content(
+            f"{api_product_id}/{api_product_version_id}", spec['content'],
+            lambda: self.konnect.get_api_product_version_spec(api_product_id, api_product_version_id)['content'])
+
+    def _remote_document_handle(self, api_product_id: str, document: dict) -> ContentHandle:
+        """
+        Get a handle on the content of an API product document, which is fetched again only when loaded.
+        """
+        document_id = document['id']
+        full_document = self.konnect.get_api_product_document(
+            api_product_id, document_id)
+
+        return ContentHandle.from_content(
+            f"{api_product_id}/{document_id}", full_document['content'],
+            lambda: self.konnect.get_api_product_document(api_product_id, document_id)['content'])
+
+    @staticmethod
+    def _revision_content_handle(revision: git.GitRevision, path: str, content: bytes) -> ContentHandle:
+        """
+        Get a handle on a file read at a git revision, which is read again only when loaded.
+        """
+        return ContentHandle.from_content(
+            f"{revision.ref}:{path}", content, lambda: revision.read(path))
+
+    @staticmethod
+    def _revision_page_handle(revision: git.GitRevision, page: dict) -> ContentHandle:
+        """
+        Get a handle on the content of a page read at a git revision, which is read again only when loaded.
+        """
+        file_path = page['file_path']
+        return ContentHandle(
+            f"{revision.ref}:{file_path}", page['digest'],
+            lambda: revision.read(file_path).decode('utf-8').strip())
+
+    @staticmethod
+    def _should_sync_docs(state: ApiProductState) -> bool:
+        """
+        Check whether the documents of the given state are managed by the CLI.
+        """
+        return bool(state.documents and state.documents.sync and state.documents.directory)
+
+    def _find_api_product(self, name: str) -> Optional[dict]:
+        """
+        Find the Konnect API product by name.
+        """
+        return self.konnect.find_api_product_by_name(name)
 
     def _find_konnect_portal(self, identifier: str) -> dict:
         """
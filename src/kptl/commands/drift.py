@@ -0,0 +1,182 @@
+"""
+Module for reporting drift between many local API product states and Konnect.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from kptl.commands.diff import DiffCommand
+from kptl.config import logger
+from kptl.helpers import metrics, tracing, utils
+from kptl.konnect.api import KonnectApi
+
+
+class DriftCommand(DiffCommand):
+    """
+    Command to report which API products have drifted from their state files.
+
+    Portals and API products are listed once and shared by all the diffs, which
+    run concurrently and skip rendering the textual diff.
+
+    A product is first compared on the metadata of its list endpoints: names, titles,
+    slugs, statuses and portals. The bodies of its documents and specs are only fetched
+    to be compared when the metadata does not differ.
+    """
+
+    def __init__(self, konnect: KonnectApi):
+        """
+        Initialize the DriftCommand with a KonnectApi instance.
+        """
+        super().__init__(konnect)
+        self.logger = logger.Logger()
+        self.portals_index: Dict[str, Dict[str, Any]] = {}
+        self.api_products_index: Dict[str, List[Dict[str, Any]]] = {}
+
+    def execute(self, args: argparse.Namespace) -> None:
+        """
+        Execute the drift command.
+        """
+        with metrics.phase(metrics.LOAD):
+            state_files = utils.find_state_files(args.paths)
+        if not state_files:
+            self.logger.error("No state files found in: %s",
+                              ", ".join(args.paths))
+            sys.exit(1)
+
+        self.logger.info("Checking drift for %d state files",
+                         len(state_files))
+        self.build_indexes()
+
+        with metrics.phase(metrics.CONCURRENT), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(tracing.in_context(self.check_drift), state_files))
+
+        with metrics.phase(metrics.RENDER):
+            self.write_report(results, args.output)
+
+        if args.fail_on_drift and any(r['status'] != "in_sync" for r in results):
+            sys.exit(1)
+
+    def write_report(self, results: List[Dict[str, Any]], output_file: Optional[str]) -> None:
+        """
+        Write the JSON drift report to a file, or to stdout.
+        """
+        report = {
+            "summary": {
+                status: sum(1 for r in results if r['status'] == status)
+                for status in ("in_sync", "drifted", "missing", "error")
+            },
+            "products": results
+        }
+
+        output = json.dumps(report, indent=2)
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+            self.logger.info("Drift report written to '%s'", output_file)
+        else:
+            print(output)
+
+    def build_indexes(self) -> None:
+        """
+        List all portals and API products once, indexed for lookups by every diff.
+        """
+        for portal in self.konnect.list_portals():
+            self.portals_index[portal['id']] = portal
+            self.portals_index[portal['name']] = portal
+
+        for api_product in self.konnect.list_api_products():
+            self.api_products_index.setdefault(
+                api_product['name'], []).append(api_product)
+
+    def check_drift(self, state_file: str) -> Dict[str, Any]:
+        """
+        Compare a single state file with Konnect.
+
+        Returns:
+            Dict[str, Any]: The drift status of the product and the changed paths.
+        """
+        result = {"state": state_file, "product": None,
+                  "status": "in_sync", "changes": {}}
+        try:
+            local_state = self.load_local_state(state_file)
+            result['product'] = local_state.info.name
+
+            with metrics.phase(metrics.FETCH):
+                listings = self.list_remote_state(
+                    local_state, self._should_sync_docs(local_state))
+                remote_state = self.build_remote_state(listings, with_contents=False)
+            with metrics.phase(metrics.COMPARE):
+                remote_state_dict = self._without_contents(self._prepare_for_diff(remote_state.to_dict()))
+                local_state_dict = self._without_contents(self._prepare_for_diff(local_state.to_dict()))
+                changes = self.get_changes(remote_state_dict, local_state_dict)
+
+            if listings is not None and not any(changes.values()):
+                with metrics.phase(metrics.FETCH):
+                    remote_state = self.build_remote_state(listings)
+                with metrics.phase(metrics.COMPARE):
+                    changes = self.get_changes(*self.prepare_states(remote_state, local_state))
+        except utils.InvalidStateError as e:
+            utils.log_state_errors(e, state_file)
+            result['status'] = "error"
+            result['error'] = "Invalid state file"
+            result['errors'] = [error.to_dict() for error in e.errors]
+            return result
+        except SystemExit:
+            # Loading helpers log the reason and exit; report it without aborting the other diffs.
+            result['status'] = "error"
+            result['error'] = "Failed to load the product state, see the logs for details"
+            return result
+        except Exception as e:  # pylint: disable=broad-except
+            result['status'] = "error"
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+
+        result['changes'] = {k: v for k, v in changes.items() if v}
+
+        if remote_state.info is None:
+            result['status'] = "missing"
+        elif result['changes']:
+            result['status'] = "drifted"
+
+        return result
+
+    @staticmethod
+    def _without_contents(state_dict: dict) -> dict:
+        """
+        Remove the document contents and the specs from a state dictionary prepared for the
+        diff, to compare the metadata of the states. The dictionary is modified in place.
+        """
+        for document in state_dict.get('documents') or []:
+            document.pop('content', None)
+        for version in state_dict.get('versions', []):
+            version.pop('spec', None)
+        return state_dict
+
+    def load_state_file(self, state_file: str) -> dict:
+        """
+        Load and validate a state file, raising `InvalidStateError` so that the errors of
+        the file end up in the report.
+        """
+        return utils.read_state(state_file)
+
+    def _find_api_product(self, name: str) -> Optional[dict]:
+        """
+        Find the Konnect API product by name in the shared index.
+        """
+        api_products = self.api_products_index.get(name, [])
+        if len(api_products) > 1:
+            raise ValueError(
+                f"Multiple API products found with the name: {name}")
+        return api_products[0] if api_products else None
+
+    def _find_konnect_portal(self, identifier: str) -> dict:
+        """
+        Find the Konnect portal by name or id in the shared index.
+        """
+        portal = self.portals_index.get(identifier)
+        if not portal:
+            raise ValueError(f"Portal {identifier} not found")
+        return portal
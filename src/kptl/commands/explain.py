@@ -1,7 +1,7 @@
 import argparse
 import yaml
 from kptl.config import logger
-from kptl.helpers import utils
+from kptl.helpers import metrics, utils
 from kptl.konnect.models.schema import ApiProductState
 
 
@@ -13,12 +13,14 @@ class ExplainCommand:
         """
         Explain the actions that will be performed on Konnect.
         """
-        state = utils.load_state(args.state)
-        product_state = ApiProductState().from_dict(state)
+        with metrics.phase(metrics.LOAD):
+            state = utils.load_state(args.state)
+            product_state = ApiProductState().from_dict(state)
 
-        expl = self.explain_product_state(product_state)
+        with metrics.phase(metrics.RENDER):
+            expl = self.explain_product_state(product_state)
 
-        self.logger.info(expl)
+            self.logger.info(expl)
 
     def explain_product_state(self, product_state: ApiProductState) -> str:
         """
@@ -1,11 +1,10 @@
-import dataclasses
 import sys
 from typing import Dict, List
 import yaml
 from kptl.config import logger
-from kptl.helpers import utils
+from kptl.helpers import content_cache, metrics, utils
 from kptl.konnect.api import KonnectApi
-from kptl.konnect.models.schema import ApiProductState, ApiProductVersion, ApiProductVersionPortal
+from kptl.konnect.models.schema import ApiProductState, ApiProductVersion, ApiProductVersionPortal, to_dict
 
 
 class SyncCommand:
@@ -17,12 +16,21 @@ class SyncCommand:
         """
         Sync the API product with Konnect.
         """
-        state = utils.load_state(args.state)
+        with metrics.phase(metrics.LOAD):
+            state = utils.load_state(args.state)
+            product_state = ApiProductState().from_dict(state)
 
-        product_state = ApiProductState().from_dict(state)
+        # The requests and the preparation of the documents are timed separately,
+        # what remains is the work of applying the local state to Konnect.
+        with metrics.phase(metrics.APPLY):
+            self.sync(product_state)
 
+    def sync(self, product_state: ApiProductState) -> None:
+        """
+        Sync a loaded product state with Konnect.
+        """
         self.logger.info("Product info: %s",
-                         dataclasses.asdict(product_state.info))
+                         to_dict(product_state.info))
 
         konnect_portals = [self.find_konnect_portal(
             p.portal_id if p.portal_id else p.portal_name) for p in product_state.portals]
@@ -46,8 +54,8 @@ class SyncCommand:
         """
         handled_versions = []
         for version in product_state.versions:
-            oas_data, oas_data_base64 = utils.load_oas_data(version.spec)
-            version_name = version.name or oas_data.get('info').get('version')
+            spec_content = content_cache.get(version.spec)
+            version_name = version.name or spec_content.version
             gateway_service = self.create_gateway_service(
                 version.gateway_service)
 
@@ -60,7 +68,7 @@ class SyncCommand:
             )
 
             self.konnect.upsert_api_product_version_spec(
-                api_product['id'], api_product_version['id'], oas_data_base64)
+                api_product['id'], api_product_version['id'], spec_content)
 
             for version_portal in version.portals:
                 konnect_portal = next(
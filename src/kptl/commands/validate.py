@@ -0,0 +1,313 @@
+"""
+Module for validating API product state files.
+"""
+
+import argparse
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from kptl.config import logger
+from kptl.helpers import api_product_documents, metrics, tracing, utils
+from kptl.helpers.validator import ProductStateValidator, ValidationError
+
+
+class ValidateCommand:
+    """
+    Command to validate many API product state files at once.
+
+    State files are validated in parallel worker processes and the results are
+    aggregated in a single text, JSON or JUnit report.
+    """
+
+    def __init__(self):
+        self.logger = logger.Logger()
+
+    def execute(self, args: argparse.Namespace) -> None:
+        """
+        Execute the validate command.
+        """
+        with metrics.phase(metrics.LOAD):
+            state_files = utils.find_state_files(args.paths)
+        if not state_files:
+            self.logger.error("No state files found in: %s",
+                              ", ".join(args.paths))
+            sys.exit(1)
+
+        with metrics.phase(metrics.COMPARE):
+            results = self.validate(state_files, args)
+
+        with metrics.phase(metrics.RENDER):
+            self.report(results, args)
+
+        if any(not r['valid'] for r in results):
+            sys.exit(1)
+
+    def validate(self, state_files: List[str], args: argparse.Namespace) -> List[Dict[str, Any]]:
+        """
+        Validate the state files, in worker processes unless there is a single job.
+        """
+        jobs = min(args.jobs or os.cpu_count() or 1, len(state_files))
+        if jobs == 1:
+            return [validate_state_file(f, args.check_refs, args.deep)
+                    for f in state_files]
+
+        # Imported here, as multiprocessing is not needed to validate a single file
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Forking copies the locks held by the threads of the parent, e.g. the logging
+        # listener, into workers that have no thread left to release them
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context(start_method)) as executor:
+            return list(executor.map(
+                validate_state_file, state_files, repeat(args.check_refs), repeat(args.deep),
+                chunksize=max(1, len(state_files) // (jobs * 4))))
+
+    def report(self, results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+        """
+        Print or write the report of the validation results in the requested format.
+        """
+        if args.format == "text":
+            self.print_text_report(results)
+        else:
+            report = json_report(results) if args.format == "json" else junit_report(results)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(report + "\n")
+                self.logger.info("Validation report written to '%s'", args.output)
+            else:
+                print(report)
+
+    def print_text_report(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Print the errors of the invalid state files.
+        """
+        for result in results:
+            if not result['valid']:
+                self.logger.error("Invalid state file: %s", result['state'])
+                print(" - " + "\n - ".join(e['message'] for e in result['errors']))
+
+        if len(results) > 1:
+            self.logger.info("%d of %d state files are valid",
+                             sum(1 for r in results if r['valid']), len(results))
+
+
+def validate_state_file(state_file: str, check_refs: bool = False, deep: bool = False) -> Dict[str, Any]:
+    """
+    Validate a state file, and optionally the specs and documents it references.
+
+    This runs in worker processes, so errors are returned rather than logged.
+
+    Args:
+        state_file (str): The path of the state file.
+        check_refs (bool): Whether to check that the referenced specs exist and parse,
+            and that the documents directory exists and its markdown files can be read.
+        deep (bool): Whether to also check the version names against the specs and the
+            document tree, implies `check_refs`.
+
+    Returns:
+        Dict[str, Any]: The state file, whether it is valid and its errors.
+    """
+    errors: List[ValidationError] = []
+    try:
+        with open(state_file, 'rb') as f:
+            state = utils.load_yaml(f.read())
+    except (OSError, yaml.YAMLError) as e:
+        errors.append(ValidationError("", f"Failed to load the state file: {e}"))
+    else:
+        if not isinstance(state, dict):
+            errors.append(ValidationError("", "The state file must be a dictionary."))
+        else:
+            _, state_errors = ProductStateValidator(state).validate()
+            errors.extend(state_errors or [])
+            if check_refs or deep:
+                errors.extend(check_references(state, deep))
+
+    return {
+        "state": state_file,
+        "valid": not errors,
+        "errors": [e.to_dict() for e in errors]
+    }
+
+
+def check_references(state: Dict[str, Any], deep: bool = False) -> List[ValidationError]:
+    """
+    Check the specs and documents directory referenced by a state.
+
+    Paths are resolved from the working directory, as the sync command does. References
+    that are invalid in the state itself are skipped, as the validator reports them.
+
+    Args:
+        state (Dict[str, Any]): The parsed state.
+        deep (bool): Whether to also check the version names against the specs and the
+            document tree for slugs that collide and children without a parent.
+
+    Returns:
+        List[ValidationError]: The errors found.
+    """
+    errors = []
+
+    versions = state.get('versions')
+    versions = [(i, version) for i, version in enumerate(versions if isinstance(versions, list) else [])
+                if isinstance(version, dict) and isinstance(version.get('spec'), str)]
+
+    # Each spec is loaded once, however many versions reference it
+    spec_paths = list(dict.fromkeys(version['spec'] for _, version in versions))
+    with ThreadPoolExecutor() as executor:
+        specs = dict(zip(spec_paths, executor.map(tracing.in_context(load_spec), spec_paths)))
+
+    version_names = {}
+    for i, version in versions:
+        spec, problem = specs[version['spec']]
+        if problem:
+            errors.append(ValidationError(
+                f"versions[{i}].spec", f"The spec '{version['spec']}' in 'versions[{i}]' {problem}."))
+        elif deep:
+            errors.extend(check_version_name(i, version, spec, version_names))
+
+    documents = state.get('documents')
+    if isinstance(documents, dict) and documents.get('sync') is True and isinstance(documents.get('dir'), str):
+        errors.extend(check_documents(documents['dir'], deep))
+
+    return errors
+
+
+def load_spec(spec_path: str) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Load a spec, returning either the parsed spec or the reason it could not be loaded.
+    """
+    try:
+        with open(spec_path, 'rb') as f:
+            spec = utils.load_oas(f.read(), spec_path)
+    except OSError as e:
+        return None, f"cannot be read: {e.strerror}"
+    except yaml.YAMLError as e:
+        return None, f"cannot be parsed: {e}"
+    if not isinstance(spec, dict):
+        return None, "is not an OpenAPI document"
+    return spec, None
+
+
+def check_version_name(i: int, version: Dict[str, Any], spec: Dict[str, Any],
+                       version_names: Dict[str, int]) -> List[ValidationError]:
+    """
+    Check that the declared name of a version matches the `info.version` of its spec,
+    and that no other version resolves to the same name.
+    """
+    name = version.get('name')
+    if name is not None and not isinstance(name, str):
+        return []
+
+    info = spec.get('info')
+    spec_version = info.get('version') if isinstance(info, dict) else None
+
+    if name is None and spec_version is None:
+        return [ValidationError(
+            f"versions[{i}].name", f"The version in 'versions[{i}]' has no 'name' and its spec has no 'info.version'.")]
+    if name is not None and spec_version is not None and name != str(spec_version):
+        return [ValidationError(
+            f"versions[{i}].name",
+            f"The 'name' '{name}' in 'versions[{i}]' does not match the 'info.version' '{spec_version}' of its spec.")]
+
+    resolved_name = name if name is not None else str(spec_version)
+    if resolved_name in version_names:
+        return [ValidationError(
+            f"versions[{i}].name",
+            f"The version '{resolved_name}' in 'versions[{i}]' is already defined in 'versions[{version_names[resolved_name]}]'.")]
+    version_names[resolved_name] = i
+    return []
+
+
+def check_documents(directory: str, deep: bool = False) -> List[ValidationError]:
+    """
+    Check that the documents directory exists and its documents can be read and, when
+    `deep` is set, that no two documents get the same slug and every child has a parent.
+    """
+    if not os.path.isdir(directory):
+        return [ValidationError("documents.dir", f"The documents directory '{directory}' does not exist.")]
+
+    errors = []
+    file_paths = sorted(os.path.join(root, file) for root, _, files in os.walk(directory)
+                        for file in files if file.endswith('.md'))
+    with ThreadPoolExecutor() as executor:
+        for file_path, problem in zip(file_paths, executor.map(tracing.in_context(_check_document), file_paths)):
+            if problem:
+                errors.append(ValidationError(
+                    "documents.dir", f"The document '{file_path}' cannot be read: {problem}"))
+
+    if not deep:
+        return errors
+
+    slugs: Dict[str, str] = {}
+    parents = set()
+    children = []
+    for file_path in sorted(file_paths, key=api_product_documents.extract_sort_key):
+        file_name = os.path.basename(file_path)
+        match = api_product_documents.extract_hierarchy_info(file_name)
+        _, slug = api_product_documents.generate_title_and_slug(file_name, match)
+
+        if slug in slugs:
+            errors.append(ValidationError(
+                "documents.dir", f"The documents '{slugs[slug]}' and '{file_path}' have the same slug '{slug}'."))
+        else:
+            slugs[slug] = file_path
+
+        if match and match.group(2):
+            children.append((match.group(1), file_path))
+        elif match:
+            parents.add(match.group(1))
+
+    for parent_number, file_path in children:
+        if parent_number not in parents:
+            errors.append(ValidationError(
+                "documents.dir",
+                f"The document '{file_path}' has no parent document with the '{parent_number}_' prefix."))
+
+    return errors
+
+
+def _check_document(file_path: str) -> Optional[str]:
+    """
+    Read a document, returning the reason it cannot be read, if any.
+    """
+    try:
+        api_product_documents.read_markdown_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return str(e)
+    return None
+
+
+def json_report(results: List[Dict[str, Any]]) -> str:
+    """
+    Build the JSON report of the validation results.
+    """
+    valid = sum(1 for r in results if r['valid'])
+    return json.dumps({
+        "summary": {"valid": valid, "invalid": len(results) - valid},
+        "states": results
+    }, indent=2)
+
+
+def junit_report(results: List[Dict[str, Any]]) -> str:
+    """
+    Build the JUnit XML report of the validation results, with a test case per state file.
+    """
+    suite = ET.Element("testsuite", name="kptl validate", tests=str(len(results)),
+                       failures=str(sum(1 for r in results if not r['valid'])))
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname="kptl.validate", name=result['state'])
+        if not result['valid']:
+            failure = ET.SubElement(case, "failure",
+                                    message=f"{len(result['errors'])} validation error(s)")
+            failure.text = "\n".join(
+                f"{e['path']}: {e['message']}" if e['path'] else e['message'] for e in result['errors'])
+
+    ET.indent(suite)
+    return ET.tostring(suite, encoding="unicode", xml_declaration=True)
@@ -1,10 +1,24 @@
 """
-This module provides a custom logger with colored output for different log levels.
+This module provides a custom logger with colored or JSON output, written from a background thread.
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
 from typing import Optional
 
+TEXT = "text"
+JSON = "json"
+LOG_FORMATS = (TEXT, JSON)
+
+# Attributes of every log record, the others are extra fields passed with `extra=`
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
 class ColoredFormatter(logging.Formatter):
     """
     Custom formatter to add colors to log levels.
@@ -20,16 +34,38 @@ class ColoredFormatter(logging.Formatter):
     RESET = "\033[0m"  # Reset color
 
     def format(self, record):
-        # Add color to the log level name
+        # Add color to the log level name of a copy, the record is shared by every handler
         color = self.COLORS.get(record.levelname, self.RESET)
+        record = copy.copy(record)
         record.levelname = f"{color}{record.levelname}{self.RESET}"
         return super().format(record)
 
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter writing each record as a JSON object on a single line, with the extra
+    fields of the record, e.g. the duration of a request.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
 class Logger(logging.Logger):
     """
     Singleton logger class with colored console output.
     """
     _instance: Optional[logging.Logger] = None
+    _listener: Optional[logging.handlers.QueueListener] = None
 
     def __new__(cls, name: str = "app", level: int = logging.DEBUG):
         if not cls._instance:
@@ -59,15 +95,59 @@ class Logger(logging.Logger):
             console_handler.setLevel(level)
 
             # Colored formatter for console
-            colored_formatter = ColoredFormatter(
-                fmt='%(asctime)s - %(name)s - %(levelname)-8s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            
-            # Set formatters
-            console_handler.setFormatter(colored_formatter)
+            console_handler.setFormatter(create_formatter(TEXT))
 
             # Add handlers
             logger.addHandler(console_handler)
 
         return logger
+
+    @classmethod
+    def configure(cls, log_format: str = TEXT) -> None:
+        """
+        Write the records of the logger in the given format, from a background thread.
+
+        Records are put on a queue and written to stderr by a listener thread, so that the
+        code logging never blocks on the console. The listener is stopped, and the queue
+        flushed, by `Logger.shutdown()` or at exit.
+
+        Args:
+            log_format (str): The format of the records, `text` or `json`.
+        """
+        logger = cls()
+        cls.shutdown()
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(create_formatter(log_format))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        logger.handlers = [logging.handlers.QueueHandler(records)]
+
+        cls._listener = logging.handlers.QueueListener(records, console_handler)
+        cls._listener.start()
+        atexit.register(cls.shutdown)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Write the queued records and stop the listener thread, if any. Later records are
+        written directly by the console handler.
+        """
+        if cls._listener:
+            cls._listener.stop()
+            cls().handlers = list(cls._listener.handlers)
+            cls._listener = None
+
+
+def create_formatter(log_format: str) -> logging.Formatter:
+    """
+    Create the formatter of the console records.
+
+    Args:
+        log_format (str): The format of the records, `text` or `json`.
+    """
+    if log_format == JSON:
+        return JsonFormatter()
+    return ColoredFormatter(
+        fmt='%(asctime)s - %(name)s - %(levelname)-8s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
@@ -0,0 +1,316 @@
+"""
+Synthetic fixture generator, installed as `kptl-gen`.
+
+Writes API product state files, OpenAPI specs and documents trees of a given size, to
+reproduce and benchmark how the CLI scales without hand-building fixtures:
+
+    kptl-gen product out/large --docs 1000 --versions 20 --portals 4
+    kptl-gen spec out/spec.yaml --paths 5000 --schemas 1000
+    kptl-gen docs out/docs --docs 500 --children 4 --unpublished 0.1
+
+The output only depends on the arguments: the same `--seed` writes the same files.
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from kptl import __version__
+
+# The portals of the mock Konnect API in `mock/app.py`
+MOCK_PORTALS = ["dev_portal", "prod_portal"]
+SPEC_FORMATS = ("yaml", "json")
+
+WORDS = (
+    "account", "address", "alert", "api", "audit", "billing", "catalog", "channel", "client",
+    "config", "consumer", "credential", "customer", "device", "event", "gateway", "group",
+    "invoice", "key", "log", "member", "message", "metric", "order", "payment", "plan",
+    "policy", "portal", "product", "profile", "quota", "report", "request", "role", "route",
+    "schedule", "service", "session", "setting", "shipment", "subscription", "tenant",
+    "token", "transfer", "upstream", "user", "webhook", "workspace",
+)
+PROPERTY_TYPES = (
+    {"type": "string", "maxLength": 255},
+    {"type": "string", "format": "date-time"},
+    {"type": "string", "format": "uuid"},
+    {"type": "integer", "format": "int64", "minimum": 0},
+    {"type": "number", "format": "double"},
+    {"type": "boolean"},
+    {"type": "array", "items": {"type": "string"}},
+)
+
+
+def words(rng: random.Random, count: int) -> List[str]:
+    """
+    Pick words of the vocabulary.
+    """
+    return [rng.choice(WORDS) for _ in range(count)]
+
+
+def sentence(rng: random.Random, count: int = 12) -> str:
+    """
+    Build a sentence of random words.
+    """
+    return " ".join(words(rng, count)).capitalize() + "."
+
+
+def portal_names(portals: int) -> List[str]:
+    """
+    Return the names of the given number of portals: the portals of the mock Konnect API,
+    then `portal_2`, `portal_3`, ...
+    """
+    return (MOCK_PORTALS + [f"portal_{i}" for i in range(len(MOCK_PORTALS), portals)])[:portals]
+
+
+def synthetic_spec(paths: int = 2000, schemas: int = 500, seed: int = 0, version: str = "1.0.0",
+                   title: str = "Synthetic API") -> Dict[str, Any]:
+    """
+    Build an OpenAPI document with the given number of paths and component schemas.
+
+    Args:
+        paths (int): The number of paths, each with a GET and a POST operation.
+        schemas (int): The number of component schemas.
+        seed (int): The seed of the descriptions and properties of the schemas.
+        version (str): The version of the API, `info.version`.
+        title (str): The title of the API.
+
+    Returns:
+        Dict[str, Any]: The OpenAPI document.
+    """
+    rng = random.Random(seed)
+    schemas = max(schemas, 1)
+
+    components = {}
+    for i in range(schemas):
+        properties = {"id": {"type": "string", "format": "uuid"}, "name": {"type": "string", "maxLength": 255}}
+        for name in words(rng, rng.randint(2, 8)):
+            properties.setdefault(f"{name}_{len(properties)}", dict(rng.choice(PROPERTY_TYPES)))
+        properties["parent"] = {"$ref": f"#/components/schemas/Model{(i + 1) % schemas}"}
+        components[f"Model{i}"] = {
+            "type": "object",
+            "description": sentence(rng),
+            "required": ["id", "name"],
+            "properties": properties,
+        }
+
+    operations = {}
+    for i in range(paths):
+        ref = {"$ref": f"#/components/schemas/Model{i % schemas}"}
+        resource = "-".join(words(rng, 2))
+        operations[f"/{resource}-{i}/{{id}}"] = {
+            "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+            "get": {
+                "operationId": f"getResource{i}",
+                "summary": f"Get {resource.replace('-', ' ')} {i}",
+                "description": sentence(rng, 20),
+                "responses": {
+                    "200": {"description": "OK", "content": {"application/json": {"schema": ref}}},
+                    "404": {"description": "Not found"}
+                }
+            },
+            "post": {
+                "operationId": f"updateResource{i}",
+                "summary": f"Update {resource.replace('-', ' ')} {i}",
+                "requestBody": {"content": {"application/json": {"schema": ref}}},
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": ref}}}}
+            }
+        }
+
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": title, "version": version},
+        "paths": operations,
+        "components": {"schemas": components}
+    }
+
+
+def write_spec(path: str, spec: Dict[str, Any]) -> None:
+    """
+    Write a spec as JSON if the path ends with `.json`, else as YAML.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            json.dump(spec, f, indent=2)
+        else:
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            yaml.dump(spec, f, Dumper=dumper, sort_keys=False)
+
+
+def markdown_page(rng: random.Random, title: str, size: int) -> str:
+    """
+    Build a markdown page of about `size` bytes, with sections, lists and code blocks.
+    """
+    parts = [f"# {title}\n"]
+    length = len(parts[0])
+    section = 0
+    while length < size:
+        section += 1
+        block = f"\n## {' '.join(words(rng, 3)).capitalize()}\n\n{' '.join(sentence(rng) for _ in range(4))}\n"
+        if section % 3 == 0:
+            block += "\n" + "".join(f"- {sentence(rng, 6)}\n" for _ in range(3))
+        if section % 4 == 0:
+            block += f"\n```json\n{json.dumps({word: section for word in words(rng, 3)})}\n```\n"
+        parts.append(block)
+        length += len(block)
+    return "".join(parts)
+
+
+def write_docs(directory: str, docs: int, size: int = 2048, children: int = 3,
+               unpublished: float = 0.0, seed: int = 0) -> List[str]:
+    """
+    Write a documents tree: top-level pages named `N_title.md`, each followed by up to
+    `children` child pages named `N.M_title.md`. A share of the pages is marked with the
+    `__unpublished` suffix.
+
+    Args:
+        directory (str): The documents directory.
+        docs (int): The number of pages.
+        size (int): The size of each page in bytes, approximately.
+        children (int): The number of children of each top-level page.
+        unpublished (float): The share of unpublished pages, from 0 to 1.
+        seed (int): The seed of the titles and content.
+
+    Returns:
+        List[str]: The file names of the pages.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    parent, child = -1, children
+    for _ in range(docs):
+        if child >= children:
+            parent, child = parent + 1, 0
+            prefix = f"{parent}"
+        else:
+            child += 1
+            prefix = f"{parent}.{child}"
+        title = " ".join(words(rng, rng.randint(1, 3))).capitalize()
+        suffix = "__unpublished" if rng.random() < unpublished else ""
+        name = f"{prefix}_{title.lower().replace(' ', '_')}{suffix}.md"
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(markdown_page(rng, title, size))
+        names.append(name)
+    return names
+
+
+def write_product(directory: str, name: str = "Synthetic API", docs: int = 100, versions: int = 5,
+                  portals: int = 2, paths: int = 50, schemas: Optional[int] = None, page_size: int = 2048,
+                  children: int = 3, unpublished: float = 0.0, spec_format: str = "yaml", seed: int = 0) -> str:
+    """
+    Write an API product: a documents tree, a spec per version and a state file publishing
+    every version on every portal.
+
+    Args:
+        directory (str): The directory of the product, with the state file, `docs` and `specs`.
+        name (str): The name of the API product.
+        docs (int): The number of documents, see `write_docs`.
+        versions (int): The number of versions, named "1.0.0", "2.0.0", ...
+        portals (int): The number of portals, see `portal_names`.
+        paths (int): The number of paths of each spec.
+        schemas (Optional[int]): The number of schemas of each spec, a quarter of the paths by default.
+        page_size (int): The size of each document in bytes, approximately.
+        children (int): The number of children of each top-level document.
+        unpublished (float): The share of unpublished documents.
+        spec_format (str): The format of the specs, `yaml` or `json`.
+        seed (int): The seed of the documents and specs.
+
+    Returns:
+        str: The path of the state file.
+    """
+    docs_dir = os.path.join(directory, "docs")
+    specs_dir = os.path.join(directory, "specs")
+    os.makedirs(specs_dir, exist_ok=True)
+    if docs:
+        write_docs(docs_dir, docs, page_size, children, unpublished, seed)
+
+    names = portal_names(portals)
+    state_versions = []
+    for i in range(versions):
+        version = f"{i + 1}.0.0"
+        spec_path = os.path.join(specs_dir, f"v{i + 1}.{spec_format}")
+        write_spec(spec_path, synthetic_spec(paths, schemas or max(paths // 4, 1), seed + i + 1, version, name))
+        state_versions.append({
+            "name": version,
+            "spec": spec_path,
+            "portals": [{"portal_name": portal, "publish_status": "published"} for portal in names],
+        })
+
+    state = {
+        "_version": "1.0.0",
+        "info": {"name": name, "description": f"Synthetic API product with {docs} documents and {versions} versions"},
+        "documents": {"sync": bool(docs), "dir": docs_dir},
+        "portals": [{"portal_name": portal} for portal in names],
+        "versions": state_versions,
+    }
+    state_path = os.path.join(directory, "state.yaml")
+    with open(state_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(state, f, sort_keys=False)
+    return state_path
+
+
+def get_parser_args() -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="kptl-gen", description="Generate synthetic API products, specs and documents trees")
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated content")
+
+    subparsers = parser.add_subparsers(dest="command", required=True, help="What to generate")
+
+    spec_parser = argparse.ArgumentParser(add_help=False)
+    spec_parser.add_argument("--paths", type=int, default=50, help="Number of paths of each spec")
+    spec_parser.add_argument("--schemas", type=int, default=None,
+                             help="Number of schemas of each spec, defaults to a quarter of the paths")
+
+    docs_parser = argparse.ArgumentParser(add_help=False)
+    docs_parser.add_argument("--docs", type=int, default=100, help="Number of documents")
+    docs_parser.add_argument("--page-size", type=int, default=2048, help="Size of each document in bytes")
+    docs_parser.add_argument("--children", type=int, default=3, help="Number of children of each top-level document")
+    docs_parser.add_argument("--unpublished", type=float, default=0.0, help="Share of unpublished documents, 0 to 1")
+
+    product = subparsers.add_parser(
+        "product", help="State file, specs and documents of an API product", parents=[spec_parser, docs_parser])
+    product.add_argument("directory", help="Output directory")
+    product.add_argument("--name", default="Synthetic API", help="Name of the API product")
+    product.add_argument("--versions", type=int, default=5, help="Number of versions")
+    product.add_argument("--portals", type=int, default=2,
+                         help="Number of portals: dev_portal, prod_portal, then portal_2, portal_3, ...")
+    product.add_argument("--spec-format", choices=SPEC_FORMATS, default="yaml", help="Format of the specs")
+
+    spec = subparsers.add_parser("spec", help="OpenAPI spec", parents=[spec_parser])
+    spec.add_argument("path", help="Output file, written as JSON if it ends with .json, else as YAML")
+    spec.add_argument("--api-version", default="1.0.0", help="Version of the API")
+
+    docs = subparsers.add_parser("docs", help="Documents tree", parents=[docs_parser])
+    docs.add_argument("directory", help="Output directory")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Main function of kptl-gen.
+    """
+    args = get_parser_args()
+
+    if args.command == "product":
+        print(write_product(args.directory, args.name, args.docs, args.versions, args.portals, args.paths,
+                            args.schemas, args.page_size, args.children, args.unpublished, args.spec_format,
+                            args.seed))
+    elif args.command == "spec":
+        write_spec(args.path, synthetic_spec(args.paths, args.schemas or max(args.paths // 4, 1), args.seed,
+                                             args.api_version))
+        print(args.path)
+    else:
+        write_docs(args.directory, args.docs, args.page_size, args.children, args.unpublished, args.seed)
+        print(args.directory)
+
+
+if __name__ == "__main__":
+    main()
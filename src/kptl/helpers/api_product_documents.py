@@ -4,10 +4,18 @@ It includes functions to extract hierarchy information, sort keys, parse directo
 generate titles and slugs, and extract slug tails.
 """
 
+import hashlib
 import os
 import re
-from typing import Any, Dict
-from kptl.helpers import utils
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from kptl.helpers import tracing, utils
+from kptl.helpers.content_handle import ContentHandle
+from kptl.helpers.docs_index import DocsIndex
+
+# Same as the ThreadPoolExecutor default
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
 
 
 def extract_hierarchy_info(file_name):
@@ -38,7 +46,7 @@ def extract_sort_key(file_path):
     return (int(match.group(1)), int(match.group(2)) if match and match.group(2) else 0) if match else (float('inf'), 0)
 
 
-def parse_directory(directory: str) -> Dict[str, Any]:
+def parse_directory(directory: str, with_content: bool = True, index: Optional[DocsIndex] = None) -> Dict[str, Any]:
     """
     Parse the directory to generate pages with metadata and parent-child relationships.
 
@@ -58,27 +66,137 @@ def parse_directory(directory: str) -> Dict[str, Any]:
 
     Example Output:
     [
-        {"slug": "1-introduction", "title": "Introduction", "content": "<encoded content>", "status": "published", "parent_slug": None},
-        {"slug": "1-1-getting-started", "title": "Getting started", "content": "<encoded content>", "status": "published", "parent_slug": "1-introduction"},
-        {"slug": "2-features", "title": "Features", "content": "<encoded content>", "status": "published", "parent_slug": None},
-        {"slug": "2-1-feature-one", "title": "Feature one", "content": "<encoded content>", "status": "published", "parent_slug": "2-features"},
-        {"slug": "2-2-feature-two", "title": "Feature two", "content": "<encoded content>", "status": "unpublished", "parent_slug": "2-features"},
-        {"slug": "3-conclusion", "title": "Conclusion", "content": "<encoded content>", "status": "published", "parent_slug": None}
+        {"slug": "1-introduction", "title": "Introduction", "content": "<encoded content>", "digest": "<sha256>", "status": "published", "parent_slug": None},
+        {"slug": "1-1-getting-started", "title": "Getting started", "content": "<encoded content>", "digest": "<sha256>", "status": "published", "parent_slug": "1-introduction"},
+        {"slug": "2-features", "title": "Features", "content": "<encoded content>", "digest": "<sha256>", "status": "published", "parent_slug": None},
+        {"slug": "2-1-feature-one", "title": "Feature one", "content": "<encoded content>", "digest": "<sha256>", "status": "published", "parent_slug": "2-features"},
+        {"slug": "2-2-feature-two", "title": "Feature two", "content": "<encoded content>", "digest": "<sha256>", "status": "unpublished", "parent_slug": "2-features"},
+        {"slug": "3-conclusion", "title": "Conclusion", "content": "<encoded content>", "digest": "<sha256>", "status": "published", "parent_slug": None}
     ]
 
+    Each page also holds the path of its file, as "file_path".
+
     Args:
         directory (str): Path to the directory containing markdown files.
+        with_content (bool): Whether to read the content of pages whose digest is in the index.
+        index (Optional[DocsIndex]): Index of the content digests of the files.
     Returns:
         Dict[str, Any]: List of dictionaries, each representing a page with its metadata.
     """
+    return list(iter_directory(directory, with_content=with_content, index=index))
+
+
+def iter_directory(directory: str, max_workers: Optional[int] = None, with_content: bool = True,
+                   index: Optional[DocsIndex] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the pages of a directory in order, as `parse_directory` returns them.
+
+    Args:
+        directory (str): Path to the directory containing markdown files.
+        max_workers (Optional[int]): Number of threads reading the files, defaults to
+            `DEFAULT_WORKERS`.
+        with_content (bool): Whether to read the content of pages whose digest is in the index.
+        index (Optional[DocsIndex]): Index of the content digests of the files, saved once
+            all the pages have been yielded.
+
+    Yields:
+        Dict[str, Any]: A dictionary representing a page with its metadata.
+    """
+    file_paths = (os.path.join(root, file) for root, _, files in os.walk(
+        directory) for file in files if file.endswith('.md'))
+
+    yield from iter_pages(file_paths, read_markdown_file, max_workers, with_content, index)
+
+    if index:
+        index.save()
+
+
+def read_markdown_file(file_path: str) -> str:
+    """
+    Read a markdown file from disk.
+
+    Args:
+        file_path (str): The path of the file to read.
+
+    Returns:
+        str: The content of the file.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def build_pages(file_paths: Iterable[str], read_file: Callable[[str], str],
+                max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build the pages of a documents directory from its markdown file paths.
+
+    Args:
+        file_paths (Iterable[str]): Paths of the markdown files.
+        read_file (Callable[[str], str]): Function returning the content of a file path.
+        max_workers (Optional[int]): Number of threads reading the files.
+
+    Returns:
+        List[Dict[str, Any]]: List of dictionaries, each representing a page with its metadata.
+    """
+    return list(iter_pages(file_paths, read_file, max_workers))
+
+
+def iter_pages(file_paths: Iterable[str], read_file: Callable[[str], str],
+               max_workers: Optional[int] = None, with_content: bool = True,
+               index: Optional[DocsIndex] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the pages of a documents directory from its markdown file paths.
+
+    This holds the ordering and hierarchy rules of `parse_directory`, independently of
+    where the files are read from (the working tree or a git revision). Files are read,
+    stripped and encoded on a thread pool, a bounded number of pages ahead of the one
+    being yielded, and pages are yielded in order.
+
+    With an index and `with_content` disabled, files whose digest is up to date in the
+    index are not read at all and their pages have no content.
+
+    Args:
+        file_paths (Iterable[str]): Paths of the markdown files.
+        read_file (Callable[[str], str]): Function returning the content of a file path.
+            It is called from several threads unless `max_workers` is 1.
+        max_workers (Optional[int]): Number of threads reading the files, defaults to
+            `DEFAULT_WORKERS`.
+        with_content (bool): Whether to read the content of pages whose digest is in the index.
+        index (Optional[DocsIndex]): Index of the content digests of the files, for files
+            read from disk. It is updated with the digests of the files that are read.
+
+    Yields:
+        Dict[str, Any]: A dictionary representing a page with its metadata.
+    """
+    max_workers = max_workers or DEFAULT_WORKERS
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Pages whose content is being read, in order
+        pending = deque()
+        max_pending = max_workers * 4
+
+        for page in _iter_page_metadata(file_paths):
+            digest = index.lookup(page['file_path']) if index else None
+            if digest is not None and not with_content:
+                pending.append((page, None, digest))
+            else:
+                pending.append((page, executor.submit(
+                    tracing.in_context(_read_page_content), read_file, page['file_path']), None))
+
+            if len(pending) >= max_pending:
+                yield _complete_page(*pending.popleft(), index)
 
-    parent_pages, pages = {}, []
+        while pending:
+            yield _complete_page(*pending.popleft(), index)
 
-    # Walk through the directory and sort markdown files by the extracted sort key
-    for file_path in sorted((os.path.join(root, file) for root, _, files in os.walk(directory) for file in files if file.endswith('.md')), key=extract_sort_key):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()  # Read and strip content of the file
 
+def _iter_page_metadata(file_paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the metadata of the pages in order, without reading their content.
+    """
+    parent_pages = {}
+
+    # Sort markdown files by the extracted sort key
+    for file_path in sorted(file_paths, key=extract_sort_key):
         file_name = os.path.basename(file_path)  # Get the file name
 
         # Match leading numbers and extract hierarchy info
@@ -95,17 +213,75 @@ def parse_directory(directory: str) -> Dict[str, Any]:
         if match and not match.group(2):
             parent_pages[match.group(1)] = slug
 
-        # Append the page information to the pages list
-        pages.append({
-            # Cleanup: Remove leading '-' if exists. This is to handle cases where there is no leading number.
+        yield {
+            "file_path": file_path,
             "slug": slug,
             "title": title.title(),
-            "content": utils.encode_content(content),
             "status": "unpublished" if "__unpublished" in file_name else "published",
             "parent_slug": parent_slug
-        })
+        }
+
+
+def _read_page_content(read_file: Callable[[str], str], file_path: str) -> Tuple[str, str]:
+    """
+    Read and strip the content of a page, returning it base64 encoded along with its digest.
+    """
+    content = read_file(file_path).strip().encode('utf-8')
+    return utils.encode_content(content), hashlib.sha256(content).hexdigest()
 
-    return pages
+
+def _complete_page(page: Dict[str, Any], future, digest: Optional[str],
+                   index: Optional[DocsIndex]) -> Dict[str, Any]:
+    """
+    Build the page record of a page, once its content has been read unless its digest is known.
+    """
+    content = None
+    if future is not None:
+        content, digest = future.result()
+        if index:
+            index.update(page['file_path'], digest)
+
+    return {
+        "slug": page['slug'],
+        "title": page['title'],
+        "content": content,
+        "digest": digest,
+        "status": page['status'],
+        "parent_slug": page['parent_slug'],
+        "file_path": page['file_path']
+    }
+
+
+def page_content_handle(page: Dict[str, Any]) -> ContentHandle:
+    """
+    Get a handle on the content of a page read from disk, which is read again only when loaded.
+    """
+    file_path = page['file_path']
+    return ContentHandle(file_path, page['digest'], lambda: read_markdown_file(file_path).strip())
+
+
+def iter_page_handles(directory: str, index: Optional[DocsIndex] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the pages of a directory in order, with a `ContentHandle` as their content.
+
+    The content of a page is dropped as soon as its digest is known, so the pages hold
+    no content however many there are.
+    """
+    for page in iter_directory(directory, with_content=False, index=index):
+        page['content'] = page_content_handle(page)
+        yield page
+
+
+def load_page_content(page: Dict[str, Any]) -> str:
+    """
+    Get the encoded content of a page, reading it from disk if the page was built without it.
+    """
+    content = page['content']
+    if isinstance(content, ContentHandle):
+        return content.encode()
+    if content is None:
+        return utils.encode_content(read_markdown_file(page['file_path']).strip())
+    return content
 
 
 def generate_title_and_slug(file_name, match):
@@ -0,0 +1,150 @@
+"""
+Process-wide cache for the content of spec files.
+
+Entries are keyed by the resolved path of a file and validated against its modification
+time and size, so an edited file gets a fresh entry. The raw bytes, parsed document,
+base64 form and digest of an entry are each computed on first use, and `info.version`
+is extracted without parsing the whole document unless it is already parsed.
+
+Large files are memory-mapped by `view` and consumed in chunks by `iter_chunks`, so hashing
+and uploading them does not hold the whole content in memory. They are parsed from the map
+and their version extracted from as much of it as needed, and `read` returns their content
+without keeping it. Their raw bytes are only kept once `raw` itself is used.
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any, Dict, Iterator, Union
+
+from kptl.config.logger import Logger
+from kptl.helpers import utils
+
+# Files from this size on are memory-mapped rather than read when they are streamed.
+MMAP_THRESHOLD = 1024 * 1024
+# A multiple of 3, so that the base64 encodings of consecutive chunks concatenate without padding.
+CHUNK_SIZE = 3 * 128 * 1024
+
+
+class CachedContent:
+    """
+    Lazily computed forms of the content of a file.
+    """
+
+    def __init__(self, path: str, mtime_ns: int, size: int):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+    @cached_property
+    def raw(self) -> bytes:
+        """The content of the file."""
+        return utils.read_file_content(self.path)
+
+    @cached_property
+    def data(self) -> Any:
+        """The parsed document."""
+        with self.view() as content:
+            return utils.parse_oas(content, self.path)
+
+    @cached_property
+    def version(self) -> Any:
+        """The `info.version` of the document, extracted without a full parse when possible."""
+        if 'data' not in self.__dict__:
+            with self.view() as content:
+                version = utils.extract_oas_version(content)
+            if version is not None:
+                return version
+        return self.data.get('info', {}).get('version')
+
+    def read(self) -> bytes:
+        """
+        Get the content of the file, read again for the large files that `view` maps.
+        """
+        if self._is_mapped():
+            return utils.read_file_content(self.path)
+        return self.raw
+
+    @cached_property
+    def base64(self) -> str:
+        """The content encoded to a base64 string."""
+        return utils.encode_content(self.raw)
+
+    @cached_property
+    def digest(self) -> str:
+        """The SHA-256 hex digest of the content."""
+        sha256 = hashlib.sha256()
+        with self.view() as content:
+            for chunk in iter_chunks(content):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @contextmanager
+    def view(self) -> Iterator[Union[bytes, mmap.mmap]]:
+        """
+        Provide the content as a bytes-like object, memory-mapped for large files that
+        have not been read already.
+        """
+        if not self._is_mapped():
+            yield self.raw
+            return
+
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+    def _is_mapped(self) -> bool:
+        """
+        Check whether the content is memory-mapped by `view` rather than kept as `raw`.
+        """
+        # Empty files cannot be mapped
+        return 'raw' not in self.__dict__ and self.size >= max(MMAP_THRESHOLD, 1)
+
+
+def iter_chunks(content: Union[bytes, mmap.mmap], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Iterate over a view of the content, see `CachedContent.view`, in chunks of at most
+    `chunk_size` bytes. The view is opened and closed by the caller.
+    """
+    for offset in range(0, len(content), chunk_size):
+        yield content[offset:offset + chunk_size]
+
+
+_entries: Dict[str, CachedContent] = {}
+_lock = threading.Lock()
+
+
+def get(path: str) -> CachedContent:
+    """
+    Get the cached content of a file, creating or refreshing its entry as needed.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        CachedContent: The cache entry for the current version of the file.
+    """
+    real_path = os.path.realpath(path)
+    try:
+        stat = os.stat(real_path)
+    except FileNotFoundError:
+        Logger().error("File not found: %s", path)
+        sys.exit(1)
+
+    with _lock:
+        entry = _entries.get(real_path)
+        if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+            entry = _entries[real_path] = CachedContent(
+                real_path, stat.st_mtime_ns, stat.st_size)
+    return entry
+
+
+def clear() -> None:
+    """
+    Drop all cache entries.
+    """
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,85 @@
+"""
+Handles on the content of specs and documents, loaded only when it is needed.
+"""
+
+import hashlib
+from typing import Callable, Optional, Union
+
+from kptl.helpers import content_cache, utils
+
+
+class ContentHandle:
+    """
+    A reference to content: where it comes from, e.g. a file path or a remote ID, and the
+    SHA-256 digest of its body.
+
+    Handles are compared by digest, so states can be diffed without holding the bodies of
+    their specs and documents. The body is loaded, and encoded, only when it is written.
+    """
+
+    __slots__ = ('source', 'digest', '_loader')
+
+    def __init__(self, source: str, digest: str, loader: Callable[[], Union[str, bytes]]):
+        """
+        Args:
+            source (str): Where the content comes from, for display.
+            digest (str): The SHA-256 hex digest of the body.
+            loader (Callable[[], Union[str, bytes]]): Function returning the body.
+        """
+        self.source = source
+        self.digest = digest
+        self._loader = loader
+
+    @classmethod
+    def from_file(cls, path: str) -> "ContentHandle":
+        """
+        Get a handle on the content of a file, through the spec content cache. The
+        content of a large file is read again on each load rather than kept by the cache.
+        """
+        entry = content_cache.get(path)
+        return cls(path, entry.digest, entry.read)
+
+    @classmethod
+    def from_content(cls, source: str, content: Union[str, bytes],
+                     loader: Optional[Callable[[], Union[str, bytes]]] = None) -> "ContentHandle":
+        """
+        Get a handle on content that has been fetched to compute its digest.
+
+        Args:
+            source (str): Where the content comes from, for display.
+            content (Union[str, bytes]): The body.
+            loader (Optional[Callable[[], Union[str, bytes]]]): Function fetching the body
+                again. Without one, the handle keeps `content` in memory.
+        """
+        digest = hashlib.sha256(_to_bytes(content)).hexdigest()
+        return cls(source, digest, loader or (lambda: content))
+
+    def read(self) -> bytes:
+        """
+        Load the body.
+        """
+        return _to_bytes(self._loader())
+
+    def encode(self) -> str:
+        """
+        Load the body and encode it to a base64 string.
+        """
+        return utils.encode_content(self.read())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContentHandle):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __str__(self) -> str:
+        return f"sha256:{self.digest}"
+
+    def __repr__(self) -> str:
+        return f"ContentHandle({self.source!r}, {str(self)!r})"
+
+
+def _to_bytes(content: Union[str, bytes]) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
@@ -0,0 +1,109 @@
+"""
+On-disk index of the content digests of documents, keyed by file modification time and size.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from kptl.config.logger import Logger
+
+INDEX_DIR = '.kptl'
+INDEX_PATH = os.path.join(INDEX_DIR, 'docs-index')
+INDEX_VERSION = 1
+
+
+class DocsIndex:
+    """
+    Index of the content digests of markdown files.
+
+    An entry is only used while the modification time and size of its file are unchanged,
+    which lets unchanged documents be compared by digest without being read. The index is
+    loaded from and saved to a JSON file, see `for_directory`.
+
+    Only the entries of the files looked up in the run are saved, so that the index does not
+    keep the entries of deleted or renamed files.
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        self.path = path
+        self.logger = Logger()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                self.entries = index['entries']
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, AttributeError):
+            self.logger.warning("Ignoring invalid documents index: %s", path)
+
+    @classmethod
+    def for_directory(cls, directory: str) -> 'DocsIndex':
+        """
+        Get the index of a documents directory, `.kptl/docs-index-<hash of its path>` in the
+        working directory, so that the directories of different products do not share an index.
+        """
+        key = hashlib.sha256(os.path.abspath(directory).encode('utf-8')).hexdigest()[:16]
+        return cls(f"{INDEX_PATH}-{key}")
+
+    def lookup(self, file_path: str) -> Optional[str]:
+        """
+        Get the digest of a file if its entry is up to date.
+
+        The file is stat'ed once, and an `update` of the file records that stat, so that a
+        file modified after the lookup is looked up again on the next run.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+        with self._lock:
+            self._stats[key] = (stat.st_mtime_ns, stat.st_size)
+            entry = self.entries.get(key)
+        if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+            return entry['digest']
+        return None
+
+    def update(self, file_path: str, digest: str) -> None:
+        """
+        Record the digest of a file that has been looked up.
+        """
+        key = os.path.abspath(file_path)
+        with self._lock:
+            mtime_ns, size = self._stats[key]
+            entry = {"mtime_ns": mtime_ns, "size": size, "digest": digest}
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the entries of the files looked up in the run if the index changed, replacing
+        the previous file atomically.
+        """
+        with self._lock:
+            entries = {key: entry for key, entry in self.entries.items() if key in self._stats}
+            if not self._dirty and len(entries) == len(self.entries):
+                return
+
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            # A unique temporary file, so that concurrent runs do not write the same one
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False,
+                                             prefix=os.path.basename(self.path) + '.', suffix='.tmp') as tmp_file:
+                try:
+                    json.dump({"version": INDEX_VERSION, "entries": entries}, tmp_file)
+                except BaseException:
+                    tmp_file.close()
+                    os.unlink(tmp_file.name)
+                    raise
+            os.replace(tmp_file.name, self.path)
+            self.entries = entries
+            self._dirty = False
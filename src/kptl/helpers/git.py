@@ -0,0 +1,131 @@
+"""
+Helpers for reading files from a git revision without checking it out.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from typing import List, Optional
+
+from kptl.config.logger import Logger
+
+
+class GitRevision:
+    """
+    Read-only view of the files of a git revision.
+
+    The revision is resolved to a commit once, then blobs are streamed from a single
+    long-lived `git cat-file --batch` process, so reading many files costs one process
+    spawn in total. Keep the revision open for as long as its files may be read.
+    """
+
+    def __init__(self, ref: str, cwd: Optional[str] = None):
+        self.ref = ref
+        self.cwd = os.path.realpath(cwd or os.getcwd())
+        self.root = self._git("rev-parse", "--show-toplevel").strip()
+        self.commit = self._git(
+            "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}",
+            error=f"Unknown git revision '{ref}'").strip()
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "GitRevision":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _git(self, *args: str, cwd: Optional[str] = None, error: Optional[str] = None) -> str:
+        """
+        Run a git command and return its standard output.
+
+        Exits with `error`, or the command that failed, followed by the error output of git.
+        """
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=cwd or self.cwd, capture_output=True, check=True)
+        except FileNotFoundError:
+            Logger().error("The git executable could not be found")
+            sys.exit(1)
+        except subprocess.CalledProcessError as e:
+            message = error or f"'git {args[0]}' failed"
+            stderr = e.stderr.decode('utf-8').strip()
+            if stderr:
+                message = f"{message}: {stderr}"
+            Logger().error(message)
+            sys.exit(1)
+        return result.stdout.decode('utf-8')
+
+    def _repo_path(self, path: str) -> Optional[str]:
+        """
+        Convert a path relative to the working directory into a path relative to the repository root.
+        """
+        repo_path = os.path.relpath(os.path.join(
+            self.cwd, path), os.path.realpath(self.root))
+        if repo_path == os.pardir or repo_path.startswith(os.pardir + os.sep):
+            return None
+        return repo_path.replace(os.sep, '/')
+
+    def read(self, path: str) -> Optional[bytes]:
+        """
+        Read the content of a file at this revision.
+
+        Args:
+            path (str): The path of the file, relative to the working directory.
+
+        Returns:
+            Optional[bytes]: The file content, or None if the file does not exist at this revision.
+        """
+        repo_path = self._repo_path(path)
+        if repo_path is None:
+            return None
+
+        # The objects are requested and read in turn from the one process
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(
+                    ["git", "cat-file", "--batch"], cwd=self.root, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+            self._batch.stdin.write(f"{self.commit}:{repo_path}\n".encode('utf-8'))
+            self._batch.stdin.flush()
+
+            # Objects that cannot be read are reported as `<name> missing` or
+            # `<name> ambiguous`, and the name holds the path, which may have spaces.
+            header = self._batch.stdout.readline().decode('utf-8').rstrip('\n')
+            if header.endswith((' missing', ' ambiguous')):
+                return None
+
+            _, object_type, size = header.rsplit(' ', 2)
+            content = self._batch.stdout.read(int(size))
+            self._batch.stdout.read(1)  # Trailing newline after each object
+
+        return content if object_type == "blob" else None
+
+    def list_files(self, directory: str) -> List[str]:
+        """
+        List the files under a directory at this revision, recursively.
+
+        Args:
+            directory (str): The directory, relative to the working directory.
+
+        Returns:
+            List[str]: The absolute paths the files would have in a checkout of this revision.
+        """
+        repo_path = self._repo_path(directory)
+        if repo_path is None:
+            return []
+
+        output = self._git("ls-tree", "-r", "-z", "--name-only",
+                           self.commit, "--", repo_path, cwd=self.root)
+        return [os.path.join(self.root, name) for name in output.split('\0') if name]
+
+    def close(self) -> None:
+        """
+        Stop the background git process, if any.
+        """
+        with self._lock:
+            if self._batch is not None:
+                self._batch.stdin.close()
+                self._batch.wait()
+                self._batch = None
@@ -0,0 +1,248 @@
+"""
+Process-wide timing metrics of a CLI run, reported with `--timings`.
+
+Commands time their phases with `metrics.phase(...)`, and the instrumented HTTP session
+of the service clients records every request with `Metrics().record_request(...)`. The
+time spent in requests is reported per endpoint and is not counted in the phase that
+made them, so the phases only account for the work of the CLI itself.
+
+The phases and the time of the remote reads and writes are those of the main thread, so
+that they add up to at most the wall time. Work run concurrently on a thread pool is
+timed as a whole by a `CONCURRENT` phase around the pool; its own phases are traced but
+not timed, while its requests are still reported per endpoint.
+
+The requests and bytes sent and received per endpoint are also counted, reported with
+`--report-calls` and capped with `--max-requests`.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from kptl.helpers import tracing
+
+LOAD = "load"
+PREPARE = "prepare"
+# Building the remote state, outside of its requests
+FETCH = "fetch"
+COMPARE = "compare"
+# Applying the local state to Konnect, outside of its requests
+APPLY = "apply"
+RENDER = "render"
+# Work run on a thread pool, requests included
+CONCURRENT = "concurrent"
+
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class RequestBudgetExceeded(BaseException):
+    """
+    Raised before a request that would exceed the request budget of the run.
+
+    It is not an `Exception`, so that the handlers of the commands reporting a failed
+    operation and carrying on do not catch it: the run stops, like on an interrupt.
+    """
+
+    def __init__(self, max_requests: int):
+        super().__init__(f"The run exceeded its budget of {max_requests} requests")
+        self.max_requests = max_requests
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Get the template of an API path relative to the API base URL, e.g.
+    "/api-products/{id}/documents" for "/api-products/4d2e.../documents".
+
+    Konnect paths alternate collections and IDs, so every other segment is an ID.
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    return '/' + '/'.join('{id}' if i % 2 else segment for i, segment in enumerate(segments))
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Get a percentile of sorted values, by the nearest-rank method.
+    """
+    if not values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class Metrics:  # pylint: disable=too-many-instance-attributes
+    """
+    Singleton collecting the time of the phases of a run and of its HTTP requests.
+    """
+    _instance: Optional["Metrics"] = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+            cls._instance.reset()
+        return cls._instance
+
+    def __init__(self):
+        # The state is set by `reset`, when the singleton is created
+        self.started: float
+        self.phases: Dict[str, float]
+        self.requests: Dict[Tuple[str, str], List[float]]
+        # Bytes sent and received per endpoint
+        self.transferred: Dict[Tuple[str, str], List[int]]
+        # Time of the read and write requests of the main thread
+        self.remote_reads: float
+        self.remote_writes: float
+        self.count: int
+        self.max_requests: Optional[int]
+        # Request time spent in each of the phases open in the main thread
+        self._frames: List[float]
+        self._lock: threading.Lock
+
+    def reset(self) -> None:
+        """
+        Drop everything recorded and restart the wall clock.
+        """
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.requests = {}
+        self.transferred = {}
+        self.remote_reads = 0.0
+        self.remote_writes = 0.0
+        self.count = 0
+        self.max_requests = None
+        self._frames = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a phase, excluding the requests and nested phases it runs, and trace it.
+
+        Phases outside of the main thread are only traced, see the module documentation.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            with tracing.span(name, tracing.PHASE):
+                yield
+            return
+
+        frames = self._frames
+        frames.append(0.0)
+        start = time.perf_counter()
+        try:
+            with tracing.span(name, tracing.PHASE):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            excluded = frames.pop()
+            if frames:
+                frames[-1] += elapsed
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + max(elapsed - excluded, 0.0)
+
+    def start_request(self) -> None:
+        """
+        Count a request about to be sent.
+
+        Raises:
+            RequestBudgetExceeded: If the request would exceed `max_requests`.
+        """
+        with self._lock:
+            if self.max_requests is not None and self.count >= self.max_requests:
+                raise RequestBudgetExceeded(self.max_requests)
+            self.count += 1
+
+    def record_request(self, method: str, endpoint: str, duration: float, sent: int = 0, received: int = 0) -> None:
+        """
+        Record an HTTP request.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The endpoint template, see `endpoint_template`.
+            duration (float): The duration of the request in seconds.
+            sent (int): The size of the request body in bytes.
+            received (int): The size of the response body in bytes.
+        """
+        main_thread = threading.current_thread() is threading.main_thread()
+        if main_thread and self._frames:
+            self._frames[-1] += duration
+        with self._lock:
+            if main_thread and method in READ_METHODS:
+                self.remote_reads += duration
+            elif main_thread:
+                self.remote_writes += duration
+            self.requests.setdefault((method, endpoint), []).append(duration)
+            transferred = self.transferred.setdefault((method, endpoint), [0, 0])
+            transferred[0] += sent
+            transferred[1] += received
+
+    def calls(self) -> Dict[str, Any]:
+        """
+        Get the number of requests and of bytes sent and received per endpoint, the
+        endpoints with the most requests first.
+        """
+        with self._lock:
+            endpoints = [{"method": method, "endpoint": endpoint, "requests": len(durations),
+                          "bytes_sent": self.transferred[(method, endpoint)][0],
+                          "bytes_received": self.transferred[(method, endpoint)][1]}
+                         for (method, endpoint), durations in self.requests.items()]
+        endpoints.sort(key=lambda row: (-row["requests"], row["endpoint"], row["method"]))
+        return {
+            "requests": sum(row["requests"] for row in endpoints),
+            "bytes_sent": sum(row["bytes_sent"] for row in endpoints),
+            "bytes_received": sum(row["bytes_received"] for row in endpoints),
+            "endpoints": endpoints,
+        }
+
+    def calls_report(self) -> str:
+        """
+        Get the table of the requests per endpoint, see `calls`.
+        """
+        calls = self.calls()
+        header = f"  {'endpoint':<68} {'requests':>8} {'sent':>12} {'received':>12}"
+        lines = ["API calls:", header]
+        for row in calls["endpoints"]:
+            lines.append(f"  {row['method'] + ' ' + row['endpoint']:<68} {row['requests']:>8} "
+                         f"{row['bytes_sent']:>12} {row['bytes_received']:>12}")
+        lines.append(f"  {'total':<68} {calls['requests']:>8} {calls['bytes_sent']:>12} {calls['bytes_received']:>12}")
+        return "\n".join(lines)
+
+    def report(self) -> str:
+        """
+        Get the timings report: the time of each phase and of the remote reads and writes,
+        then the count and latency of the requests per endpoint.
+        """
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            phases = dict(self.phases)
+            requests = {key: sorted(durations) for key, durations in self.requests.items()}
+            reads, writes = self.remote_reads, self.remote_writes
+
+        rows = [(name, phases.pop(name, 0.0)) for name in (LOAD, PREPARE)]
+        rows.append(("remote reads", reads))
+        rows.extend((name, phases.pop(name, 0.0)) for name in (FETCH, COMPARE, APPLY))
+        rows.append(("remote writes", writes))
+        rows.append((RENDER, phases.pop(RENDER, 0.0)))
+        rows.extend(sorted(phases.items()))
+        rows.append(("other", max(wall - sum(t for _, t in rows), 0.0)))
+
+        lines = [f"Timings (wall time {wall * 1000:.1f}ms):", f"  {'phase':<16} {'time':>10}"]
+        lines.extend(f"  {name:<16} {seconds * 1000:8.1f}ms" for name, seconds in rows)
+
+        if requests:
+            lines.append("")
+            lines.append(f"  {'endpoint':<68} {'count':>6} {'total':>10} {'p50':>10} {'p95':>10}")
+            for (method, endpoint), durations in sorted(
+                    requests.items(), key=lambda item: (item[0][0] not in READ_METHODS, item[0][1])):
+                lines.append(
+                    f"  {method + ' ' + endpoint:<68} {len(durations):>6} {sum(durations) * 1000:8.1f}ms "
+                    f"{percentile(durations, 50) * 1000:8.1f}ms {percentile(durations, 95) * 1000:8.1f}ms")
+
+        return "\n".join(lines)
+
+
+def phase(name: str):
+    """
+    Time a phase of the run, see `Metrics.phase`.
+    """
+    return Metrics().phase(name)
@@ -0,0 +1,139 @@
+"""
+Profiling of a CLI run, enabled with `--profile cpu|mem`.
+
+The CPU profile is written by `cProfile` as a `.pstats` file, to be read with `pstats`
+or a viewer such as snakeviz. It includes the threads started while profiling, e.g. the
+workers of the thread pools reading documents and diffing state files. The memory profile
+is written by `tracemalloc` as a text file with the peak traced memory and the top
+allocation sites.
+
+Files are named after the command and the API product, e.g. `kptl-sync-httpbin-api.pstats`,
+so the profiles of different products do not overwrite each other.
+"""
+
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+CPU = "cpu"
+MEMORY = "mem"
+PROFILES = (CPU, MEMORY)
+
+EXTENSIONS = {CPU: ".pstats", MEMORY: ".mem.txt"}
+# Number of allocation sites listed in the memory profile
+TOP_ALLOCATIONS = 25
+
+
+def output_path(directory: str, kind: str, command: str, product: Optional[str] = None) -> str:
+    """
+    Get the path of the profile of a run.
+
+    Args:
+        directory (str): The directory of the profiles.
+        kind (str): The kind of profile, `cpu` or `mem`.
+        command (str): The name of the command.
+        product (Optional[str]): The name or ID of the API product, if the command has one.
+    """
+    name = f"kptl-{command}"
+    if product:
+        name += "-" + re.sub(r'[^a-z0-9]+', '-', product.lower()).strip('-')
+    return os.path.join(directory, name + EXTENSIONS[kind])
+
+
+@contextmanager
+def profile(kind: str, path: str) -> Iterator[None]:
+    """
+    Profile a block and write the profile to a file, even if the block exits.
+
+    Args:
+        kind (str): The kind of profile, `cpu` or `mem`.
+        path (str): The path of the profile file.
+    """
+    if kind == CPU:
+        with _cpu_profile(path):
+            yield
+    else:
+        with _memory_profile(path):
+            yield
+
+
+@contextmanager
+def _cpu_profile(path: str) -> Iterator[None]:
+    import cProfile
+    import pstats
+
+    # Before Python 3.12 a profiler only sees the thread that enabled it, so each thread
+    # started while profiling gets its own profiler, merged into the profile at the end.
+    # Since 3.12 a profiler sees every thread, and only one can be enabled at a time.
+    workers: List[cProfile.Profile] = []
+    previous = threading.getprofile()
+    if sys.version_info < (3, 12):
+        threading.setprofile(_profile_worker(workers))
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        threading.setprofile(previous)
+        stats = pstats.Stats(profiler)
+        for worker in workers:
+            stats.add(worker)
+        stats.dump_stats(path)
+
+
+def _profile_worker(workers: list) -> Callable[..., None]:
+    """
+    Get a `threading.setprofile` hook enabling a new profiler in each thread started.
+    """
+    import cProfile
+
+    def start(*_) -> None:
+        # Enabling the profiler replaces the hook for the rest of the thread
+        worker = cProfile.Profile()
+        workers.append(worker)
+        worker.enable()
+
+    return start
+
+
+@contextmanager
+def _memory_profile(path: str) -> Iterator[None]:
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        write_memory_report(path, snapshot, current, peak)
+
+
+def write_memory_report(path: str, snapshot, current: int, peak: int) -> None:
+    """
+    Write the peak memory and the top allocation sites of a `tracemalloc` snapshot.
+    """
+    import tracemalloc
+
+    # Allocations of tracemalloc itself and of the import machinery are noise
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    statistics = snapshot.statistics('lineno')
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n")
+        file.write(f"Traced memory at exit: {current / 1024:.1f} KiB\n\n")
+        file.write(f"Top {TOP_ALLOCATIONS} allocation sites still allocated at exit:\n")
+        for statistic in statistics[:TOP_ALLOCATIONS]:
+            frame = statistic.traceback[0]
+            file.write(f"{statistic.size / 1024:10.1f} KiB {statistic.count:8} blocks  "
+                       f"{frame.filename}:{frame.lineno}\n")
@@ -0,0 +1,133 @@
+"""
+Streaming request bodies for large uploads.
+"""
+
+import base64
+import io
+import json
+from contextlib import ExitStack
+from typing import Any, Dict, Iterator
+
+from kptl.helpers import content_cache
+from kptl.helpers.content_cache import CachedContent
+
+READ_SIZE = 64 * 1024
+# Closes the string of the encoded content and the JSON object
+SUFFIX = b'"}'
+
+# The parts of the body, in order
+HEAD, CONTENT, TAIL, END = range(4)
+
+
+class Base64JsonBody:  # pylint: disable=too-many-instance-attributes
+    """
+    A JSON object request body with a field holding the base64 encoded content of a file.
+
+    The content is encoded chunk by chunk while the body is read, so the encoded content
+    and the serialized JSON are never built in memory. Passed as `data` to `requests`,
+    the body is sent with a Content-Length taken from `len()`.
+
+    The body can be read again from the start with `seek(0)`, which `requests` and
+    `urllib3` do to resend it on redirects and retries, and every iteration yields the
+    whole body. The view of the content is closed once the content has been read, or
+    by `close()`.
+    """
+
+    def __init__(self, fields: Dict[str, Any], content_field: str, content: CachedContent):
+        """
+        Args:
+            fields (Dict[str, Any]): The other fields of the JSON object.
+            content_field (str): The name of the field holding the encoded content.
+            content (CachedContent): The content to encode.
+        """
+        head = json.dumps(fields)[:-1]
+        if fields:
+            head += ", "
+        self._prefix = f'{head}{json.dumps(content_field)}: "'.encode('utf-8')
+        self._content = content
+        self._views = ExitStack()
+        self._view = None
+        self._part = HEAD
+        self._offset = 0
+        self._position = 0
+        self._buffer = bytearray()
+
+    def __len__(self) -> int:
+        encoded_size = (self._content.size + 2) // 3 * 4
+        return len(self._prefix) + encoded_size + len(SUFFIX)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.seek(0)
+        return iter(lambda: self.read(READ_SIZE), b"")
+
+    def _next_part(self) -> bytes:
+        """
+        Get the next part of the body: the prefix, an encoded chunk of the content, or the
+        suffix. Returns an empty part at the end of the body.
+        """
+        if self._part == HEAD:
+            self._part = CONTENT
+            return self._prefix
+
+        if self._part == CONTENT:
+            if self._view is None:
+                self._view = self._views.enter_context(self._content.view())
+            chunk = self._view[self._offset:self._offset + content_cache.CHUNK_SIZE]
+            if chunk:
+                self._offset += len(chunk)
+                return base64.b64encode(chunk)
+            self.close()
+            self._part = TAIL
+
+        if self._part == TAIL:
+            self._part = END
+            return SUFFIX
+
+        return b""
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to `size` bytes of the body, or the rest of it if `size` is negative.
+        """
+        while size < 0 or len(self._buffer) < size:
+            part = self._next_part()
+            if not part:
+                break
+            self._buffer += part
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        """
+        Get the number of bytes of the body read so far.
+        """
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Move to a position from the start of the body. The body is encoded again from the
+        start, so seeking forward reads the skipped bytes.
+        """
+        if whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Base64JsonBody can only seek from the start")
+
+        self.close()
+        self._part = HEAD
+        self._offset = 0
+        self._position = 0
+        self._buffer.clear()
+        while self._position < offset and self.read(min(offset - self._position, READ_SIZE)):
+            pass
+        return self._position
+
+    def close(self) -> None:
+        """
+        Close the view of the content, if it is open.
+        """
+        self._views.close()
+        self._view = None
@@ -0,0 +1,356 @@
+"""
+Validator of `schemas/state.schema.json`, generated by fastjsonschema with `make schema-validator`.
+
+Do not edit, change the schema and generate the validator again.
+"""
+# pylint: skip-file
+SCHEMA_DIGEST = "ecf98c539aa0c090a0cbf8f04b7879812ff74451aac49e608ff7b6fc8ea44f83"
+VERSION = "2.22.2"
+from decimal import Decimal
+import re
+from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException
+
+
+REGEX_PATTERNS = {
+    '^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$': re.compile('^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?\\Z'),
+    '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$': re.compile('^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?\\Z')
+}
+
+NoneType = type(None)
+
+def validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json(data, custom_formats={}, name_prefix=None):
+    errors = []
+    if not isinstance(data, (dict)):
+        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'http://json-schema.org/draft-07/schema#', '$id': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json', 'title': 'kptl API product state', 'description': "State file of an API product managed with kptl. The 'x-message' keywords hold the error messages of the CLI, where {path} is the path of the invalid field, {parent} the path of the object or list holding it and {index} its key or index.", 'type': 'object', 'x-message': 'The state must be a dictionary.', 'required': ['_version', 'info'], 'properties': {'_version': {'description': 'Version of the state file format.', 'type': 'string', 'pattern': '^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$', 'x-message': "Invalid or missing '_version'"}, 'info': {'description': 'The API product.', 'type': 'object', 'x-message': "Missing or invalid 'info'", 'required': ['name'], 'properties': {'name': {'description': 'Name of the API product.', 'type': 'string', 'x-message': "Missing or invalid 'info.name'"}, 'description': {'description': 'Description of the API product.', 'type': 'string', 'x-message': "Invalid 'info.description'"}}}, 'documents': {'description': 'Synchronization of the API product documents.', 'type': 'object', 'x-message': "Invalid 'documents'", 'properties': {'sync': {'description': 'Whether to sync the documents.', 'type': 'boolean', 'x-message': "Invalid 'documents.sync'"}, 'dir': {'description': 'Directory holding the documents.', 'type': 'string', 'x-message': "Invalid 'documents.dir'"}}, 'if': {'properties': {'sync': {'const': True}}, 'required': ['sync']}, 'then': {'required': ['dir'], 'x-message': "Missing 'documents.dir' when 'documents.sync' is true"}}, 'portals': {'description': 'Portals the API product is published to.', 'type': 'array', 'x-message': "The 'portals' field must be a list.", 'items': {'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}}, 'versions': {'description': 'Versions of the API product.', 'type': 'array', 'x-message': "The 'versions' field must be a list.", 'items': {'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/version_portal'}}, 'gateway_service': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/gateway_service'}}}}}, 'definitions': {'portal': {'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'version_portal': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}, 'version': {'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'$ref': '#/definitions/portal'}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}}}}}, rule='type'))
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['_version', 'info']) - data.keys()
+        if data__missing_keys:
+            errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'http://json-schema.org/draft-07/schema#', '$id': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json', 'title': 'kptl API product state', 'description': "State file of an API product managed with kptl. The 'x-message' keywords hold the error messages of the CLI, where {path} is the path of the invalid field, {parent} the path of the object or list holding it and {index} its key or index.", 'type': 'object', 'x-message': 'The state must be a dictionary.', 'required': ['_version', 'info'], 'properties': {'_version': {'description': 'Version of the state file format.', 'type': 'string', 'pattern': '^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$', 'x-message': "Invalid or missing '_version'"}, 'info': {'description': 'The API product.', 'type': 'object', 'x-message': "Missing or invalid 'info'", 'required': ['name'], 'properties': {'name': {'description': 'Name of the API product.', 'type': 'string', 'x-message': "Missing or invalid 'info.name'"}, 'description': {'description': 'Description of the API product.', 'type': 'string', 'x-message': "Invalid 'info.description'"}}}, 'documents': {'description': 'Synchronization of the API product documents.', 'type': 'object', 'x-message': "Invalid 'documents'", 'properties': {'sync': {'description': 'Whether to sync the documents.', 'type': 'boolean', 'x-message': "Invalid 'documents.sync'"}, 'dir': {'description': 'Directory holding the documents.', 'type': 'string', 'x-message': "Invalid 'documents.dir'"}}, 'if': {'properties': {'sync': {'const': True}}, 'required': ['sync']}, 'then': {'required': ['dir'], 'x-message': "Missing 'documents.dir' when 'documents.sync' is true"}}, 'portals': {'description': 'Portals the API product is published to.', 'type': 'array', 'x-message': "The 'portals' field must be a list.", 'items': {'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}}, 'versions': {'description': 'Versions of the API product.', 'type': 'array', 'x-message': "The 'versions' field must be a list.", 'items': {'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/version_portal'}}, 'gateway_service': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/gateway_service'}}}}}, 'definitions': {'portal': {'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'version_portal': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}, 'version': {'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'$ref': '#/definitions/portal'}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}}}}}, rule='required'))
+        data_keys = set(data.keys())
+        if "_version" in data_keys:
+            data_keys.remove("_version")
+            data__version = data["_version"]
+            if not isinstance(data__version, (str)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + "._version must be string", value=data__version, name="" + (name_prefix or "data") + "._version", definition={'description': 'Version of the state file format.', 'type': 'string', 'pattern': '^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$', 'x-message': "Invalid or missing '_version'"}, rule='type'))
+            if isinstance(data__version, str):
+                if not REGEX_PATTERNS['^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$'].search(data__version):
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + "._version must match pattern ^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$", value=data__version, name="" + (name_prefix or "data") + "._version", definition={'description': 'Version of the state file format.', 'type': 'string', 'pattern': '^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?(?:\\+([0-9A-Za-z-]+(?:\\.[0-9A-Za-z-]+)*))?$', 'x-message': "Invalid or missing '_version'"}, rule='pattern'))
+        if "info" in data_keys:
+            data_keys.remove("info")
+            data__info = data["info"]
+            if not isinstance(data__info, (dict)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".info must be object", value=data__info, name="" + (name_prefix or "data") + ".info", definition={'description': 'The API product.', 'type': 'object', 'x-message': "Missing or invalid 'info'", 'required': ['name'], 'properties': {'name': {'description': 'Name of the API product.', 'type': 'string', 'x-message': "Missing or invalid 'info.name'"}, 'description': {'description': 'Description of the API product.', 'type': 'string', 'x-message': "Invalid 'info.description'"}}}, rule='type'))
+            data__info_is_dict = isinstance(data__info, dict)
+            if data__info_is_dict:
+                data__info__missing_keys = set(['name']) - data__info.keys()
+                if data__info__missing_keys:
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".info must contain " + (str(sorted(data__info__missing_keys)) + " properties"), value=data__info, name="" + (name_prefix or "data") + ".info", definition={'description': 'The API product.', 'type': 'object', 'x-message': "Missing or invalid 'info'", 'required': ['name'], 'properties': {'name': {'description': 'Name of the API product.', 'type': 'string', 'x-message': "Missing or invalid 'info.name'"}, 'description': {'description': 'Description of the API product.', 'type': 'string', 'x-message': "Invalid 'info.description'"}}}, rule='required'))
+                data__info_keys = set(data__info.keys())
+                if "name" in data__info_keys:
+                    data__info_keys.remove("name")
+                    data__info__name = data__info["name"]
+                    if not isinstance(data__info__name, (str)):
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".info.name must be string", value=data__info__name, name="" + (name_prefix or "data") + ".info.name", definition={'description': 'Name of the API product.', 'type': 'string', 'x-message': "Missing or invalid 'info.name'"}, rule='type'))
+                if "description" in data__info_keys:
+                    data__info_keys.remove("description")
+                    data__info__description = data__info["description"]
+                    if not isinstance(data__info__description, (str)):
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".info.description must be string", value=data__info__description, name="" + (name_prefix or "data") + ".info.description", definition={'description': 'Description of the API product.', 'type': 'string', 'x-message': "Invalid 'info.description'"}, rule='type'))
+        if "documents" in data_keys:
+            data_keys.remove("documents")
+            data__documents = data["documents"]
+            if not isinstance(data__documents, (dict)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".documents must be object", value=data__documents, name="" + (name_prefix or "data") + ".documents", definition={'description': 'Synchronization of the API product documents.', 'type': 'object', 'x-message': "Invalid 'documents'", 'properties': {'sync': {'description': 'Whether to sync the documents.', 'type': 'boolean', 'x-message': "Invalid 'documents.sync'"}, 'dir': {'description': 'Directory holding the documents.', 'type': 'string', 'x-message': "Invalid 'documents.dir'"}}, 'if': {'properties': {'sync': {'const': True}}, 'required': ['sync']}, 'then': {'required': ['dir'], 'x-message': "Missing 'documents.dir' when 'documents.sync' is true"}}, rule='type'))
+            data__documents_is_dict = isinstance(data__documents, dict)
+            if data__documents_is_dict:
+                data__documents_keys = set(data__documents.keys())
+                if "sync" in data__documents_keys:
+                    data__documents_keys.remove("sync")
+                    data__documents__sync = data__documents["sync"]
+                    if not isinstance(data__documents__sync, (bool)):
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".documents.sync must be boolean", value=data__documents__sync, name="" + (name_prefix or "data") + ".documents.sync", definition={'description': 'Whether to sync the documents.', 'type': 'boolean', 'x-message': "Invalid 'documents.sync'"}, rule='type'))
+                if "dir" in data__documents_keys:
+                    data__documents_keys.remove("dir")
+                    data__documents__dir = data__documents["dir"]
+                    if not isinstance(data__documents__dir, (str)):
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".documents.dir must be string", value=data__documents__dir, name="" + (name_prefix or "data") + ".documents.dir", definition={'description': 'Directory holding the documents.', 'type': 'string', 'x-message': "Invalid 'documents.dir'"}, rule='type'))
+            try:
+                data__documents_is_dict = isinstance(data__documents, dict)
+                if data__documents_is_dict:
+                    data__documents__missing_keys = set(['sync']) - data__documents.keys()
+                    if data__documents__missing_keys:
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".documents must contain " + (str(sorted(data__documents__missing_keys)) + " properties"), value=data__documents, name="" + (name_prefix or "data") + ".documents", definition={'properties': {'sync': {'const': True}}, 'required': ['sync']}, rule='required')
+                    data__documents_keys = set(data__documents.keys())
+                    if "sync" in data__documents_keys:
+                        data__documents_keys.remove("sync")
+                        data__documents__sync = data__documents["sync"]
+                        if not (isinstance(data__documents__sync, bool) and data__documents__sync is True):
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".documents.sync must be same as const definition: True", value=data__documents__sync, name="" + (name_prefix or "data") + ".documents.sync", definition={'const': True}, rule='const')
+            except (JsonSchemaValueException, JsonSchemaValuesException):
+                pass
+            else:
+                data__documents_is_dict = isinstance(data__documents, dict)
+                if data__documents_is_dict:
+                    data__documents__missing_keys = set(['dir']) - data__documents.keys()
+                    if data__documents__missing_keys:
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".documents must contain " + (str(sorted(data__documents__missing_keys)) + " properties"), value=data__documents, name="" + (name_prefix or "data") + ".documents", definition={'required': ['dir'], 'x-message': "Missing 'documents.dir' when 'documents.sync' is true"}, rule='required'))
+        if "portals" in data_keys:
+            data_keys.remove("portals")
+            data__portals = data["portals"]
+            if not isinstance(data__portals, (list, tuple)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".portals must be array", value=data__portals, name="" + (name_prefix or "data") + ".portals", definition={'description': 'Portals the API product is published to.', 'type': 'array', 'x-message': "The 'portals' field must be a list.", 'items': {'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}}, rule='type'))
+            data__portals_is_list = isinstance(data__portals, (list, tuple))
+            if data__portals_is_list:
+                data__portals_len = len(data__portals)
+                for data__portals_x, data__portals_item in enumerate(data__portals):
+                    try:
+                        validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_portal(data__portals_item, custom_formats, (name_prefix or "data") + ".portals[{data__portals_x}]".format(**locals()))
+                    except JsonSchemaValuesException as e:
+                        errors.extend(e.errors)
+        if "versions" in data_keys:
+            data_keys.remove("versions")
+            data__versions = data["versions"]
+            if not isinstance(data__versions, (list, tuple)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".versions must be array", value=data__versions, name="" + (name_prefix or "data") + ".versions", definition={'description': 'Versions of the API product.', 'type': 'array', 'x-message': "The 'versions' field must be a list.", 'items': {'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/version_portal'}}, 'gateway_service': {'$ref': 'https://raw.githubusercontent.com/pantsel/konnect-portal-ops-cli/main/src/kptl/schemas/state.schema.json#/definitions/gateway_service'}}}}, rule='type'))
+            data__versions_is_list = isinstance(data__versions, (list, tuple))
+            if data__versions_is_list:
+                data__versions_len = len(data__versions)
+                for data__versions_x, data__versions_item in enumerate(data__versions):
+                    try:
+                        validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_version(data__versions_item, custom_formats, (name_prefix or "data") + ".versions[{data__versions_x}]".format(**locals()))
+                    except JsonSchemaValuesException as e:
+                        errors.extend(e.errors)
+    if errors: raise JsonSchemaValuesException(errors)
+    return data
+
+def validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_version(data, custom_formats={}, name_prefix=None):
+    errors = []
+    if not isinstance(data, (dict)):
+        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'$ref': '#/definitions/portal'}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}}}, rule='type'))
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['spec']) - data.keys()
+        if data__missing_keys:
+            errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'description': 'A version of the API product.', 'type': 'object', 'x-message': "Each version entry in '{parent}' must be a dictionary. Error at index {index}.", 'required': ['spec'], 'properties': {'name': {'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, 'spec': {'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, 'portals': {'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'$ref': '#/definitions/portal'}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}}, 'gateway_service': {'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}}}, rule='required'))
+        data_keys = set(data.keys())
+        if "name" in data_keys:
+            data_keys.remove("name")
+            data__name = data["name"]
+            if not isinstance(data__name, (str)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".name must be string", value=data__name, name="" + (name_prefix or "data") + ".name", definition={'description': "Name of the version, defaults to the 'info.version' of the spec.", 'type': 'string', 'x-message': "The 'name' in '{parent}' must be a string."}, rule='type'))
+        if "spec" in data_keys:
+            data_keys.remove("spec")
+            data__spec = data["spec"]
+            if not isinstance(data__spec, (str)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".spec must be string", value=data__spec, name="" + (name_prefix or "data") + ".spec", definition={'description': 'Path of the OpenAPI spec of the version.', 'type': 'string', 'x-message': "The 'spec' in '{parent}' is missing or not a string."}, rule='type'))
+        if "portals" in data_keys:
+            data_keys.remove("portals")
+            data__portals = data["portals"]
+            if not isinstance(data__portals, (list, tuple)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".portals must be array", value=data__portals, name="" + (name_prefix or "data") + ".portals", definition={'type': 'array', 'x-message': "The 'portals' in '{parent}' must be a list.", 'items': {'description': 'Publication of a version to one of the portals of the API product.', 'allOf': [{'$ref': '#/definitions/portal'}], 'properties': {'publish_status': {'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, 'deprecated': {'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, 'application_registration_enabled': {'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, 'auto_approve_registration': {'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, 'auth_strategies': {'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}}}}, rule='type'))
+            data__portals_is_list = isinstance(data__portals, (list, tuple))
+            if data__portals_is_list:
+                data__portals_len = len(data__portals)
+                for data__portals_x, data__portals_item in enumerate(data__portals):
+                    try:
+                        validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_version_portal(data__portals_item, custom_formats, (name_prefix or "data") + ".portals[{data__portals_x}]".format(**locals()))
+                    except JsonSchemaValuesException as e:
+                        errors.extend(e.errors)
+        if "gateway_service" in data_keys:
+            data_keys.remove("gateway_service")
+            data__gatewayservice = data["gateway_service"]
+            try:
+                validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_gateway_service(data__gatewayservice, custom_formats, (name_prefix or "data") + ".gateway_service")
+            except JsonSchemaValuesException as e:
+                errors.extend(e.errors)
+    if errors: raise JsonSchemaValuesException(errors)
+    return data
+
+def validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_gateway_service(data, custom_formats={}, name_prefix=None):
+    errors = []
+    if not isinstance(data, (dict)):
+        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'description': 'The gateway service linked to a version.', 'type': 'object', 'x-message': "The 'gateway_service' in '{parent}' must be a dictionary.", 'properties': {'id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, 'control_plane_id': {'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}}, 'allOf': [{'if': {'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, 'then': {'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, {'if': {'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, 'then': {'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}]}, rule='type'))
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['control_plane_id']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'properties': {'control_plane_id': {'not': {'type': 'null'}}}, 'required': ['control_plane_id']}, rule='required')
+            data_keys = set(data.keys())
+            if "control_plane_id" in data_keys:
+                data_keys.remove("control_plane_id")
+                data__controlplaneid = data["control_plane_id"]
+                try:
+                    if not isinstance(data__controlplaneid, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must be null", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'type': 'null'}, rule='type')
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+                else:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must NOT match a disallowed definition", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'not': {'type': 'null'}}, rule='not')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        pass
+    else:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['id']) - data.keys()
+            if data__missing_keys:
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['id'], 'properties': {'id': {'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}, rule='required'))
+            data_keys = set(data.keys())
+            if "id" in data_keys:
+                data_keys.remove("id")
+                data__id = data["id"]
+                try:
+                    if not isinstance(data__id, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".id must be null", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'type': 'null'}, rule='type')
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+                else:
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".id must NOT match a disallowed definition", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'not': {'type': 'null'}, 'x-message': "The 'id' in '{parent}' is required when 'control_plane_id' is defined and not None."}, rule='not'))
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['id']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'properties': {'id': {'not': {'type': 'null'}}}, 'required': ['id']}, rule='required')
+            data_keys = set(data.keys())
+            if "id" in data_keys:
+                data_keys.remove("id")
+                data__id = data["id"]
+                try:
+                    if not isinstance(data__id, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".id must be null", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'type': 'null'}, rule='type')
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+                else:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".id must NOT match a disallowed definition", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'not': {'type': 'null'}}, rule='not')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        pass
+    else:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['control_plane_id']) - data.keys()
+            if data__missing_keys:
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['control_plane_id'], 'properties': {'control_plane_id': {'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}, rule='required'))
+            data_keys = set(data.keys())
+            if "control_plane_id" in data_keys:
+                data_keys.remove("control_plane_id")
+                data__controlplaneid = data["control_plane_id"]
+                try:
+                    if not isinstance(data__controlplaneid, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must be null", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'type': 'null'}, rule='type')
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+                else:
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must NOT match a disallowed definition", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'not': {'type': 'null'}, 'x-message': "The 'control_plane_id' in '{parent}' is required when 'id' is defined and not None."}, rule='not'))
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "id" in data_keys:
+            data_keys.remove("id")
+            data__id = data["id"]
+            if not isinstance(data__id, (str, NoneType)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".id must be string or null", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, rule='type'))
+            if isinstance(data__id, str):
+                if not REGEX_PATTERNS['^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$'].search(data__id):
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".id must match pattern ^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$", value=data__id, name="" + (name_prefix or "data") + ".id", definition={'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'id' in '{parent}' must be a string.", 'pattern': "The 'id' in '{parent}' is not a valid UUID."}}, rule='pattern'))
+        if "control_plane_id" in data_keys:
+            data_keys.remove("control_plane_id")
+            data__controlplaneid = data["control_plane_id"]
+            if not isinstance(data__controlplaneid, (str, NoneType)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must be string or null", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}, rule='type'))
+            if isinstance(data__controlplaneid, str):
+                if not REGEX_PATTERNS['^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$'].search(data__controlplaneid):
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".control_plane_id must match pattern ^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$", value=data__controlplaneid, name="" + (name_prefix or "data") + ".control_plane_id", definition={'type': ['string', 'null'], 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'type': "The 'control_plane_id' in '{parent}' must be a string.", 'pattern': "The 'control_plane_id' in '{parent}' is not a valid UUID."}}, rule='pattern'))
+    if errors: raise JsonSchemaValuesException(errors)
+    return data
+
+def validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_version_portal(data, custom_formats={}, name_prefix=None):
+    errors = []
+    try:
+        validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_portal(data, custom_formats, (name_prefix or "data") + "")
+    except JsonSchemaValuesException as e:
+        errors.extend(e.errors)
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "publish_status" in data_keys:
+            data_keys.remove("publish_status")
+            data__publishstatus = data["publish_status"]
+            if not (isinstance(data__publishstatus, str) and data__publishstatus == 'published' or isinstance(data__publishstatus, str) and data__publishstatus == 'unpublished'):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".publish_status must be one of ['published', 'unpublished']", value=data__publishstatus, name="" + (name_prefix or "data") + ".publish_status", definition={'enum': ['published', 'unpublished'], 'x-message': "The 'publish_status' in '{parent}' must be either 'published' or 'unpublished'."}, rule='enum'))
+        if "deprecated" in data_keys:
+            data_keys.remove("deprecated")
+            data__deprecated = data["deprecated"]
+            if not isinstance(data__deprecated, (bool)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".deprecated must be boolean", value=data__deprecated, name="" + (name_prefix or "data") + ".deprecated", definition={'type': 'boolean', 'x-message': "The 'deprecated' field in '{parent}' must be a boolean."}, rule='type'))
+        if "application_registration_enabled" in data_keys:
+            data_keys.remove("application_registration_enabled")
+            data__applicationregistrationenabled = data["application_registration_enabled"]
+            if not isinstance(data__applicationregistrationenabled, (bool)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".application_registration_enabled must be boolean", value=data__applicationregistrationenabled, name="" + (name_prefix or "data") + ".application_registration_enabled", definition={'type': 'boolean', 'x-message': "The 'application_registration_enabled' field in '{parent}' must be a boolean."}, rule='type'))
+        if "auto_approve_registration" in data_keys:
+            data_keys.remove("auto_approve_registration")
+            data__autoapproveregistration = data["auto_approve_registration"]
+            if not isinstance(data__autoapproveregistration, (bool)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auto_approve_registration must be boolean", value=data__autoapproveregistration, name="" + (name_prefix or "data") + ".auto_approve_registration", definition={'type': 'boolean', 'x-message': "The 'auto_approve_registration' field in '{parent}' must be a boolean."}, rule='type'))
+        if "auth_strategies" in data_keys:
+            data_keys.remove("auth_strategies")
+            data__authstrategies = data["auth_strategies"]
+            if not isinstance(data__authstrategies, (list, tuple)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auth_strategies must be array", value=data__authstrategies, name="" + (name_prefix or "data") + ".auth_strategies", definition={'type': 'array', 'x-message': "The 'auth_strategies' in '{parent}' must be a list.", 'items': {'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}}, rule='type'))
+            data__authstrategies_is_list = isinstance(data__authstrategies, (list, tuple))
+            if data__authstrategies_is_list:
+                data__authstrategies_len = len(data__authstrategies)
+                for data__authstrategies_x, data__authstrategies_item in enumerate(data__authstrategies):
+                    if not isinstance(data__authstrategies_item, (dict)):
+                        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}]".format(**locals()) + " must be object", value=data__authstrategies_item, name="" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}]".format(**locals()) + "", definition={'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}, rule='type'))
+                    data__authstrategies_item_is_dict = isinstance(data__authstrategies_item, dict)
+                    if data__authstrategies_item_is_dict:
+                        data__authstrategies_item__missing_keys = set(['id']) - data__authstrategies_item.keys()
+                        if data__authstrategies_item__missing_keys:
+                            errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}]".format(**locals()) + " must contain " + (str(sorted(data__authstrategies_item__missing_keys)) + " properties"), value=data__authstrategies_item, name="" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}]".format(**locals()) + "", definition={'type': 'object', 'x-message': "Each strategy in '{parent}' must be a dictionary with an 'id' field. Error at index {index}.", 'required': ['id'], 'properties': {'id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}}}, rule='required'))
+                        data__authstrategies_item_keys = set(data__authstrategies_item.keys())
+                        if "id" in data__authstrategies_item_keys:
+                            data__authstrategies_item_keys.remove("id")
+                            data__authstrategies_item__id = data__authstrategies_item["id"]
+                            if not isinstance(data__authstrategies_item__id, (str)):
+                                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}].id".format(**locals()) + " must be string", value=data__authstrategies_item__id, name="" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}].id".format(**locals()) + "", definition={'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}, rule='type'))
+                            if isinstance(data__authstrategies_item__id, str):
+                                if not REGEX_PATTERNS['^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$'].search(data__authstrategies_item__id):
+                                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}].id".format(**locals()) + " must match pattern ^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$", value=data__authstrategies_item__id, name="" + (name_prefix or "data") + ".auth_strategies[{data__authstrategies_x}].id".format(**locals()) + "", definition={'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': {'required': "The 'id' in '{parent}' is missing.", 'default': "The 'id' in '{parent}' is not a valid UUID."}}, rule='pattern'))
+    if errors: raise JsonSchemaValuesException(errors)
+    return data
+
+def validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json__definitions_portal(data, custom_formats={}, name_prefix=None):
+    errors = []
+    if not isinstance(data, (dict)):
+        errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'description': 'A portal, referenced by ID or name.', 'type': 'object', 'x-message': "Each portal entry in '{path}' must be a dictionary.", 'properties': {'portal_id': {'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, 'portal_name': {'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, 'if': {'required': ['portal_id']}, 'else': {'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}}, rule='type'))
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "portal_id" in data_keys:
+            data_keys.remove("portal_id")
+            data__portalid = data["portal_id"]
+            if not isinstance(data__portalid, (str)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".portal_id must be string", value=data__portalid, name="" + (name_prefix or "data") + ".portal_id", definition={'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, rule='type'))
+            if isinstance(data__portalid, str):
+                if not REGEX_PATTERNS['^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$'].search(data__portalid):
+                    errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".portal_id must match pattern ^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$", value=data__portalid, name="" + (name_prefix or "data") + ".portal_id", definition={'type': 'string', 'pattern': '^(urn:uuid:)?\\{?[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}\\}?$', 'x-message': "The 'portal_id' in '{parent}' is not a valid UUID."}, rule='pattern'))
+        if "portal_name" in data_keys:
+            data_keys.remove("portal_name")
+            data__portalname = data["portal_name"]
+            if not isinstance(data__portalname, (str)):
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + ".portal_name must be string", value=data__portalname, name="" + (name_prefix or "data") + ".portal_name", definition={'type': 'string', 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}, rule='type'))
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['portal_id']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['portal_id']}, rule='required')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['portal_name']) - data.keys()
+            if data__missing_keys:
+                errors.append(JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['portal_name'], 'x-message': "The 'portal_name' in '{parent}' is missing or not a string."}, rule='required'))
+    if errors: raise JsonSchemaValuesException(errors)
+    return data
+
+validate = validate_https___raw_githubusercontent_com_pantsel_konnect_portal_ops_cli_main_src_kptl_schemas_state_schema_json
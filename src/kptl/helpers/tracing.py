@@ -0,0 +1,225 @@
+"""
+Trace of a CLI run, written with `--trace-file` in the Chrome trace event format.
+
+The trace has a span for the command, one for each of its phases, each `KonnectApi`
+operation and each HTTP request. The current span is held in a context variable, and
+work submitted to thread pools through `in_context` runs in a copy of the context of the
+caller, so spans in workers are children of the span that submitted them. Each span
+records the ID of its parent, so the file shows the critical path of a run when opened
+in Perfetto (https://ui.perfetto.dev) or `chrome://tracing`, without a collector.
+
+Tracing is disabled unless `Tracer().enable()` is called, in which case spans cost a
+single attribute check.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+COMMAND = "command"
+PHASE = "phase"
+OPERATION = "konnect"
+HTTP = "http"
+
+T = TypeVar("T")
+
+
+class Span:
+    """
+    An open span, whose attributes can be set until it ends.
+    """
+
+    __slots__ = ('name', 'category', 'span_id', 'parent_id', 'start', 'attributes')
+
+    def __init__(self, name: str, category: str, span_id: int, parent_id: Optional[int],
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.perf_counter_ns()
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Set attributes of the span.
+        """
+        self.attributes.update(attributes)
+
+
+class _NoSpan:
+    """
+    The span of a disabled tracer, ignoring its attributes.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Ignore the attributes.
+        """
+
+
+NO_SPAN = _NoSpan()
+
+# The innermost open span of the current context
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("kptl_current_span", default=None)
+
+
+class Tracer:
+    """
+    Singleton recording the spans of a run.
+    """
+    _instance: Optional["Tracer"] = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+            cls._instance.reset()
+        return cls._instance
+
+    def __init__(self):
+        # The state is set by `reset`, when the singleton is created
+        self.enabled: bool
+        self.events: List[Dict[str, Any]]
+        self.threads: Dict[int, str]
+        self._ids: Iterator[int]
+        self._lock: threading.Lock
+        self._origin: int
+
+    def reset(self) -> None:
+        """
+        Drop the recorded spans and disable tracing.
+        """
+        self.enabled = False
+        self.events = []
+        self.threads = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        """
+        Start recording spans.
+        """
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name: str, category: str, **attributes: Any) -> Iterator[Any]:
+        """
+        Record a span around a block, as a child of the innermost span of the context.
+
+        Yields:
+            The span, to set attributes known only at its end, e.g. a response status.
+        """
+        if not self.enabled:
+            yield NO_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(name, category, next(self._ids), parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except SystemExit as e:
+            if e.code:
+                span.set(exit_code=e.code)
+            raise
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._record(span, time.perf_counter_ns())
+
+    def _record(self, span: Span, end: int) -> None:
+        thread = threading.current_thread()
+        args = {"span_id": span.span_id}
+        if span.parent_id is not None:
+            args["parent_id"] = span.parent_id
+        args.update(span.attributes)
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start - self._origin) / 1000,
+            "dur": (end - span.start) / 1000,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self.threads.setdefault(thread.ident, thread.name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the trace in the Chrome trace event format.
+        """
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+            metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                         "args": {"name": name}} for tid, name in self.threads.items()]
+        metadata.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "kptl"}})
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """
+        Write the trace to a file.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, default=str)
+
+
+def span(name: str, category: str, **attributes: Any):
+    """
+    Record a span around a block, see `Tracer.span`.
+    """
+    return Tracer().span(name, category, **attributes)
+
+
+def in_context(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap a function to run in a copy of the current context, so that the spans it records
+    in a thread pool are children of the current span, e.g.
+    `executor.map(tracing.in_context(check), items)`.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        # A context can only be entered by one thread at a time
+        return context.copy().run(function, *args, **kwargs)
+    return wrapper
+
+
+def traced(category: str) -> Callable[[type], type]:
+    """
+    Class decorator recording a span for every call to a public method of the class,
+    named after the class and the method.
+    """
+    def decorate(cls: type) -> type:
+        for name, method in list(vars(cls).items()):
+            if name.startswith('_') or not callable(method):
+                continue
+            setattr(cls, name, _traced_method(method, f"{cls.__name__}.{name}", category))
+        return cls
+    return decorate
+
+
+def _traced_method(method: Callable[..., T], name: str, category: str) -> Callable[..., T]:
+    tracer = Tracer()
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        if not tracer.enabled:
+            return method(*args, **kwargs)
+        with tracer.span(name, category):
+            return method(*args, **kwargs)
+    return wrapper
@@ -3,15 +3,37 @@ Utility functions.
 """
 
 import base64
+import codecs
+import glob
+import json
+import mmap
+import os
 import re
 import sys
-import yaml
-import os
-import json
+from functools import lru_cache
+from typing import Any, List, Optional, Union
 
+import yaml
 
 from kptl.config.logger import Logger
-from kptl.helpers.validator import ProductStateValidator
+from kptl.helpers.validator import InvalidStateError, ProductStateValidator
+
+# The libyaml based loader is several times faster than the pure-Python one and produces the same
+# documents. It is only available when PyYAML was built against libyaml.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+JSON_DECODER = json.JSONDecoder()
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+STATE_FILE_EXTENSIONS = ('.yaml', '.yml')
+STATE_FILE_MARKER = re.compile(rb'^_version\s*:', re.MULTILINE)
+STATE_FILE_SNIFF_SIZE = 64 * 1024
+
+# Bytes looked at to tell JSON documents from YAML ones
+OAS_SNIFF_SIZE = 1024
+# Size of the first prefix of a memory-mapped JSON document scanned for `info.version`, doubled
+# until the version is found
+OAS_VERSION_SCAN_SIZE = 64 * 1024
 
 
 def read_file_content(file_path: str) -> str:
@@ -53,41 +75,258 @@ def is_valid_uuid(uuid: str) -> bool:
     return re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', uuid) is not None
 
 
+def load_yaml(file_content: Union[str, bytes, mmap.mmap]) -> Any:
+    """
+    Parse YAML content, raising `yaml.YAMLError` if it is invalid.
+
+    Memory-mapped content is parsed from the map as a stream, without being copied.
+    """
+    if isinstance(file_content, mmap.mmap):
+        file_content.seek(0)
+    return yaml.load(file_content, Loader=YAML_LOADER)
+
+
 def parse_yaml(file_content: str) -> dict:
     """
     Parse YAML content.
     """
     try:
-        return yaml.safe_load(file_content)
+        return load_yaml(file_content)
+    except yaml.YAMLError as e:
+        Logger().error("Error parsing YAML content: %s", e)
+        sys.exit(1)
+
+
+@lru_cache(maxsize=None)
+def orjson_module() -> Optional[Any]:
+    """
+    Get the orjson module, or None if it is not installed. It is imported on first use
+    rather than with this module, as importing it slows down the start of every command.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return orjson
+
+
+def parse_json(file_content: Union[bytes, mmap.mmap]) -> Any:
+    """
+    Parse JSON content, with orjson when it is installed and the standard library otherwise.
+
+    orjson reads memory-mapped content in place, the standard library needs a copy of it.
+    """
+    orjson = orjson_module()
+    if orjson is not None:
+        if isinstance(file_content, mmap.mmap):
+            with memoryview(file_content) as view:
+                return orjson.loads(view)
+        return orjson.loads(file_content)
+    return json.loads(file_content[:] if isinstance(file_content, mmap.mmap) else file_content)
+
+
+def is_json_content(file_path: str, file_content: Union[bytes, mmap.mmap]) -> bool:
+    """Check whether a file is JSON, by its extension or its first non-whitespace character."""
+    if file_path.lower().endswith('.json'):
+        return True
+    return file_content[:OAS_SNIFF_SIZE].lstrip(b' \t\r\n\xef\xbb\xbf')[:1] in (b'{', b'[')
+
+
+def parse_oas(file_content: Union[bytes, mmap.mmap], file_path: str = "") -> Any:
+    """
+    Parse OAS content like `load_oas`, exiting if it is invalid.
+    """
+    try:
+        return load_oas(file_content, file_path)
     except yaml.YAMLError as e:
         Logger().error("Error parsing YAML content: %s", e)
         sys.exit(1)
 
 
+def load_oas(file_content: Union[bytes, mmap.mmap], file_path: str = "") -> Any:
+    """
+    Parse OAS content, using the JSON parser for JSON documents and the YAML parser otherwise,
+    raising `yaml.YAMLError` if it is invalid.
+    """
+    if is_json_content(file_path, file_content):
+        try:
+            return parse_json(file_content)
+        except ValueError:
+            # Not strict JSON after all, e.g. a YAML flow mapping. The YAML parser handles it.
+            pass
+    return load_yaml(file_content)
+
+
+def extract_oas_version(file_content: Union[str, bytes, mmap.mmap]) -> Optional[Any]:
+    """
+    Extract `info.version` from OAS content without parsing the whole document.
+
+    JSON documents are scanned key by key at the top level and YAML documents are read
+    from the parser event stream, both stopping as soon as `info.version` is found.
+    Memory-mapped content is only read up to there, see `_extract_mapped_oas_version`.
+
+    Returns:
+        Optional[Any]: The version, or None if it could not be extracted this way.
+    """
+    try:
+        if isinstance(file_content, mmap.mmap):
+            return _extract_mapped_oas_version(file_content)
+        text = file_content.decode('utf-8-sig') if isinstance(
+            file_content, bytes) else file_content
+        if text[JSON_WHITESPACE.match(text).end():][:1] == '{':
+            return _extract_json_oas_version(text)
+        return _extract_yaml_oas_version(text)
+    except (ValueError, IndexError, yaml.YAMLError):
+        return None
+
+
+def _extract_mapped_oas_version(content: mmap.mmap) -> Optional[Any]:
+    """
+    Extract `info.version` from memory-mapped content, reading as little of it as possible.
+
+    YAML documents are parsed from the map as a stream. JSON documents are scanned from
+    growing prefixes, since the decoder needs a string: a prefix that ends before
+    `info.version` makes the scan raise, while one that holds it gives the same result as
+    the whole document.
+    """
+    if content[:OAS_SNIFF_SIZE].lstrip(b' \t\r\n\xef\xbb\xbf')[:1] != b'{':
+        content.seek(0)
+        return _extract_yaml_oas_version(content)
+
+    size = OAS_VERSION_SCAN_SIZE
+    while True:
+        final = size >= len(content)
+        # The incremental decoder leaves out a character cut by the end of the prefix
+        text = codecs.getincrementaldecoder('utf-8-sig')().decode(content[:size], final)
+        try:
+            return _extract_json_oas_version(text)
+        except (ValueError, IndexError):
+            if final:
+                raise
+        size *= 2
+
+
+def _extract_json_oas_version(text: str) -> Optional[Any]:
+    """
+    Scan the top-level keys of a JSON document up to `info`, only decoding the values on the way.
+    """
+    index = JSON_WHITESPACE.match(text).end() + 1  # Skip the opening brace
+    while True:
+        index = JSON_WHITESPACE.match(text, index).end()
+        key, index = JSON_DECODER.raw_decode(text, index)
+        index = JSON_WHITESPACE.match(text, index).end()
+        if text[index] != ':':
+            return None
+        index = JSON_WHITESPACE.match(text, index + 1).end()
+        value, index = JSON_DECODER.raw_decode(text, index)
+
+        if key == 'info':
+            return value.get('version') if isinstance(value, dict) else None
+
+        index = JSON_WHITESPACE.match(text, index).end()
+        if text[index] != ',':
+            return None
+        index += 1
+
+
+def _extract_yaml_oas_version(text: Union[str, mmap.mmap]) -> Optional[Any]:
+    """
+    Follow the YAML parser events down to the `info.version` scalar.
+    """
+    # One entry per open collection: [is_mapping, expecting_key, current_key]
+    stack = []
+    for event in yaml.parse(text, Loader=YAML_LOADER):
+        if isinstance(event, yaml.CollectionEndEvent):
+            stack.pop()
+            if not stack:
+                return None
+        elif isinstance(event, yaml.NodeEvent):
+            parent = stack[-1] if stack else None
+            is_key = parent is not None and parent[0] and parent[1]
+
+            if isinstance(event, yaml.ScalarEvent) and not is_key and len(stack) == 2 \
+                    and stack[0][0] and stack[0][2] == 'info' and stack[1][0] and stack[1][2] == 'version':
+                if event.tag is not None:
+                    return None
+                # Quoted scalars are strings, plain ones are resolved like the full parse would.
+                return event.value if event.style else yaml.load(event.value, Loader=YAML_LOADER)
+
+            if is_key:
+                parent[2] = event.value if isinstance(
+                    event, yaml.ScalarEvent) else None
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                stack.append(
+                    [isinstance(event, yaml.MappingStartEvent), True, None])
+                continue
+        else:
+            continue
+
+        # A node is complete: in a mapping, keys and values alternate.
+        if stack and stack[-1][0]:
+            stack[-1][1] = not stack[-1][1]
+
+    return None
+
+
 def load_state(state_file: str) -> dict:
+    """
+    Load and parse the state file, exiting with the validation errors if it is invalid.
+    """
+    state_parsed = parse_yaml(read_file_content(state_file))
+
+    validate_state(state_parsed)
+
+    return state_parsed
+
+
+def read_state(state_file: str) -> dict:
     """
     Load and parse the state file.
+
+    Raises:
+        InvalidStateError: If the state is invalid.
     """
-    state_content = read_file_content(state_file)
-    state_parsed = parse_yaml(state_content)
+    state_parsed = parse_yaml(read_file_content(state_file))
 
-    v = ProductStateValidator(state_parsed)
+    check_state(state_parsed)
 
-    is_valid, errors = v.validate()
+    return state_parsed
+
+
+def check_state(state: dict) -> None:
+    """
+    Validate a parsed state.
+
+    Raises:
+        InvalidStateError: If the state is invalid.
+    """
+    is_valid, errors = ProductStateValidator(state).validate()
     if not is_valid:
-        Logger().error("Invalid state file:")
-        print(" - " + "\n - ".join(errors))
+        raise InvalidStateError(errors)
+
+
+def validate_state(state: dict) -> None:
+    """
+    Validate a parsed state and exit with the validation errors if it is invalid.
+    """
+    try:
+        check_state(state)
+    except InvalidStateError as e:
+        log_state_errors(e)
         sys.exit(1)
-    
-    return state_parsed
 
 
-def load_oas_data(spec_file: str) -> tuple:
-    """Load and parse OAS data from a specification file."""
-    oas_file = read_file_content(spec_file)
-    oas_data = parse_yaml(oas_file)
-    oas_data_base64 = encode_content(oas_file)
-    return oas_data, oas_data_base64
+def log_state_errors(error: InvalidStateError, state_file: Optional[str] = None) -> None:
+    """
+    Log the validation errors of a state.
+    """
+    if state_file:
+        Logger().error("Invalid state file '%s':", state_file)
+    else:
+        Logger().error("Invalid state file:")
+    for validation_error in error.errors:
+        Logger().error(" - %s", validation_error)
 
 
 def read_config_file(config_file: str) -> dict:
@@ -107,3 +346,36 @@ def read_config_file(config_file: str) -> dict:
 def is_file_path(path: str) -> bool:
     """Check if the given path is a file path."""
     return os.path.isfile(path)
+
+
+def is_state_file(path: str) -> bool:
+    """Check whether a YAML file looks like a state file, i.e. has a top-level `_version` key."""
+    try:
+        with open(path, 'rb') as f:
+            return STATE_FILE_MARKER.search(f.read(STATE_FILE_SNIFF_SIZE)) is not None
+    except OSError:
+        return False
+
+
+def find_state_files(paths: List[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into a sorted list of state files.
+
+    Files found in directories or through glob patterns are only kept if they look like
+    state files, so that specs stored next to the state files are skipped. Files given
+    explicitly are always kept.
+    """
+    state_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = (os.path.join(root, file) for root, _, files in os.walk(path)
+                          for file in files if file.endswith(STATE_FILE_EXTENSIONS))
+        elif any(char in path for char in "*?["):
+            candidates = (file for file in glob.glob(path, recursive=True)
+                          if os.path.isfile(file) and file.endswith(STATE_FILE_EXTENSIONS))
+        else:
+            state_files.append(path)
+            continue
+        state_files.extend(file for file in candidates if is_state_file(file))
+
+    return sorted(set(state_files))
@@ -1,188 +1,211 @@
-import re
-from uuid import UUID
+import hashlib
 import json
+import os
+import pkgutil
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import fastjsonschema
+
+from kptl.helpers import state_schema
+
+SEMVER_PATTERN = re.compile(
+    r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$')
+# Relative to the kptl package, and read as package data so that it can be loaded from a zipapp
+SCHEMA_RESOURCE = "schemas/state.schema.json"
+GENERATED_VALIDATOR_HEADER = '''"""
+Validator of `schemas/state.schema.json`, generated by fastjsonschema with `make schema-validator`.
+
+Do not edit, change the schema and generate the validator again.
+"""
+# pylint: skip-file
+SCHEMA_DIGEST = "{digest}"
+'''
+
+
+class ValidationError(str):
+    """
+    A validation error message along with the path of the invalid field in the state,
+    e.g. "versions[0].portals[1]".
+
+    Errors are strings, so they can be printed and compared like plain messages.
+    """
+
+    def __new__(cls, path: str, message: str):
+        error = super().__new__(cls, message)
+        error.path = path
+        return error
+
+    def to_dict(self) -> dict:
+        """Get the error as a dictionary."""
+        return {"path": self.path, "message": str(self)}
+
+
+class InvalidStateError(ValueError):
+    """
+    Raised when a state does not validate, with the validation errors.
+    """
+
+    def __init__(self, errors: List[ValidationError]):
+        super().__init__(f"Invalid state file: {len(errors)} error(s)")
+        self.errors = errors
+
+
+def load_schema() -> Dict[str, Any]:
+    """Load the JSON Schema of the state file format."""
+    return json.loads(pkgutil.get_data("kptl", SCHEMA_RESOURCE))
+
+
+def schema_digest() -> str:
+    """Get the SHA-256 digest of the JSON Schema of the state file format."""
+    return hashlib.sha256(pkgutil.get_data("kptl", SCHEMA_RESOURCE)).hexdigest()
+
+
+def generate_validator_code() -> str:
+    """Generate the code of the `state_schema` module from the state schema."""
+    code = fastjsonschema.compile_to_code(load_schema(), fast_fail=False)
+    # The function of the root schema comes first, named after the schema ID
+    root_function = re.search(r'^def (\w+)\(', code, re.MULTILINE).group(1)
+    return (GENERATED_VALIDATOR_HEADER.format(digest=schema_digest()) + code
+            + f"\n\nvalidate = {root_function}\n")
+
+
+def write_generated_validator() -> None:
+    """Write the `state_schema` module, after a change of the state schema."""
+    with open(os.path.join(os.path.dirname(__file__), "state_schema.py"), "w", encoding="utf-8") as f:
+        f.write(generate_validator_code())
+
+
+@lru_cache(maxsize=None)
+def compiled_schema() -> Callable[[Any], Any]:
+    """
+    Get the validator of the state schema.
+
+    The validator is generated ahead of time into the `state_schema` module, so that no
+    process pays for compiling the schema. If the schema has changed since, it is compiled
+    on first use instead.
+    """
+    if state_schema.SCHEMA_DIGEST == schema_digest():
+        return state_schema.validate
+    return fastjsonschema.compile(load_schema(), fast_fail=False)
+
+
+def format_path(parts: List[Any]) -> str:
+    """Format the parts of a path in the state, e.g. ['versions', '0', 'name'] as "versions[0].name"."""
+    path = ""
+    for part in parts:
+        part = str(part)
+        if part.isdigit():
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else part
+    return path
+
+
+def schema_errors(exception: fastjsonschema.JsonSchemaException) -> List[ValidationError]:
+    """
+    Convert the errors raised by the compiled schema to validation errors, using the
+    'x-message' templates of the schema when the failing node has one.
+    """
+    errors = []
+    for error in getattr(exception, 'errors', None) or [exception]:
+        parts = list(error.path[1:])
+        definition = error.definition if isinstance(error.definition, dict) else {}
+        if error.rule == 'required':
+            # One error per missing field, with the template of the field if it has one
+            value = error.value if isinstance(error.value, dict) else {}
+            properties = definition.get('properties', {})
+            for field in error.rule_definition:
+                if field not in value:
+                    template = properties.get(field, {}).get('x-message') or definition.get('x-message')
+                    errors.append(_schema_error(parts + [field], template, error))
+        else:
+            errors.append(_schema_error(parts, definition.get('x-message'), error))
+    return errors
+
+
+def _schema_error(parts: List[Any], template: Any, error: fastjsonschema.JsonSchemaValueException) -> ValidationError:
+    path = format_path(parts)
+    if isinstance(template, dict):
+        template = template.get(error.rule, template.get('default'))
+    if not template:
+        return ValidationError(path, f"{path or 'state'}: {error.message}")
+    return ValidationError(path, template.format(
+        path=path, parent=format_path(parts[:-1]), index=parts[-1] if parts else ""))
 
 
 class ProductStateValidator:
-    """Validator for product state schema."""
+    """
+    Validator for product state schema.
+
+    The structure of the state is checked against `schemas/state.schema.json` by a
+    compiled validator, in a single pass. The rules the schema cannot express, i.e. that
+    version portals reference portals of the root 'portals' list, are checked here.
+    """
 
     def __init__(self, schema):
         """Initialize with schema."""
         self.schema = schema
+        self.errors: List[ValidationError] = []
+        self.root_portal_ids: Set[str] = set()
+        self.root_portal_names: Set[str] = set()
+        self.invalid_paths: Set[str] = set()
 
     @staticmethod
     def is_valid_semver(version):
         """Check if the version is a valid semantic version."""
-        semver_regex = r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$'
-        return re.match(semver_regex, version) is not None
+        return isinstance(version, str) and SEMVER_PATTERN.match(version) is not None
 
-    def validate(self):
+    def validate(self) -> Tuple[bool, Optional[List[ValidationError]]]:
         """Validate the schema."""
-        errors = []
-
-        def validate_portal(portal, path):
-            if not isinstance(portal, dict):
-                errors.append(f"Each portal entry in '{
-                              path}' must be a dictionary.")
-                return False
-            if 'portal_id' in portal:
-                try:
-                    UUID(portal['portal_id'])
-                except ValueError:
-                    errors.append(f"The 'portal_id' in '{
-                                  path}' is not a valid UUID.")
-                    return False
-            elif 'portal_name' not in portal or not isinstance(portal['portal_name'], str):
-                errors.append(f"The 'portal_name' in '{
-                              path}' is missing or not a string.")
-                return False
-            return True
-
-        def validate_version_portal(portal, path, root_portals):
-            if not validate_portal(portal, path):
-                return
-            if 'portal_id' in portal:
-                if not any(root_portal.get('portal_id') == portal['portal_id'] for root_portal in root_portals):
-                    errors.append(f"The 'portal_id' in '{
-                                  path}' does not match any portal in the root 'portals' list.")
-            elif 'portal_name' in portal:
-                if not any(root_portal.get('portal_name') == portal['portal_name'] for root_portal in root_portals):
-                    errors.append(f"The 'portal_name' in '{
-                                  path}' does not match any portal in the root 'portals' list.")
-            if 'deprecated' in portal and not isinstance(portal['deprecated'], bool):
-                errors.append(f"The 'deprecated' field in '{
-                              path}' must be a boolean.")
-            if 'publish_status' in portal and portal['publish_status'] not in ['published', 'unpublished']:
-                errors.append(f"The 'publish_status' in '{
-                              path}' must be either 'published' or 'unpublished'.")
-            if 'application_registration_enabled' in portal and not isinstance(portal['application_registration_enabled'], bool):
-                errors.append(f"The 'application_registration_enabled' field in '{
-                              path}' must be a boolean.")
-            if 'auto_approve_registration' in portal and not isinstance(portal['auto_approve_registration'], bool):
-                errors.append(f"The 'auto_approve_registration' field in '{
-                              path}' must be a boolean.")
-            if 'auth_strategies' in portal:
-                if not isinstance(portal['auth_strategies'], list):
-                    errors.append(f"The 'auth_strategies' in '{
-                                  path}' must be a list.")
-                else:
-                    for k, strategy in enumerate(portal['auth_strategies']):
-                        if not isinstance(strategy, dict) or 'id' not in strategy:
-                            errors.append(f"Each strategy in '{
-                                          path}.auth_strategies' must be a dictionary with an 'id' field. Error at index {k}.")
-                        else:
-                            try:
-                                UUID(strategy['id'])
-                            except ValueError:
-                                errors.append(f"The 'id' in '{path}.auth_strategies[{
-                                              k}]' is not a valid UUID.")
-
-        def validate_gateway_service(gateway_service, path):
-            if not isinstance(gateway_service, dict):
-                errors.append(f"The 'gateway_service' in '{
-                              path}' must be a dictionary.")
-                return
-            id_present = 'id' in gateway_service and gateway_service['id'] is not None
-            control_plane_id_present = 'control_plane_id' in gateway_service and gateway_service[
-                'control_plane_id'] is not None
-            if id_present or control_plane_id_present:
-                if not id_present:
-                    errors.append(f"The 'id' in '{
-                                  path}.gateway_service' is required when 'control_plane_id' is defined and not None.")
-                elif not isinstance(gateway_service['id'], str):
-                    errors.append(f"The 'id' in '{
-                                  path}.gateway_service' must be a string.")
-                else:
-                    try:
-                        UUID(gateway_service['id'])
-                    except ValueError:
-                        errors.append(f"The 'id' in '{
-                                      path}.gateway_service' is not a valid UUID.")
-                if not control_plane_id_present:
-                    errors.append(f"The 'control_plane_id' in '{
-                                  path}.gateway_service' is required when 'id' is defined and not None.")
-                elif not isinstance(gateway_service['control_plane_id'], str):
-                    errors.append(f"The 'control_plane_id' in '{
-                                  path}.gateway_service' must be a string.")
-                else:
-                    try:
-                        UUID(gateway_service['control_plane_id'])
-                    except ValueError:
-                        errors.append(f"The 'control_plane_id' in '{
-                                      path}.gateway_service' is not a valid UUID.")
-
-        def validate_info(info):
-            if 'name' not in info or not isinstance(info['name'], str):
-                errors.append("Missing or invalid 'info.name'")
-            if 'description' in info and not isinstance(info['description'], str):
-                errors.append("Invalid 'info.description'")
-
-        def validate_documents(documents):
-            if 'sync' in documents and not isinstance(documents['sync'], bool):
-                errors.append("Invalid 'documents.sync'")
-            if documents.get('sync', False) and 'dir' not in documents:
-                errors.append(
-                    "Missing 'documents.dir' when 'documents.sync' is true")
-            if 'dir' in documents and not isinstance(documents['dir'], str):
-                errors.append("Invalid 'documents.dir'")
-
-        def validate_versions(versions, root_portals):
-            for i, version in enumerate(versions):
-                if not isinstance(version, dict):
-                    errors.append(
-                        f"Each version entry in 'versions' must be a dictionary. Error at index {i}.")
-                else:
-                    if 'name' in version and not isinstance(version['name'], str):
-                        errors.append(
-                            f"The 'name' in 'versions[{i}]' must be a string.")
-                    if 'spec' not in version or not isinstance(version['spec'], str):
-                        errors.append(f"The 'spec' in 'versions[{
-                                      i}]' is missing or not a string.")
-                    if 'portals' in version:
-                        if not isinstance(version['portals'], list):
-                            errors.append(
-                                f"The 'portals' in 'versions[{i}]' must be a list.")
-                        else:
-                            for j, portal in enumerate(version['portals']):
-                                validate_version_portal(
-                                    portal, f"versions[{i}].portals[{j}]", root_portals)
-                    if 'gateway_service' in version:
-                        validate_gateway_service(
-                            version['gateway_service'], f"versions[{i}]")
-
-        # Validate _version
-        if '_version' not in self.schema or not ProductStateValidator.is_valid_semver(self.schema['_version']):
-            errors.append("Invalid or missing '_version'")
-
-        # Validate info
-        if 'info' not in self.schema or not isinstance(self.schema['info'], dict):
-            errors.append("Missing or invalid 'info'")
-        else:
-            validate_info(self.schema['info'])
-
-        # Validate documents
-        if 'documents' in self.schema:
-            if not isinstance(self.schema['documents'], dict):
-                errors.append("Invalid 'documents'")
-            else:
-                validate_documents(self.schema['documents'])
-
-        # Validate portals
-        if 'portals' in self.schema:
-            if not isinstance(self.schema['portals'], list):
-                errors.append("The 'portals' field must be a list.")
-            else:
-                root_portals = self.schema['portals']
-                for i, portal in enumerate(root_portals):
-                    validate_portal(portal, f"portals[{i}]")
-
-        # Validate versions
-        if 'versions' in self.schema:
-            if not isinstance(self.schema['versions'], list):
-                errors.append("The 'versions' field must be a list.")
-            else:
-                validate_versions(self.schema['versions'], root_portals)
-
-        if errors:
-            return False, errors
+        self.errors = []
+        self.root_portal_ids = set()
+        self.root_portal_names = set()
+        self.invalid_paths = set()
+
+        try:
+            compiled_schema()(self.schema)
+        except (fastjsonschema.JsonSchemaValuesException, fastjsonschema.JsonSchemaValueException) as e:
+            self.errors.extend(schema_errors(e))
+
+        if isinstance(self.schema, dict):
+            self.invalid_paths = {e.path for e in self.errors}
+            self.validate_references()
+
+        if self.errors:
+            return False, self.errors
         return True, None
+
+    def error(self, path: str, message: str) -> None:
+        """Record a validation error."""
+        self.errors.append(ValidationError(path, message))
+
+    def validate_references(self):
+        """Check the version portals against the root portals."""
+        portals = self.schema.get('portals')
+        for portal in portals if isinstance(portals, list) else []:
+            if isinstance(portal, dict):
+                if isinstance(portal.get('portal_id'), str):
+                    self.root_portal_ids.add(portal['portal_id'])
+                if isinstance(portal.get('portal_name'), str):
+                    self.root_portal_names.add(portal['portal_name'])
+
+        versions = self.schema.get('versions')
+        for i, version in enumerate(versions if isinstance(versions, list) else []):
+            portals = version.get('portals') if isinstance(version, dict) else None
+            for j, portal in enumerate(portals if isinstance(portals, list) else []):
+                if isinstance(portal, dict):
+                    self.validate_version_portal(portal, f"versions[{i}].portals[{j}]")
+
+    def validate_version_portal(self, portal, path):
+        """Check that a version portal matches a root portal, unless the schema rejected it."""
+        if not self.invalid_paths.isdisjoint((path, f"{path}.portal_id", f"{path}.portal_name")):
+            return
+        if 'portal_id' in portal:
+            if portal['portal_id'] not in self.root_portal_ids:
+                self.error(f"{path}.portal_id",
+                           f"The 'portal_id' in '{path}' does not match any portal in the root 'portals' list.")
+        elif portal['portal_name'] not in self.root_portal_names:
+            self.error(f"{path}.portal_name",
+                       f"The 'portal_name' in '{path}' does not match any portal in the root 'portals' list.")
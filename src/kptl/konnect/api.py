@@ -2,19 +2,27 @@
 This module provides the KonnectApi class for interacting with the Konnect API.
 """
 
+import hashlib
 import json
 import os
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 
 import requests
 
 from kptl.konnect.models.schema import ApiProductVersionPortal, ApiProductState, ApiProductVersion
 from kptl.config.logger import Logger
 from kptl.konnect.services import ApiProductClient, PortalManagementClient
-from kptl.helpers import utils
-from kptl.helpers.api_product_documents import parse_directory, get_slug_tail
+from kptl.konnect.services.session import InstrumentedSession
+from kptl.helpers import metrics, tracing, utils
+from kptl.helpers.content_cache import CachedContent
+from kptl.helpers.request_body import Base64JsonBody
+from kptl.helpers.api_product_documents import iter_page_handles, get_slug_tail, load_page_content
+from kptl.helpers.docs_index import DocsIndex
 
+LIST_PAGE_SIZE = 100
 
+
+@tracing.traced(tracing.OPERATION)
 class KonnectApi:
     """
     A class to interact with the Konnect API.
@@ -24,10 +32,12 @@ class KonnectApi:
         self.base_url = base_url
         self.token = token
         self.logger = Logger()
+        # One session for both clients, so that they share connections
+        self.session = InstrumentedSession(f"{base_url}/v2")
         self.api_product_client = ApiProductClient(
-            f"{base_url}/v2", token, proxies)
+            f"{base_url}/v2", token, proxies, self.session)
         self.portal_client = PortalManagementClient(
-            f"{base_url}/v2", token, proxies)
+            f"{base_url}/v2", token, proxies, self.session)
 
     def find_api_product_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -163,6 +173,45 @@ class KonnectApi:
             api_product_id)
         return response['data']
 
+    def list_api_products(self) -> List[Dict[str, Any]]:
+        """
+        List all API products, following pagination.
+
+        Returns:
+            List[Dict[str, Any]]: The list of API products.
+        """
+        return self._list_all_pages(self.api_product_client.list_api_products)
+
+    def list_portals(self) -> List[Dict[str, Any]]:
+        """
+        List all portals, following pagination.
+
+        Returns:
+            List[Dict[str, Any]]: The list of portals.
+        """
+        return self._list_all_pages(self.portal_client.list_portals)
+
+    def _list_all_pages(self, list_function: Callable[[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Collect the items of all the pages of a list operation.
+
+        Args:
+            list_function (Callable): The client list function, called with the page query parameters.
+
+        Returns:
+            List[Dict[str, Any]]: The items of all pages.
+        """
+        items, page_number = [], 1
+        while True:
+            response = list_function(
+                {"page[size]": LIST_PAGE_SIZE, "page[number]": page_number})
+            items.extend(response['data'])
+
+            total = response.get('meta', {}).get('page', {}).get('total')
+            if total is None or not response['data'] or len(items) >= total:
+                return items
+            page_number += 1
+
     def find_portal(self, portal: str) -> Optional[Dict[str, Any]]:
         """
         Find a portal by its name or ID.
@@ -421,14 +470,17 @@ class KonnectApi:
             api_product_id, api_product_version_id)
         return response['data'][0] if response['data'] else None
 
-    def upsert_api_product_version_spec(self, api_product_id: str, api_product_version_id: str, oas_file_base64: str) -> Dict[str, Any]:
+    def upsert_api_product_version_spec(self, api_product_id: str, api_product_version_id: str, oas_file: CachedContent) -> Dict[str, Any]:
         """
         Create or update an API product version spec.
 
+        The spec is compared by digest and uploaded as a streaming body, so that large
+        specs are never held in memory in their base64 encoded form.
+
         Args:
             api_product_id (str): The ID of the API product.
             api_product_version_id (str): The ID of the API product version.
-            oas_file_base64 (str): The base64 encoded OpenAPI Specification file.
+            oas_file (CachedContent): The OpenAPI Specification file.
 
         Returns:
             Dict[str, Any]: The API product version spec details.
@@ -441,12 +493,14 @@ class KonnectApi:
             'data'][0] if existing_api_product_version_specs['data'] else None
 
         if existing_api_product_version_spec:
-            if utils.encode_content(existing_api_product_version_spec['content']) != oas_file_base64:
+            existing_digest = hashlib.sha256(
+                existing_api_product_version_spec['content'].encode('utf-8')).hexdigest()
+            if existing_digest != oas_file.digest:
                 api_product_version_spec = self.api_product_client.update_api_product_version_spec(
                     api_product_id,
                     api_product_version_id,
                     existing_api_product_version_spec['id'],
-                    {"content": oas_file_base64}
+                    Base64JsonBody({}, "content", oas_file)
                 )
                 action = "Updated"
             else:
@@ -456,10 +510,7 @@ class KonnectApi:
             api_product_version_spec = self.api_product_client.create_api_product_version_spec(
                 api_product_id,
                 api_product_version_id,
-                {
-                    "content": oas_file_base64,
-                    "name": "oas.yaml"
-                }
+                Base64JsonBody({"name": "oas.yaml"}, "content", oas_file)
             )
             action = "Created new"
 
@@ -700,18 +751,18 @@ class KonnectApi:
                 page = self.api_product_client.create_api_product_document(api_product_id, {
                     "slug": page['slug'],
                     "title": page['title'],
-                    "content": page['content'],
+                    "content": load_page_content(page),
                     "status":  page['status'],
                     "parent_document_id": parent_id
                 })
                 slug_to_id[page['slug']] = page['id']
-            elif utils.encode_content(existing_page['content']) != page['content'] or existing_page.get('parent_document_id') != parent_id or existing_page.get('status') != page['status']:
+            elif hashlib.sha256(existing_page['content'].encode('utf-8')).hexdigest() != page['digest'] or existing_page.get('parent_document_id') != parent_id or existing_page.get('status') != page['status']:
                 self.logger.info("Updating document: '%s' (%s)",
                                  page['title'], page['slug'])
                 self.api_product_client.update_api_product_document(api_product_id, existing_page['id'], {
                     "slug": page['slug'],
                     "title": page['title'],
-                    "content": page['content'],
+                    "content": load_page_content(page),
                     "status": page['status'],
                     "parent_document_id": parent_id
                 })
@@ -769,7 +820,10 @@ class KonnectApi:
             Dict[str, Any]: The result of the synchronization.
         """
         directory = os.path.join(os.getcwd(), directory)
-        local_pages = parse_directory(directory)
+        # Unchanged files are compared by their indexed digest, and files are only read
+        # again when they are uploaded.
+        with metrics.phase(metrics.PREPARE):
+            local_pages = list(iter_page_handles(directory, index=DocsIndex.for_directory(directory)))
 
         existing_documents = self.api_product_client.list_api_product_documents(
             api_product_id)
@@ -1,13 +1,40 @@
 """
 Module for Konnect API state Models.
+
+The models are slotted dataclasses, so instances carry no per-instance `__dict__`.
 """
 
-from typing import Any, Dict, List
-from dataclasses import dataclass, field
-from kptl.helpers import utils, api_product_documents
+from typing import Any, Dict, Iterable, List, Tuple, Union
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from kptl.helpers import api_product_documents, content_cache
+from kptl.helpers.content_handle import ContentHandle
+
+_EMPTY: Dict[str, Any] = {}
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
 
 
-@dataclass
+def to_dict(obj: Any) -> Any:
+    """
+    Convert a model, and the models and lists it holds, to dictionaries and lists.
+
+    Unlike `dataclasses.asdict`, the other values are not deep-copied but shared with the
+    model, which is enough for the immutable strings, numbers and booleans of the models.
+    Content handles are converted to their digest.
+    """
+    if isinstance(obj, list):
+        return [to_dict(item) for item in obj]
+    if isinstance(obj, ContentHandle):
+        return str(obj)
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        if not hasattr(type(obj), '__dataclass_fields__'):
+            return obj
+        names = _FIELD_NAMES[type(obj)] = tuple(f.name for f in fields(obj))
+    return {name: to_dict(getattr(obj, name)) for name in names}
+
+
+@dataclass(slots=True)
 class ApiProductVersionAuthStrategy:
     """
     Class representing an auth strategy.
@@ -15,7 +42,7 @@ class ApiProductVersionAuthStrategy:
     id: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProductVersionPortal:
     """
     Class representing a portal.
@@ -30,18 +57,18 @@ class ApiProductVersionPortal:
         default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProductDocument:
     """
     Class representing a document.
     """
     slug: str
     title: str
-    content: str
+    content: Union[str, ContentHandle]
     status: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Documents:
     """
     Class representing documents.
@@ -50,25 +77,23 @@ class Documents:
     directory: str = None
     data: List[ApiProductDocument] = field(default_factory=list)
 
-    def set_data(self, data: List[Dict[str, str]]):
+    def set_data(self, data: Iterable[Dict[str, Any]]):
         """
         Set the data.
         """
 
-        self.data = sorted(
-            [
-                ApiProductDocument(
-                    slug=api_product_documents.get_slug_tail(d.get('slug')),
-                    title=d.get('title'),
-                    content=d.get('content'),
-                    status=d.get('status')
-                ) for d in data
-            ],
-            key=lambda document: document.slug
-        )
+        self.data = [
+            ApiProductDocument(
+                slug=api_product_documents.get_slug_tail(d.get('slug')),
+                title=d.get('title'),
+                content=d.get('content'),
+                status=d.get('status')
+            ) for d in data
+        ]
+        self.data.sort(key=attrgetter('slug'))
 
 
-@dataclass
+@dataclass(slots=True)
 class GatewayService:
     """
     Class representing a gateway service.
@@ -77,7 +102,7 @@ class GatewayService:
     control_plane_id: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProduct:
     """
     Class representing product information.
@@ -86,19 +111,18 @@ class ApiProduct:
     description: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProductVersion:
     """
     Class representing a product version.
     """
-    spec: str
+    spec: Union[str, ContentHandle]
     gateway_service: GatewayService = field(default_factory=GatewayService)
-    portals: List[ApiProductVersionPortal] = field(
-        default_factory=list[ApiProductVersionPortal])
+    portals: List[ApiProductVersionPortal] = field(default_factory=list)
     name: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProductPortal:
     """
     Class representing a product portal.
@@ -107,7 +131,7 @@ class ApiProductPortal:
     portal_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiProductState:
     """
     Class representing the state of a product in Konnect.
@@ -120,70 +144,69 @@ class ApiProductState:
     def from_dict(self, data: Dict[str, Any]):
         """
         Initialize ProductState from a dictionary.
+
+        The state is built in a single pass over the dictionary, and the portals and
+        versions are sorted in place.
         """
-        if data.get('info'):
+        info = data.get('info')
+        if info:
             self.info = ApiProduct(
-                name=data.get('info', {}).get('name'),
-                description=data.get('info', {}).get('description', ""),
+                name=info.get('name'),
+                description=info.get('description', ""),
             )
+
+        documents = data.get('documents') or _EMPTY
         self.documents = Documents(
-            sync=data.get('documents', {}).get('sync', False),
-            directory=data.get('documents', {}).get('dir', None),
-            data=data.get('documents', {}).get('data', [])
-        )
-        self.portals = sorted(
-            [
-                ApiProductPortal(
-                    portal_id=p.get('portal_id'),
-                    portal_name=p.get('portal_name')
-                ) for p in data.get('portals')
-            ],
-            key=lambda portal: portal.portal_name
-        )
-        self.versions = sorted(
-            [
-                ApiProductVersion(
-                    name=self.get_version_name(v),
-                    spec=v.get('spec'),
-                    gateway_service=GatewayService(
-                        id=v.get('gateway_service', {}).get('id'),
-                        control_plane_id=v.get(
-                            'gateway_service', {}).get('control_plane_id')
-                    ),
-                    portals=sorted(
-                        [ApiProductVersionPortal(
-                            portal_id=p.get('portal_id'),
-                            portal_name=p.get('portal_name'),
-                            deprecated=p.get('deprecated', False),
-                            publish_status=p.get(
-                                'publish_status', "published"),
-                            application_registration_enabled=p.get(
-                                'application_registration_enabled', False),
-                            auto_approve_registration=p.get(
-                                'auto_approve_registration', False),
-                            auth_strategies=[
-                                ApiProductVersionAuthStrategy(
-                                    id=a.get('id')
-                                ) for a in p.get('auth_strategies', [])
-                            ]
-                        ) for p in v.get('portals', [])
-                        ],
-                        key=lambda portal: portal.portal_name
-                    )
-                ) for v in data.get('versions', [])
-            ],
-            key=lambda version: version.name
+            sync=documents.get('sync', False),
+            directory=documents.get('dir', None),
+            data=documents.get('data', [])
         )
 
+        self.portals = [
+            ApiProductPortal(portal_id=p.get('portal_id'), portal_name=p.get('portal_name'))
+            for p in data.get('portals') or []
+        ]
+        self.portals.sort(key=attrgetter('portal_name'))
+
+        self.versions = [self._version_from_dict(v) for v in data.get('versions') or []]
+        self.versions.sort(key=attrgetter('name'))
+
         return self
 
-    def make_api_docs(self, documents: Documents):
+    def _version_from_dict(self, version: Dict[str, Any]) -> ApiProductVersion:
+        """
+        Build a version from its dictionary.
+        """
+        gateway_service = version.get('gateway_service') or _EMPTY
+        portals = [
+            ApiProductVersionPortal(
+                portal_id=p.get('portal_id'),
+                portal_name=p.get('portal_name'),
+                deprecated=p.get('deprecated', False),
+                publish_status=p.get('publish_status', "published"),
+                application_registration_enabled=p.get('application_registration_enabled', False),
+                auto_approve_registration=p.get('auto_approve_registration', False),
+                auth_strategies=[ApiProductVersionAuthStrategy(id=a.get('id'))
+                                 for a in p.get('auth_strategies', [])]
+            ) for p in version.get('portals', [])
+        ]
+        portals.sort(key=attrgetter('portal_name'))
+
+        return ApiProductVersion(
+            name=self.get_version_name(version),
+            spec=version.get('spec'),
+            gateway_service=GatewayService(
+                id=gateway_service.get('id'),
+                control_plane_id=gateway_service.get('control_plane_id')
+            ),
+            portals=portals
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
         """
-        Make the API docs.
+        Convert the state to a dictionary, see `to_dict`.
         """
-        if documents.sync:
-            self.api_docs = api_product_documents.parse_directory(
-                documents.directory)
+        return to_dict(self)
 
     def get_version_name(self, version: ApiProductVersion):
         """
@@ -192,13 +215,11 @@ class ApiProductState:
         if version.get('name'):
             return version.get('name')
 
-        oas_data, _ = utils.load_oas_data(version.get('spec'))
-        return oas_data.get('info', {}).get('version')
+        return content_cache.get(version.get('spec')).version
 
-    def encode_versions_spec_content(self):
+    def resolve_versions_spec_content(self):
         """
-        Encode the version specs content to base64.
+        Replace the spec paths of the versions with handles on the content of the specs.
         """
         for version in self.versions:
-            _, oas_data_base64 = utils.load_oas_data(version.spec)
-            version.spec = oas_data_base64
+            version.spec = ContentHandle.from_file(version.spec)
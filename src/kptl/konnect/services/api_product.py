@@ -2,10 +2,13 @@
 Module for API product client.
 """
 
-from kptl.config.logger import Logger
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
+
 import requests
-import urllib.parse
+
+from kptl.config.logger import Logger
+from kptl.helpers.request_body import Base64JsonBody
+from kptl.konnect.services.session import InstrumentedSession
 
 
 class ApiProductClient:
@@ -13,8 +16,10 @@ class ApiProductClient:
     Client for interacting with API products.
     """
 
-    def __init__(self, base_url: str, token: str, proxies: Optional[Dict[str, str]] = None):
+    def __init__(self, base_url: str, token: str, proxies: Optional[Dict[str, str]] = None,
+                 session: Optional[requests.Session] = None):
         self.base_url = base_url
+        self.session = session or InstrumentedSession(base_url)
         self.headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
@@ -38,13 +43,19 @@ class ApiProductClient:
         """
         response.raise_for_status()
 
+    @staticmethod
+    def _body(data: Union[Dict[str, Any], Base64JsonBody]) -> Dict[str, Any]:
+        """
+        Get the request arguments sending a dict as JSON and a streaming body as is.
+        """
+        return {"json": data} if isinstance(data, dict) else {"data": data}
+
     def create_api_product(self, data: Dict[str, Any]) -> Any:
         """
         Create a new API product.
         """
         url = f"{self.base_url}/api-products"
-        self.logger.debug(f"POST {url}")
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -53,9 +64,7 @@ class ApiProductClient:
         List all API products.
         """
         url = f"{self.base_url}/api-products"
-        query = f"?{urllib.parse.urlencode(params)}" if params else ""
-        self.logger.debug(f"GET {url}{query}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -64,8 +73,7 @@ class ApiProductClient:
         Get an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}"
-        self.logger.debug(f"GET {url}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -74,8 +82,7 @@ class ApiProductClient:
         Update an existing API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}"
-        self.logger.debug(f"PATCH {url}")
-        response = requests.patch(
+        response = self.session.patch(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -84,8 +91,7 @@ class ApiProductClient:
         Delete an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}"
-        self.logger.debug(f"DELETE {url}")
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, proxies=self.proxies, timeout=10)
         self._handle_response(response)
 
@@ -94,8 +100,7 @@ class ApiProductClient:
         Create a new document for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/documents"
-        self.logger.debug(f"POST {url}")
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -104,9 +109,7 @@ class ApiProductClient:
         List all documents for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/documents"
-        query = f"?{urllib.parse.urlencode(params)}" if params else ""
-        self.logger.debug(f"GET {url}{query}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -115,8 +118,7 @@ class ApiProductClient:
         Get a document for an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/documents/{document_id}"
-        self.logger.debug(f"GET {url}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -125,8 +127,7 @@ class ApiProductClient:
         Update an existing document for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/documents/{document_id}"
-        self.logger.debug(f"PATCH {url}")
-        response = requests.patch(
+        response = self.session.patch(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -135,8 +136,7 @@ class ApiProductClient:
         Delete a document for an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/documents/{document_id}"
-        self.logger.debug(f"DELETE {url}")
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, proxies=self.proxies, timeout=10)
         self._handle_response(response)
 
@@ -145,8 +145,7 @@ class ApiProductClient:
         Create a new version for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions"
-        self.logger.debug(f"POST {url}")
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -155,9 +154,7 @@ class ApiProductClient:
         List all versions for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions"
-        query = f"?{urllib.parse.urlencode(params)}" if params else ""
-        self.logger.debug(f"GET {url}{query}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -166,8 +163,7 @@ class ApiProductClient:
         Get a version for an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}"
-        self.logger.debug(f"GET {url}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -176,8 +172,7 @@ class ApiProductClient:
         Update an existing version for an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}"
-        self.logger.debug(f"PATCH {url}")
-        response = requests.patch(
+        response = self.session.patch(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -186,19 +181,17 @@ class ApiProductClient:
         Delete a version for an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}"
-        self.logger.debug(f"DELETE {url}")
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, proxies=self.proxies, timeout=10)
         self._handle_response(response)
 
-    def create_api_product_version_spec(self, api_product_id: str, version_id: str, data: Dict[str, Any]) -> Any:
+    def create_api_product_version_spec(self, api_product_id: str, version_id: str, data: Union[Dict[str, Any], Base64JsonBody]) -> Any:
         """
         Create a new specification for a version of an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}/specifications"
-        self.logger.debug(f"POST {url}")
-        response = requests.post(
-            url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
+        response = self.session.post(
+            url, headers=self.headers, proxies=self.proxies, timeout=10, **self._body(data))
         return self._handle_response(response)
 
     def list_api_product_version_specs(self, api_product_id: str, version_id: str) -> Any:
@@ -206,8 +199,7 @@ class ApiProductClient:
         List all specifications for a version of an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}/specifications"
-        self.logger.debug(f"GET {url}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -216,19 +208,17 @@ class ApiProductClient:
         Get a specification for a version of an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}/specifications/{spec_id}"
-        self.logger.debug(f"GET {url}")
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
-    def update_api_product_version_spec(self, api_product_id: str, version_id: str, spec_id: str, data: Dict[str, Any]) -> Any:
+    def update_api_product_version_spec(self, api_product_id: str, version_id: str, spec_id: str, data: Union[Dict[str, Any], Base64JsonBody]) -> Any:
         """
         Update an existing specification for a version of an API product.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}/specifications/{spec_id}"
-        self.logger.debug(f"PATCH {url}")
-        response = requests.patch(
-            url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
+        response = self.session.patch(
+            url, headers=self.headers, proxies=self.proxies, timeout=10, **self._body(data))
         return self._handle_response(response)
 
     def delete_api_product_version_spec(self, api_product_id: str, version_id: str, spec_id: str) -> None:
@@ -236,8 +226,7 @@ class ApiProductClient:
         Delete a specification for a version of an API product by ID.
         """
         url = f"{self.base_url}/api-products/{api_product_id}/product-versions/{version_id}/specifications/{spec_id}"
-        self.logger.debug(f"DELETE {url}")
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, proxies=self.proxies, timeout=10)
         self._handle_response(response)
 
@@ -6,7 +6,8 @@ from kptl.config.logger import Logger
 
 from typing import Any, Dict, Optional, List
 import requests
-import urllib.parse
+
+from kptl.konnect.services.session import InstrumentedSession
 
 
 class PortalManagementClient:
@@ -14,8 +15,10 @@ class PortalManagementClient:
     Client for managing portal operations.
     """
 
-    def __init__(self, base_url: str, token: str, proxies: Optional[Dict[str, str]] = None):
+    def __init__(self, base_url: str, token: str, proxies: Optional[Dict[str, str]] = None,
+                 session: Optional[requests.Session] = None):
         self.base_url = base_url
+        self.session = session or InstrumentedSession(base_url)
         self.headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
@@ -38,9 +41,7 @@ class PortalManagementClient:
         List all portals.
         """
         url = f'{self.base_url}/portals'
-        query = f'?{urllib.parse.urlencode(params)}' if params else ''
-        self.logger.debug(f'GET {url}{query}')
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -49,8 +50,7 @@ class PortalManagementClient:
         Create a new portal.
         """
         url = f'{self.base_url}/portals'
-        self.logger.debug(f'POST {url}')
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -59,8 +59,7 @@ class PortalManagementClient:
         Get portal details by ID.
         """
         url = f'{self.base_url}/portals/{portal_id}'
-        self.logger.debug(f'GET {url}')
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -69,8 +68,7 @@ class PortalManagementClient:
         Update portal details by ID.
         """
         url = f'{self.base_url}/portals/{portal_id}'
-        self.logger.debug(f'PATCH {url}')
-        response = requests.patch(
+        response = self.session.patch(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -79,9 +77,7 @@ class PortalManagementClient:
         Delete portal by ID.
         """
         url = f'{self.base_url}/portals/{portal_id}'
-        query = f'?{urllib.parse.urlencode(params)}' if params else ''
-        self.logger.debug(f'DELETE {url}{query}')
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -90,9 +86,7 @@ class PortalManagementClient:
         List all products for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/products'
-        query = f'?{urllib.parse.urlencode(params)}' if params else ''
-        self.logger.debug(f'GET {url}{query}')
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -101,9 +95,7 @@ class PortalManagementClient:
         List all product versions for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions'
-        query = f'?{urllib.parse.urlencode(params)}' if params else ''
-        self.logger.debug(f'GET {url}{query}')
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 params=params, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -112,8 +104,7 @@ class PortalManagementClient:
         Create a new product version for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions'
-        self.logger.debug(f'POST {url}')
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -122,8 +113,7 @@ class PortalManagementClient:
         Get product version details by ID for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions/{product_version_id}'
-        self.logger.debug(f'GET {url}')
-        response = requests.get(url, headers=self.headers,
+        response = self.session.get(url, headers=self.headers,
                                 proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -132,8 +122,7 @@ class PortalManagementClient:
         Update product version details by ID for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions/{product_version_id}'
-        self.logger.debug(f'PATCH {url}')
-        response = requests.patch(
+        response = self.session.patch(
             url, headers=self.headers, json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -142,8 +131,7 @@ class PortalManagementClient:
         Replace product version details by ID for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions/{product_version_id}'
-        self.logger.debug(f'PUT {url}')
-        response = requests.put(url, headers=self.headers,
+        response = self.session.put(url, headers=self.headers,
                                 json=data, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -152,8 +140,7 @@ class PortalManagementClient:
         Delete product version by ID for a portal.
         """
         url = f'{self.base_url}/portals/{portal_id}/product-versions/{product_version_id}'
-        self.logger.debug(f'DELETE {url}')
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, proxies=self.proxies, timeout=10)
         return self._handle_response(response)
 
@@ -0,0 +1,76 @@
+"""
+HTTP session shared by the service clients.
+"""
+
+import logging
+import time
+import urllib.parse
+from typing import Any, Dict
+
+import requests
+
+from kptl.config.logger import Logger
+from kptl.helpers import tracing
+from kptl.helpers.metrics import Metrics, endpoint_template
+
+
+class InstrumentedSession(requests.Session):
+    """
+    Session recording the endpoint, duration and size of every request in the run metrics,
+    and tracing it along with its status and retries. Each request is logged at debug
+    level once it completes, with its duration.
+
+    Requests count against the request budget of the run, and are not sent once it is spent.
+
+    Sharing one session between the clients also reuses connections to Konnect.
+    """
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_path = urllib.parse.urlsplit(base_url).path.rstrip('/')
+        self.metrics = Metrics()
+        self.logger = Logger()
+
+    def endpoint(self, url: str) -> str:
+        """
+        Get the endpoint template of a URL, relative to the base URL.
+        """
+        path = urllib.parse.urlsplit(url).path
+        if path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        return endpoint_template(path)
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        method = method.upper()
+        endpoint = self.endpoint(url)
+        self.metrics.start_request()
+        start = time.perf_counter()
+        with tracing.span(f"{method} {endpoint}", tracing.HTTP, method=method, endpoint=endpoint) as span:
+            sent = received = 0
+            try:
+                response = super().request(method, url, *args, **kwargs)
+                attributes = response_attributes(response)
+                sent, received = attributes["request_bytes"], attributes["response_bytes"]
+                span.set(**attributes)
+            finally:
+                duration = time.perf_counter() - start
+                self.metrics.record_request(method, endpoint, duration, sent, received)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("%s %s %s in %.1fms", method, response.url, response.status_code, duration * 1000,
+                                  extra={"method": method, "endpoint": endpoint, "status": response.status_code,
+                                         "duration_ms": round(duration * 1000, 3)})
+            return response
+
+
+def response_attributes(response: requests.Response) -> Dict[str, Any]:
+    """
+    Get the trace attributes of a response: its status, the size of the request and
+    response bodies, and the number of retries of the request.
+    """
+    retries = getattr(response.raw, 'retries', None)
+    return {
+        "status": response.status_code,
+        "request_bytes": int(response.request.headers.get('Content-Length', 0)),
+        "response_bytes": len(response.content),
+        "retries": len(retries.history) if retries is not None else 0,
+    }
@@ -1,20 +1,37 @@
 """
 Main module for kptl.
+
+Commands and their dependencies are imported when the command runs, so that offline
+commands such as `validate` and `explain` start without importing `requests` or `deepdiff`.
 """
 
 import argparse
+import json
 import os
 import sys
+from typing import Optional
 from kptl import __version__
 from kptl.config import constants, logger
-from kptl.konnect.api import KonnectApi
-from kptl.helpers import utils
-from kptl.commands import DiffCommand, DeleteCommand, ExplainCommand, SyncCommand
+from kptl.config.logger import LOG_FORMATS, TEXT, Logger
+from kptl.helpers import metrics, profiling, tracing
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 logger = logger.Logger(name=constants.APP_NAME, level=LOG_LEVEL)
 
 
+def positive_int(value: str) -> int:
+    """
+    Parse a command-line argument as an integer of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got '{value}'")
+    return number
+
+
 def get_parser_args() -> argparse.Namespace:
     """
     Parse command-line arguments.
@@ -31,7 +48,26 @@ def get_parser_args() -> argparse.Namespace:
     subparsers = parser.add_subparsers(
         dest="command", required=True, help="Available commands")
 
-    common_parser = argparse.ArgumentParser(add_help=False)
+    # Flags of every command
+    run_parser = argparse.ArgumentParser(add_help=False)
+    run_parser.add_argument(
+        "--timings", action="store_true",
+        help="Print the time of each phase of the run and the latency of the requests per endpoint")
+    run_parser.add_argument(
+        "--trace-file", metavar="PATH",
+        help="Write a trace of the phases, Konnect operations and HTTP requests of the run to a file, "
+             "in the Chrome trace format")
+    run_parser.add_argument(
+        "--log-format", choices=LOG_FORMATS, default=TEXT,
+        help="Format of the log records: colored text, or one JSON object per line")
+    run_parser.add_argument(
+        "--profile", choices=profiling.PROFILES, default=None,
+        help="Profile the command, worker threads included, with cProfile (cpu) or tracemalloc (mem) and write the profile to a file")
+    run_parser.add_argument(
+        "--profile-dir", metavar="DIR", default=".",
+        help="Directory of the profile files, defaults to the current directory")
+
+    common_parser = argparse.ArgumentParser(add_help=False, parents=[run_parser])
     common_parser.add_argument(
         "--config", type=str, help="Path to the CLI configuration file")
     common_parser.add_argument(
@@ -42,6 +78,13 @@ def get_parser_args() -> argparse.Namespace:
         "--http-proxy", type=str, help="HTTP Proxy URL", default=None)
     common_parser.add_argument(
         "--https-proxy", type=str, help="HTTPS Proxy URL", default=None)
+    common_parser.add_argument(
+        "--max-requests", type=positive_int, metavar="N", default=None,
+        help="Abort the run before it sends more than N requests to Konnect")
+    common_parser.add_argument(
+        "--report-calls", nargs="?", const="-", metavar="PATH",
+        help="Print the number of requests and bytes sent and received per endpoint, "
+             "or write them to PATH as JSON")
 
     deploy_parser = subparsers.add_parser(
         'sync', help='Sync API product with Konnect', parents=[common_parser])
@@ -52,6 +95,20 @@ def get_parser_args() -> argparse.Namespace:
         'diff', help='Diff API product with Konnect', parents=[common_parser])
     deploy_parser.add_argument(
         "state", type=str, help="Path to the API product state file")
+    deploy_parser.add_argument(
+        "--against", type=str, metavar="GIT_REF", default=None,
+        help="Diff against the state at the given git revision instead of Konnect (offline)")
+
+    drift_parser = subparsers.add_parser(
+        'drift', help='Report drift between many API product states and Konnect', parents=[common_parser])
+    drift_parser.add_argument(
+        "paths", type=str, nargs='+', help="State files, directories or glob patterns")
+    drift_parser.add_argument(
+        "--concurrency", type=positive_int, default=8, help="Number of products to diff concurrently")
+    drift_parser.add_argument(
+        "--output", type=str, default=None, help="Write the JSON report to a file instead of stdout")
+    drift_parser.add_argument(
+        "--fail-on-drift", action="store_true", help="Exit with status 1 if any product drifted")
 
     delete_parser = subparsers.add_parser(
         'delete', help='Delete API product', parents=[common_parser])
@@ -61,14 +118,26 @@ def get_parser_args() -> argparse.Namespace:
         "--yes", action="store_true", help="Skip confirmation prompt")
 
     describe_parser = subparsers.add_parser(
-        'explain', help='Explain the actions that will be performed on Konnect')
+        'explain', help='Explain the actions that will be performed on Konnect', parents=[run_parser])
     describe_parser.add_argument(
         "state", type=str, help="Path to the API product state file")
     
     validate_parser = subparsers.add_parser(
-        'validate', help='Validate the API product state file')
+        'validate', help='Validate API product state files', parents=[run_parser])
     validate_parser.add_argument(
-        "state", type=str, help="Path to the API product state file")
+        "paths", type=str, nargs='+', help="State files, directories or glob patterns")
+    validate_parser.add_argument(
+        "--check-refs", action="store_true",
+        help="Check that the referenced specs parse and the documents directory exists")
+    validate_parser.add_argument(
+        "--deep", action="store_true",
+        help="Also check version names against the specs and the documents tree, implies --check-refs")
+    validate_parser.add_argument(
+        "--format", type=str, choices=["text", "json", "junit"], default="text", help="Report format")
+    validate_parser.add_argument(
+        "--output", type=str, default=None, help="Write the JSON or JUnit report to a file instead of stdout")
+    validate_parser.add_argument(
+        "--jobs", type=positive_int, default=None, help="Number of worker processes, defaults to the number of CPUs")
 
     return parser.parse_args()
 
@@ -77,16 +146,91 @@ def main() -> None:
     """
     Main function for the kptl module.
     """
+    metrics.Metrics().reset()
+    tracing.Tracer().reset()
     args = get_parser_args()
 
+    Logger.configure(args.log_format)
+    metrics.Metrics().max_requests = getattr(args, 'max_requests', None)
+    if args.trace_file:
+        tracing.Tracer().enable()
+
+    try:
+        with tracing.span(f"kptl {args.command}", tracing.COMMAND):
+            if args.profile:
+                path = profiling.output_path(args.profile_dir, args.profile, args.command, product_name(args))
+                logger.info("Profiling the %s usage of the command to '%s'", args.profile, path)
+                with profiling.profile(args.profile, path):
+                    run(args)
+            else:
+                run(args)
+    except metrics.RequestBudgetExceeded as e:
+        logger.error("%s, aborting", e)
+        sys.exit(1)
+    finally:
+        # Write the queued records before the reports
+        Logger.shutdown()
+        if args.timings:
+            print(metrics.Metrics().report(), file=sys.stderr)
+        if getattr(args, 'report_calls', None):
+            report_calls(args.report_calls)
+        if args.trace_file:
+            tracing.Tracer().write(args.trace_file)
+
+
+def product_name(args: argparse.Namespace) -> Optional[str]:
+    """
+    Get the name of the API product of a command, for the name of its profile: the
+    product argument, or the name in the state file. Commands on many states have none.
+    """
+    if getattr(args, 'product', None):
+        return args.product
+    if not getattr(args, 'state', None):
+        return None
+    from kptl.helpers import utils
+    try:
+        return utils.load_yaml(utils.read_file_content(args.state))['info']['name']
+    except Exception:  # pylint: disable=broad-except
+        # The command reports the invalid state, the profile is named after the file
+        return os.path.splitext(os.path.basename(args.state))[0]
+
+
+def report_calls(path: str) -> None:
+    """
+    Print the requests per endpoint of the run, or write them to a JSON file.
+
+    Args:
+        path (str): The path of the JSON file, or "-" to print the table.
+    """
+    if path == "-":
+        print(metrics.Metrics().calls_report(), file=sys.stderr)
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(metrics.Metrics().calls(), file, indent=2)
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    Run the command of the parsed arguments.
+    """
     if args.command == 'explain':
+        from kptl.commands import ExplainCommand
         ExplainCommand().execute(args)
         sys.exit(0)
     elif args.command == 'validate':
-        utils.load_state(args.state)
+        from kptl.commands import ValidateCommand
+        ValidateCommand().execute(args)
         sys.exit(0)
+    elif args.command == 'diff' and args.against:
+        from kptl.commands import DiffCommand
+        DiffCommand(None).execute(args)
+        sys.exit(0)
+
+    from kptl.helpers import utils
+    from kptl.konnect.api import KonnectApi
 
-    config = utils.read_config_file(args.config)
+    with metrics.phase(metrics.LOAD):
+        config = utils.read_config_file(args.config)
 
     konnect = KonnectApi(
         token=args.konnect_token if args.konnect_token else config.get(
@@ -100,10 +244,16 @@ def main() -> None:
     )
 
     if args.command == 'sync':
+        from kptl.commands import SyncCommand
         SyncCommand(konnect).execute(args)
     elif args.command == 'diff':
+        from kptl.commands import DiffCommand
         DiffCommand(konnect).execute(args)
+    elif args.command == 'drift':
+        from kptl.commands import DriftCommand
+        DriftCommand(konnect).execute(args)
     elif args.command == 'delete':
+        from kptl.commands import DeleteCommand
         DeleteCommand(konnect).execute(args)
     else:
         logger.error("Invalid command")
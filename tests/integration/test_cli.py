@@ -2,11 +2,16 @@
 Integration tests for the CLI.
 """
 
+import json
+import os
+import shutil
 import subprocess
+import textwrap
 from typing import Generator, List
 import pytest
 import requests
 from src.kptl import __version__
+from src.kptl.helpers.docs_index import INDEX_DIR
 from .helpers.utils import load_openapi_spec, wait_for_the_server_to_start
 from .helpers.konnect import KonnectHelper
 
@@ -89,6 +94,21 @@ def start_mock_server() -> Generator[None, None, None]:
     server_process.terminate()
     server_process.wait()
 
+@pytest.fixture(scope="session", autouse=True)
+def remove_docs_index() -> Generator[None, None, None]:
+    """Fixture to remove the docs indexes that the commands write to the working directory."""
+    existed = os.path.isdir(INDEX_DIR)
+    before = set(os.listdir(INDEX_DIR)) if existed else set()
+
+    yield
+
+    if not os.path.isdir(INDEX_DIR):
+        return
+    for name in set(os.listdir(INDEX_DIR)) - before:
+        os.remove(os.path.join(INDEX_DIR, name))
+    if not existed and not os.listdir(INDEX_DIR):
+        os.rmdir(INDEX_DIR)
+
 @pytest.fixture
 def cli_command() -> List[str]:
     """Fixture to return the CLI command."""
@@ -139,6 +159,100 @@ def test_validate(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> N
     result = subprocess.run(cli_command + ["validate", tmp_path / "state.yaml"], capture_output=True, text=True, check=False)
     assert result.returncode == 1
 
+def test_validate_timings(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test the timings report of the validate command."""
+    state = tmp_path / "state.yaml"
+    state.write_text(TEST_STATE)
+    result = subprocess.run(cli_command + ["validate", tmp_path / "state.yaml", "--timings"], capture_output=True, text=True, check=True)
+    assert result.returncode == 0
+    assert "Timings (wall time" in result.stderr
+    for phase in ("load", "compare", "render"):
+        assert f"  {phase} " in result.stderr
+
+def test_validate_trace_file(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test the trace of the validate command."""
+    state = tmp_path / "state.yaml"
+    state.write_text(TEST_STATE)
+    trace_file = tmp_path / "trace.json"
+    subprocess.run(cli_command + ["validate", tmp_path / "state.yaml", "--trace-file", trace_file], capture_output=True, text=True, check=True)
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert spans["load"]["args"]["parent_id"] == spans["kptl validate"]["args"]["span_id"]
+
+def test_explain_profile(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test the profiles of the explain command."""
+    state = tmp_path / "state.yaml"
+    state.write_text(TEST_STATE)
+    for kind, extension in (("cpu", ".pstats"), ("mem", ".mem.txt")):
+        subprocess.run(cli_command + ["explain", str(state), "--profile", kind, "--profile-dir", str(tmp_path)],
+                       capture_output=True, text=True, check=True)
+        assert (tmp_path / f"kptl-explain-httpbin-api{extension}").stat().st_size > 0
+
+def test_validate_many(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test validating a directory of state files with a JSON report."""
+    (tmp_path / "valid.yaml").write_text(textwrap.dedent(TEST_STATE))
+    (tmp_path / "invalid.yaml").write_text(textwrap.dedent(TEST_STATE_INVALID))
+    (tmp_path / "missing_spec.yaml").write_text(textwrap.dedent(TEST_STATE.replace(SPEC_V2_PATH, "missing.yaml")))
+    report_path = tmp_path / "report.json"
+
+    # Workers are not forked from the process running the logging thread
+    command = cli_command[:1] + ["-W", "always::DeprecationWarning"] + cli_command[1:]
+    result = subprocess.run(command + ["validate", str(tmp_path), "--check-refs", "--jobs", "2",
+                                       "--format", "json", "--output", str(report_path)],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 1
+    assert "fork()" not in result.stderr
+
+    report = json.loads(report_path.read_text())
+    assert report["summary"] == {"valid": 1, "invalid": 2}
+    errors = {os.path.basename(state["state"]): [e["path"] for e in state["errors"]] for state in report["states"]}
+    assert errors["valid.yaml"] == []
+    assert "_version" in errors["invalid.yaml"]
+    assert errors["missing_spec.yaml"] == ["versions[1].spec"]
+
+def test_validate_jobs(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that validate rejects a number of jobs below 1."""
+    result = subprocess.run(cli_command + ["validate", str(tmp_path), "--jobs", "0"],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 2
+    assert "--jobs: must be a positive integer" in result.stderr
+
+def test_validate_deep(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test deep validation of the version names and documents tree."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ["1_intro.md", "1_intro__unpublished.md", "1.1_child.md", "2.1_orphan.md"]:
+        (docs / name).write_text("Content")
+    state = tmp_path / "state.yaml"
+    state.write_text(textwrap.dedent(f"""
+        _version: 1.0.0
+        info:
+            name: {PRODUCT_NAME}
+        documents:
+            sync: true
+            dir: {docs}
+        versions:
+            - name: "9.9.9"
+              spec: {SPEC_V1_PATH}
+            - spec: {SPEC_V2_PATH}
+            - spec: {SPEC_V2_PATH}
+        """))
+
+    result = subprocess.run(cli_command + ["validate", str(state), "--check-refs", "--format", "json"],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 0
+
+    result = subprocess.run(cli_command + ["validate", str(state), "--deep", "--format", "json"],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 1
+    messages = [e["message"] for e in json.loads(result.stdout)["states"][0]["errors"]]
+    assert messages == [
+        "The 'name' '9.9.9' in 'versions[0]' does not match the 'info.version' '1.0.0' of its spec.",
+        "The version '2.0.0' in 'versions[2]' is already defined in 'versions[1]'.",
+        f"The documents '{docs / '1_intro.md'}' and '{docs / '1_intro__unpublished.md'}' have the same slug '1-intro'.",
+        f"The document '{docs / '2.1_orphan.md'}' has no parent document with the '2_' prefix."
+    ]
+
 def test_sync(sync_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
     """Test state."""
     state = tmp_path / "state.yaml"
@@ -198,6 +312,141 @@ def test_sync(sync_command: List[str], tmp_path: pytest.TempPathFactory) -> None
     assert prod_portal_product_version_v1["deprecated"] is True
 
     
+def test_sync_max_requests(sync_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that a sync stops at its request budget and reports its calls."""
+    state = tmp_path / "state.yaml"
+    state.write_text(TEST_STATE)
+    calls_file = tmp_path / "calls.json"
+
+    result = subprocess.run(
+        sync_command + [
+            str(state),
+            "--konnect-token", "test-token",
+            "--konnect-url", TEST_SERVER_URL,
+            "--max-requests", "3",
+            "--report-calls", str(calls_file)
+        ],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    assert result.returncode == 1
+    assert "exceeded its budget of 3 requests" in result.stderr
+    assert json.loads(calls_file.read_text())["requests"] == 3
+
+def test_sync_max_requests_positive(sync_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that sync rejects a request budget below 1."""
+    result = subprocess.run(sync_command + [str(tmp_path / "state.yaml"), "--max-requests", "0"],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 2
+    assert "--max-requests: must be a positive integer" in result.stderr
+
+def test_drift(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that drift reports clean, drifted, invalid and failing state files as JSON."""
+    (tmp_path / "clean.yaml").write_text(textwrap.dedent(TEST_STATE))
+    (tmp_path / "drifted.yaml").write_text(textwrap.dedent(
+        TEST_STATE.replace("A simple API Product for requests to /httpbin", "A drifted description")))
+    (tmp_path / "invalid.yaml").write_text(textwrap.dedent(TEST_STATE_INVALID))
+    (tmp_path / "failing.yaml").write_text(textwrap.dedent(
+        TEST_STATE.replace(SPEC_V2_PATH, "examples/api-specs/missing.yaml")))
+
+    result = subprocess.run(
+        cli_command + [
+            "drift", str(tmp_path),
+            "--konnect-token", "test-token",
+            "--konnect-url", TEST_SERVER_URL
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    report = json.loads(result.stdout)
+    products = {os.path.basename(product["state"]): product for product in report["products"]}
+    assert report["summary"] == {"in_sync": 1, "drifted": 1, "missing": 0, "error": 2}
+    assert products["clean.yaml"]["status"] == "in_sync"
+    assert products["drifted.yaml"]["status"] == "drifted"
+    assert products["invalid.yaml"]["status"] == "error"
+    assert {"path": "info.name", "message": "Missing or invalid 'info.name'"} in products["invalid.yaml"]["errors"]
+    assert products["failing.yaml"]["status"] == "error"
+    assert "Invalid state file" in result.stderr
+    assert "File not found: examples/api-specs/missing.yaml" in result.stderr
+
+def test_drift_fetches_bodies_only_without_metadata_changes(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that drift does not fetch the documents and specs of a product whose metadata drifted."""
+    (tmp_path / "clean.yaml").write_text(textwrap.dedent(TEST_STATE))
+    (tmp_path / "drifted.yaml").write_text(textwrap.dedent(
+        TEST_STATE.replace("A simple API Product for requests to /httpbin", "A drifted description")))
+
+    def body_requests(state_file: str) -> int:
+        calls_file = tmp_path / "calls.json"
+        subprocess.run(
+            cli_command + [
+                "drift", str(tmp_path / state_file),
+                "--konnect-token", "test-token",
+                "--konnect-url", TEST_SERVER_URL,
+                "--report-calls", str(calls_file)
+            ],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        endpoints = json.loads(calls_file.read_text())["endpoints"]
+        return sum(row["requests"] for row in endpoints
+                   if row["endpoint"].endswith(("/documents/{id}", "/specifications")))
+
+    assert body_requests("drifted.yaml") == 0
+    assert body_requests("clean.yaml") > 0
+
+def test_drift_concurrency(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test that drift rejects a concurrency below 1."""
+    result = subprocess.run(cli_command + ["drift", str(tmp_path), "--concurrency", "0"],
+                            capture_output=True, text=True, check=False)
+    assert result.returncode == 2
+    assert "--concurrency: must be a positive integer" in result.stderr
+
+def test_diff_against(cli_command: List[str], tmp_path: pytest.TempPathFactory) -> None:
+    """Test diffing a state file, its specs and documents against a git revision."""
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                       cwd=tmp_path, capture_output=True, check=True)
+
+    state = textwrap.dedent(f"""
+        _version: 1.0.0
+        info:
+            name: {PRODUCT_NAME}
+        documents:
+            sync: true
+            dir: docs
+        versions:
+            - spec: spec.yaml
+        """)
+    (tmp_path / "state.yaml").write_text(state)
+    shutil.copy(SPEC_V1_PATH, tmp_path / "spec.yaml")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "1_intro.md").write_text("# Intro")
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "v1")
+
+    (tmp_path / "state.yaml").write_text(state.replace(PRODUCT_NAME, "Renamed API"))
+    shutil.copy(SPEC_V2_PATH, tmp_path / "spec.yaml")
+    (tmp_path / "docs" / "1_intro.md").write_text("# Introduction")
+    git("commit", "-q", "-am", "v2")
+
+    command = [cli_command[0], os.path.abspath(cli_command[1]), "diff", "state.yaml"]
+    result = subprocess.run(command + ["--against", "HEAD~1"], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert "Updated (4)" in result.stdout
+    for change in ("['info']['name']", "['documents'][0]['content']", "['versions'][0]['spec']", "['versions'][0]['name']"):
+        assert change in result.stdout
+
+    result = subprocess.run(command + ["--against", "HEAD"], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert "No changes detected." in result.stdout
+
+    result = subprocess.run(command + ["--against", "missing"], cwd=tmp_path, capture_output=True, text=True, check=False)
+    assert result.returncode == 1
+    assert "Unknown git revision 'missing'" in result.stderr
+
 def test_delete_api_product_by_name(delete_command: List[str]) -> None:
     """Test deleting API product."""
 
@@ -0,0 +1,38 @@
+"""
+Unit tests for the diff command.
+"""
+
+import os
+from typing import Any
+
+from src.kptl.commands import diff
+from src.kptl.commands.diff import DiffCommand
+
+STATE = """
+_version: 1.0.0
+info:
+  name: HTTPBin API
+documents:
+  sync: true
+  dir: docs
+"""
+
+
+def test_load_local_state_uses_docs_index(tmpdir, monkeypatch, mocker: Any) -> None:
+    """
+    Test that the documents of the local state are only read when the index is out of date.
+    """
+    monkeypatch.chdir(tmpdir)
+    tmpdir.join("state.yaml").write(STATE)
+    docs = tmpdir.mkdir("docs")
+    docs.join("1_intro.md").write("# Intro")
+    docs.join("2_guide.md").write("# Guide")
+    read = mocker.spy(diff.api_product_documents, "read_markdown_file")
+
+    first = DiffCommand(None).load_local_state("state.yaml")
+    assert read.call_count == 2
+    assert os.listdir(tmpdir.join(".kptl"))
+
+    second = DiffCommand(None).load_local_state("state.yaml")
+    assert read.call_count == 2
+    assert second.to_dict() == first.to_dict()
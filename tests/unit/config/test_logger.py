@@ -0,0 +1,62 @@
+"""
+Unit tests for the logger.
+"""
+
+import json
+import logging
+from src.kptl.config.logger import JSON, ColoredFormatter, JsonFormatter, Logger
+
+
+def make_record(**extra) -> logging.LogRecord:
+    """Create an info record with the given extra fields."""
+    record = logging.makeLogRecord({"name": "kptl", "levelno": logging.INFO, "levelname": "INFO",
+                                    "msg": "GET %s %s", "args": ("/portals", 200)})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_colored_formatter_keeps_the_record() -> None:
+    """
+    Test that the colored formatter does not change the level name of the record.
+    """
+    record = make_record()
+
+    output = ColoredFormatter(fmt="%(levelname)s %(message)s").format(record)
+
+    assert output == "\033[92mINFO\033[0m GET /portals 200"
+    assert record.levelname == "INFO"
+
+
+def test_json_formatter() -> None:
+    """
+    Test that the JSON formatter writes the message and the extra fields.
+    """
+    entry = json.loads(JsonFormatter().format(make_record(endpoint="/portals", duration_ms=1.5)))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "kptl"
+    assert entry["message"] == "GET /portals 200"
+    assert entry["endpoint"] == "/portals"
+    assert entry["duration_ms"] == 1.5
+    assert "args" not in entry and "msg" not in entry
+
+
+def test_configure_writes_through_a_queue(capsys) -> None:
+    """
+    Test that the configured logger writes its records from the listener, once flushed.
+    """
+    logger = Logger()
+    handlers = logger.handlers
+    try:
+        Logger.configure(JSON)
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+        logger.warning("Processing %s", "v1", extra={"version": "v1"})
+        Logger.shutdown()
+
+        entry = json.loads(capsys.readouterr().err)
+        assert entry["message"] == "Processing v1"
+        assert entry["version"] == "v1"
+        assert not isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+    finally:
+        Logger.shutdown()
+        logger.handlers = handlers
@@ -2,9 +2,14 @@
 Unit tests for api_product_documents helper functions.
 """
 
+import hashlib
+import json
+import os
 from typing import List, Dict, Any
 import pytest
-from src.kptl.helpers.api_product_documents import get_slug_tail, parse_directory
+from src.kptl.helpers.api_product_documents import get_slug_tail, parse_directory, iter_pages, iter_page_handles, load_page_content
+from src.kptl.helpers import api_product_documents
+from src.kptl.helpers.docs_index import DocsIndex
 from src.kptl.helpers.utils import encode_content
 
 @pytest.fixture
@@ -40,30 +45,132 @@ def test_parse_directory(docs_directory: str) -> None:
         "slug": "1-file1",
         "title": "File1",
         "content": encode_content("Content of file1"),
+        "digest": hashlib.sha256(b"Content of file1").hexdigest(),
         "status": "published",
-        "parent_slug": None
+        "parent_slug": None,
+        "file_path": os.path.join(docs_directory, "1_file1.md")
     }, {
         "slug": "1-1-file11",
         "title": "File11",
         "content": encode_content("Content of file11"),
+        "digest": hashlib.sha256(b"Content of file11").hexdigest(),
         "status": "published",
-        "parent_slug": "1-file1"
+        "parent_slug": "1-file1",
+        "file_path": os.path.join(docs_directory, "1.1_file11.md")
     }, {
         "slug": "1-2-file12",
         "title": "File12",
         "content": encode_content("Content of file12"),
+        "digest": hashlib.sha256(b"Content of file12").hexdigest(),
         "status": "published",
-        "parent_slug": "1-file1"
+        "parent_slug": "1-file1",
+        "file_path": os.path.join(docs_directory, "1.2_file12.md")
     }, {
         "slug": "2-file2",
         "title": "File2",
         "content": encode_content("Content of file2"),
+        "digest": hashlib.sha256(b"Content of file2").hexdigest(),
         "status": "unpublished",
-        "parent_slug": None
+        "parent_slug": None,
+        "file_path": os.path.join(docs_directory, "2_file2__unpublished.md")
     }]
 
     assert pages == expected_pages
 
+def test_parse_directory_with_index(docs_directory: str, tmpdir, mocker: Any) -> None:
+    """
+    Test that indexed files are not read again unless they change.
+    """
+    index_path = str(tmpdir.join(".kptl", "docs-index"))
+    expected_pages = parse_directory(docs_directory)
+    assert parse_directory(docs_directory, with_content=False, index=DocsIndex(index_path)) == expected_pages
+
+    read = mocker.patch("src.kptl.helpers.api_product_documents.read_markdown_file",
+                        side_effect=lambda file_path: open(file_path, encoding="utf-8").read())
+    pages = parse_directory(docs_directory, with_content=False, index=DocsIndex(index_path))
+
+    read.assert_not_called()
+    assert [page["content"] for page in pages] == [None] * 4
+    assert [page["digest"] for page in pages] == [page["digest"] for page in expected_pages]
+
+    # A modified file is read again
+    with open(os.path.join(docs_directory, "1.2_file12.md"), "a", encoding="utf-8") as f:
+        f.write(" changed")
+    read.reset_mock()
+    pages = parse_directory(docs_directory, with_content=False, index=DocsIndex(index_path))
+
+    assert [call.args[0] for call in read.call_args_list] == [os.path.join(docs_directory, "1.2_file12.md")]
+    assert pages[2]["content"] == encode_content("Content of file12 changed")
+    assert load_page_content(pages[0]) == expected_pages[0]["content"]
+
+def test_index_drops_removed_pages(docs_directory: str, tmpdir) -> None:
+    """
+    Test that the saved index only holds the pages of the last run, not deleted or renamed ones.
+    """
+    index_path = str(tmpdir.join(".kptl", "docs-index"))
+    parse_directory(docs_directory, with_content=False, index=DocsIndex(index_path))
+
+    os.remove(os.path.join(docs_directory, "1.2_file12.md"))
+    os.rename(os.path.join(docs_directory, "1_file1.md"), os.path.join(docs_directory, "1_renamed.md"))
+    parse_directory(docs_directory, with_content=False, index=DocsIndex(index_path))
+
+    with open(index_path, encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    assert sorted(os.path.basename(path) for path in entries) == sorted(
+        file for file in os.listdir(docs_directory) if file.endswith(".md"))
+    assert "1_renamed.md" in {os.path.basename(path) for path in entries}
+    assert os.listdir(tmpdir.join(".kptl")) == ["docs-index"]
+
+def test_index_for_directory() -> None:
+    """
+    Test that each documents directory has its own index.
+    """
+    assert DocsIndex.for_directory("docs/a").path != DocsIndex.for_directory("docs/b").path
+    assert DocsIndex.for_directory("docs/a").path == DocsIndex.for_directory(os.path.abspath("docs/a")).path
+
+def test_iter_page_handles(docs_directory: str, mocker: Any) -> None:
+    """
+    Test that pages hold handles on their content, which is read again only when loaded.
+    """
+    expected_pages = parse_directory(docs_directory)
+    pages = list(iter_page_handles(docs_directory))
+
+    # The class as imported by the module, which may differ from src.kptl.helpers.content_handle
+    assert all(isinstance(page["content"], api_product_documents.ContentHandle) for page in pages)
+    assert [page["content"].digest for page in pages] == [page["digest"] for page in expected_pages]
+
+    read = mocker.patch("src.kptl.helpers.api_product_documents.read_markdown_file",
+                        side_effect=lambda file_path: open(file_path, encoding="utf-8").read())
+    assert load_page_content(pages[1]) == expected_pages[1]["content"]
+    read.assert_called_once_with(pages[1]["file_path"])
+
+def test_iter_pages_keeps_order() -> None:
+    """
+    Test that pages read on a thread pool are yielded in order, with their parents resolved.
+    """
+    file_paths = [f"docs/{major}.{minor}_page.md" for major in range(1, 21) for minor in range(1, 5)]
+    file_paths += [f"docs/{major}_parent.md" for major in range(1, 21)]
+    read_files = []
+
+    def read_file(file_path: str) -> str:
+        read_files.append(file_path)
+        return f"  {file_path}\n"
+
+    pages = iter_pages(reversed(file_paths), read_file, max_workers=2)
+    first_page = next(pages)
+
+    assert first_page["slug"] == "1-parent"
+    assert first_page["content"] == encode_content("docs/1_parent.md")
+    # Only a bounded number of pages are read ahead
+    assert len(read_files) < len(file_paths)
+
+    pages = [first_page, *pages]
+    assert [page["slug"] for page in pages[:6]] == [
+        "1-parent", "1-1-page", "1-2-page", "1-3-page", "1-4-page", "2-parent"]
+    assert all(page["parent_slug"] == f"{page['slug'].split('-')[0]}-parent"
+               for page in pages if page["slug"].count("-") == 2)
+    assert len(pages) == len(file_paths)
+
 def test_get_slug_tail_single_segment() -> None:
     """
     Test get_slug_tail with a single segment slug.
@@ -0,0 +1,101 @@
+"""
+Unit tests for the spec content cache.
+"""
+
+import hashlib
+import os
+from typing import Any
+import pytest
+from src.kptl.helpers import content_cache
+from src.kptl.helpers.utils import encode_content
+
+SPEC = "openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.0.0\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    """
+    Start every test with an empty cache.
+    """
+    content_cache.clear()
+
+
+def test_get_computes_all_forms(tmpdir) -> None:
+    """
+    Test the raw, parsed, base64 and digest forms of an entry.
+    """
+    spec = tmpdir.join("openapi.yaml")
+    spec.write(SPEC)
+
+    entry = content_cache.get(str(spec))
+
+    assert entry.raw == SPEC.encode('utf-8')
+    assert entry.data["info"]["version"] == "1.0.0"
+    assert entry.base64 == encode_content(SPEC)
+    assert entry.digest == hashlib.sha256(SPEC.encode('utf-8')).hexdigest()
+
+
+def test_get_reads_and_parses_once(tmpdir, mocker: Any) -> None:
+    """
+    Test that repeated lookups of an unchanged file share one entry.
+    """
+    spec = tmpdir.join("openapi.yaml")
+    spec.write(SPEC)
+    read = mocker.spy(content_cache.utils, "read_file_content")
+    parse = mocker.spy(content_cache.utils, "load_yaml")
+
+    for _ in range(3):
+        entry = content_cache.get(str(spec))
+        _ = entry.data, entry.base64, entry.digest
+
+    # Relative and absolute paths resolve to the same entry
+    assert content_cache.get(os.path.relpath(str(spec))) is entry
+    assert read.call_count == 1
+    assert parse.call_count == 1
+
+
+def test_get_refreshes_modified_file(tmpdir) -> None:
+    """
+    Test that a modified file gets a new entry.
+    """
+    spec = tmpdir.join("openapi.yaml")
+    spec.write(SPEC)
+    entry = content_cache.get(str(spec))
+    assert entry.data["info"]["version"] == "1.0.0"
+
+    spec.write(SPEC.replace("1.0.0", "2.0.0-rc.1"))
+
+    refreshed = content_cache.get(str(spec))
+    assert refreshed is not entry
+    assert refreshed.data["info"]["version"] == "2.0.0-rc.1"
+
+
+def test_get_missing_file(tmpdir) -> None:
+    """
+    Test that a missing file exits with an error.
+    """
+    with pytest.raises(SystemExit):
+        content_cache.get(str(tmpdir.join("missing.yaml")))
+
+
+@pytest.mark.parametrize("content", [
+    SPEC,
+    '{"openapi": "3.0.3", "x-title": "Tést", "info": {"title": "Test", "version": "1.0.0"}}',
+])
+def test_mapped_content_is_not_kept(content: str, tmpdir, mocker: Any) -> None:
+    """
+    Test that memory-mapped content is parsed, versioned and read without keeping its bytes.
+    """
+    mocker.patch.object(content_cache, "MMAP_THRESHOLD", 1)
+    mocker.patch.object(content_cache.utils, "OAS_VERSION_SCAN_SIZE", 8)
+    spec = tmpdir.join("openapi.yaml")
+    spec.write_binary(content.encode('utf-8'))
+
+    entry = content_cache.get(str(spec))
+
+    assert entry.version == "1.0.0"
+    assert "data" not in entry.__dict__
+    assert entry.data["info"]["version"] == "1.0.0"
+    assert entry.read() == content.encode('utf-8')
+    assert entry.digest == hashlib.sha256(content.encode('utf-8')).hexdigest()
+    assert "raw" not in entry.__dict__
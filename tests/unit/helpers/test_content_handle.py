@@ -0,0 +1,44 @@
+"""
+Unit tests for content handles.
+"""
+
+import hashlib
+from unittest.mock import MagicMock
+from src.kptl.helpers import content_cache
+from src.kptl.helpers.content_handle import ContentHandle
+from src.kptl.helpers.utils import encode_content
+
+SPEC = "openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.0.0\n"
+
+
+def test_from_content_loads_lazily() -> None:
+    """
+    Test that a handle with a loader does not keep the content and loads it on read.
+    """
+    loader = MagicMock(return_value=SPEC)
+    handle = ContentHandle.from_content("product/version", SPEC, loader)
+
+    assert handle.digest == hashlib.sha256(SPEC.encode("utf-8")).hexdigest()
+    assert str(handle) == f"sha256:{handle.digest}"
+    loader.assert_not_called()
+
+    assert handle.read() == SPEC.encode("utf-8")
+    assert handle.encode() == encode_content(SPEC)
+    assert loader.call_count == 2
+
+
+def test_handles_compare_by_digest(tmpdir) -> None:
+    """
+    Test that handles on the same content are equal, wherever it comes from.
+    """
+    content_cache.clear()
+    spec = tmpdir.join("openapi.yaml")
+    spec.write(SPEC)
+
+    local = ContentHandle.from_file(str(spec))
+    remote = ContentHandle.from_content("product/version", SPEC)
+
+    assert local == remote
+    assert hash(local) == hash(remote)
+    assert local != ContentHandle.from_content("product/version", SPEC + "\n")
+    assert local.read() == remote.read() == SPEC.encode("utf-8")
@@ -0,0 +1,92 @@
+"""
+Unit tests for the git revision helpers.
+"""
+
+import os
+import subprocess
+import pytest
+from src.kptl.helpers.git import GitRevision
+
+
+def git(cwd: str, *args: str) -> None:
+    """
+    Run a git command in the given directory.
+    """
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repository(tmpdir) -> str:
+    """
+    Create a git repository with one commit and uncommitted changes on top of it.
+    """
+    repo = tmpdir.mkdir("repo")
+    repo.join("state.yaml").write("name: before")
+    repo.join("my state.yaml").write("name: spaced")
+    docs = repo.mkdir("docs")
+    docs.join("1_intro.md").write("Intro")
+    docs.join("1.1_child.md").write("Child")
+
+    git(str(repo), "init", "-q")
+    git(str(repo), "add", ".")
+    git(str(repo), "commit", "-q", "-m", "init")
+
+    repo.join("state.yaml").write("name: after")
+    docs.join("2_new.md").write("New")
+
+    return str(repo)
+
+
+def test_read_returns_committed_content(repository: str) -> None:
+    """
+    Test that files are read as committed, not as in the working tree.
+    """
+    with GitRevision("HEAD", cwd=repository) as revision:
+        assert revision.read("state.yaml") == b"name: before"
+        assert revision.read("docs/1_intro.md") == b"Intro"
+        assert revision.read("my state.yaml") == b"name: spaced"
+
+
+def test_read_missing_file(repository: str) -> None:
+    """
+    Test that reading a file that does not exist at the revision returns None.
+    """
+    with GitRevision("HEAD", cwd=repository) as revision:
+        assert revision.read("docs/2_new.md") is None
+        assert revision.read("my new.yaml") is None
+        assert revision.read("docs/a b c.md") is None
+        assert revision.read("docs") is None
+        assert revision.read("../outside.yaml") is None
+
+
+def test_list_files(repository: str) -> None:
+    """
+    Test listing the files of a directory at the revision.
+    """
+    with GitRevision("HEAD", cwd=repository) as revision:
+        files = revision.list_files("docs")
+
+    assert sorted(os.path.basename(f) for f in files) == [
+        "1.1_child.md", "1_intro.md"]
+
+
+def test_unknown_revision(repository: str) -> None:
+    """
+    Test that an unknown revision exits with an error.
+    """
+    with pytest.raises(SystemExit):
+        GitRevision("does-not-exist", cwd=repository)
+
+
+def test_git_error_output(tmpdir, mocker) -> None:
+    """
+    Test that a failing git command exits with the error output of git.
+    """
+    logger = mocker.patch("src.kptl.helpers.git.Logger")
+
+    with pytest.raises(SystemExit):
+        GitRevision("HEAD", cwd=str(tmpdir))
+
+    message = logger.return_value.error.call_args.args[0]
+    assert message.startswith("'git rev-parse' failed: fatal: not a git repository")
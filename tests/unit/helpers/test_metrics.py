@@ -0,0 +1,128 @@
+"""
+Unit tests for the run metrics.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.kptl.helpers import metrics
+from src.kptl.helpers.metrics import Metrics, endpoint_template, percentile
+
+
+def test_endpoint_template() -> None:
+    """
+    Test that the IDs of a path are replaced with placeholders.
+    """
+    assert endpoint_template("/api-products") == "/api-products"
+    assert endpoint_template("/api-products/4d2e/documents") == "/api-products/{id}/documents"
+    assert endpoint_template("/portals/1/products/2/") == "/portals/{id}/products/{id}"
+
+
+def test_percentile() -> None:
+    """
+    Test the nearest-rank percentile of sorted values.
+    """
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 50) == 2.0
+    assert percentile(values, 95) == 4.0
+    assert percentile([5.0], 50) == 5.0
+    assert percentile([], 50) == 0.0
+
+
+def test_phase_excludes_requests_and_nested_phases() -> None:
+    """
+    Test that a phase does not count the requests and phases nested in it.
+    """
+    run = Metrics()
+    run.reset()
+
+    with metrics.phase(metrics.COMPARE):
+        time.sleep(0.01)
+        run.record_request("GET", "/api-products", 0.01)
+        with metrics.phase(metrics.PREPARE):
+            time.sleep(0.01)
+
+    assert run.phases[metrics.PREPARE] >= 0.01
+    assert 0 <= run.phases[metrics.COMPARE] < run.phases[metrics.PREPARE]
+    assert run.requests == {("GET", "/api-products"): [0.01]}
+
+
+def test_phases_of_worker_threads_are_not_timed() -> None:
+    """
+    Test that phases and requests of a thread pool only count in the phase around the pool.
+    """
+    run = Metrics()
+    run.reset()
+
+    def work(_) -> None:
+        with metrics.phase(metrics.COMPARE):
+            time.sleep(0.01)
+            run.record_request("GET", "/api-products", 0.5)
+
+    with metrics.phase(metrics.CONCURRENT), ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(work, range(4)))
+
+    assert metrics.COMPARE not in run.phases
+    assert 0.01 <= run.phases[metrics.CONCURRENT] < time.perf_counter() - run.started
+    assert run.remote_reads == 0.0
+    assert run.requests == {("GET", "/api-products"): [0.5] * 4}
+    run.reset()
+
+
+def test_report() -> None:
+    """
+    Test that the report lists the phases, then the requests per endpoint with reads first.
+    """
+    run = Metrics()
+    run.reset()
+    run.record_request("POST", "/api-products", 0.2)
+    run.record_request("GET", "/portals", 0.1)
+    run.record_request("GET", "/portals", 0.3)
+
+    lines = Metrics().report().splitlines()
+
+    names = [line.split()[0] for line in lines[2:11]]
+    assert names == ["load", "prepare", "remote", "fetch", "compare", "apply", "remote", "render", "other"]
+    assert "400.0ms" in lines[4]
+    assert "200.0ms" in lines[8]
+    endpoints = [line.split() for line in lines[13:]]
+    assert [row[:3] for row in endpoints] == [["GET", "/portals", "2"], ["POST", "/api-products", "1"]]
+    run.reset()
+
+
+def test_request_budget() -> None:
+    """
+    Test that requests over the budget are refused before they are counted.
+    """
+    run = Metrics()
+    run.reset()
+    run.max_requests = 2
+
+    run.start_request()
+    run.start_request()
+    with pytest.raises(metrics.RequestBudgetExceeded):
+        run.start_request()
+    assert run.count == 2
+    run.reset()
+
+
+def test_calls() -> None:
+    """
+    Test the count of requests and bytes per endpoint, the busiest endpoints first.
+    """
+    run = Metrics()
+    run.reset()
+    run.record_request("GET", "/portals", 0.1, 0, 100)
+    run.record_request("POST", "/api-products/{id}/documents", 0.1, 30, 10)
+    run.record_request("POST", "/api-products/{id}/documents", 0.1, 20, 10)
+
+    calls = run.calls()
+
+    assert calls["requests"] == 3
+    assert calls["bytes_sent"] == 50
+    assert calls["bytes_received"] == 120
+    assert calls["endpoints"][0] == {"method": "POST", "endpoint": "/api-products/{id}/documents",
+                                     "requests": 2, "bytes_sent": 50, "bytes_received": 20}
+    assert run.calls_report().splitlines()[-1].split() == ["total", "3", "50", "120"]
+    run.reset()
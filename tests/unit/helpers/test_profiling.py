@@ -0,0 +1,61 @@
+"""
+Unit tests for the profiling of a run.
+"""
+
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+from src.kptl.helpers import profiling
+
+
+def test_output_path() -> None:
+    """
+    Test that profiles are named after the command and the product.
+    """
+    assert profiling.output_path("out", "cpu", "sync", "HTTPBin API") == "out/kptl-sync-httpbin-api.pstats"
+    assert profiling.output_path(".", "mem", "validate") == "./kptl-validate.mem.txt"
+
+
+def test_cpu_profile(tmp_path) -> None:
+    """
+    Test that the CPU profile is written as pstats.
+    """
+    path = str(tmp_path / "kptl-sync.pstats")
+    with profiling.profile("cpu", path):
+        sorted(range(1000), reverse=True)
+
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_cpu_profile_threads(tmp_path) -> None:
+    """
+    Test that the CPU profile includes the threads started while profiling.
+    """
+    def work(count: int) -> int:
+        return sum(range(count))
+
+    path = str(tmp_path / "kptl-validate.pstats")
+    with profiling.profile("cpu", path), ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(work, [1000] * 4))
+
+    calls = [value[1] for (_, _, function), value in pstats.Stats(path).stats.items() if function == "work"]
+    assert calls == [4]
+
+
+def test_memory_profile(tmp_path) -> None:
+    """
+    Test that the memory profile lists the peak memory and the allocation sites, even if
+    the block exits.
+    """
+    path = tmp_path / "kptl-sync.mem.txt"
+    kept = []
+    try:
+        with profiling.profile("mem", str(path)):
+            kept.append(bytearray(1024 * 1024))
+            raise SystemExit(1)
+    except SystemExit:
+        pass
+
+    report = path.read_text()
+    assert report.startswith("Peak traced memory: ")
+    assert "test_profiling.py" in report
@@ -0,0 +1,96 @@
+"""
+Unit tests for streaming request bodies.
+"""
+
+import base64
+import json
+from typing import Any
+import pytest
+from src.kptl.helpers import content_cache
+from src.kptl.helpers.request_body import Base64JsonBody
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    """
+    Start every test with an empty cache.
+    """
+    content_cache.clear()
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, content_cache.CHUNK_SIZE + 1])
+@pytest.mark.parametrize("fields", [{}, {"name": "oas.yaml"}])
+def test_body_matches_json_serialization(tmpdir, mocker: Any, size: int, fields: dict) -> None:
+    """
+    Test that the streamed body is the JSON serialization of the fields and encoded content.
+    """
+    mocker.patch.object(content_cache, "MMAP_THRESHOLD", 0)
+    content = bytes(i % 251 for i in range(size))
+    spec = tmpdir.join("openapi.yaml")
+    spec.write_binary(content)
+
+    body = Base64JsonBody(fields, "content", content_cache.get(str(spec)))
+    expected = {**fields, "content": base64.b64encode(content).decode('utf-8')}
+
+    assert len(body) == len(json.dumps(expected).encode('utf-8'))
+    assert json.loads(b"".join(iter(lambda: body.read(1000), b""))) == expected
+    assert body.read() == b""
+
+
+def test_digest_streams_large_files(tmpdir, mocker: Any) -> None:
+    """
+    Test that large files are hashed from a memory map without being read whole.
+    """
+    mocker.patch.object(content_cache, "MMAP_THRESHOLD", 16)
+    spec = tmpdir.join("openapi.yaml")
+    spec.write("openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.0.0\n")
+    read = mocker.spy(content_cache.utils, "read_file_content")
+
+    entry = content_cache.get(str(spec))
+    with entry.view() as content:
+        chunks = list(content_cache.iter_chunks(content, chunk_size=10))
+
+    assert b"".join(chunks) == spec.read_binary()
+    assert max(len(chunk) for chunk in chunks) == 10
+    assert entry.digest == content_cache.hashlib.sha256(spec.read_binary()).hexdigest()
+    read.assert_not_called()
+
+
+def test_body_can_be_read_again(tmpdir, mocker: Any) -> None:
+    """
+    Test that the body is read whole again after a seek to the start, as on a retry, and on
+    every iteration.
+    """
+    mocker.patch.object(content_cache, "MMAP_THRESHOLD", 0)
+    spec = tmpdir.join("openapi.yaml")
+    spec.write_binary(bytes(i % 251 for i in range(content_cache.CHUNK_SIZE * 2 + 5)))
+    body = Base64JsonBody({"name": "oas.yaml"}, "content", content_cache.get(str(spec)))
+
+    first = body.read()
+    assert len(first) == len(body)
+    assert body.tell() == len(body)
+    assert body._view is None  # pylint: disable=protected-access
+
+    assert body.seek(0) == 0
+    assert body.read() == first
+    assert body.seek(10) == 10
+    assert body.read(5) == first[10:15]
+    assert b"".join(body) == first
+    assert b"".join(body) == first
+
+
+def test_large_spec_version_does_not_keep_raw_content(tmpdir, mocker: Any) -> None:
+    """
+    Test that the version of a memory-mapped spec is extracted without keeping its bytes.
+    """
+    mocker.patch.object(content_cache, "MMAP_THRESHOLD", 16)
+    spec = tmpdir.join("openapi.yaml")
+    spec.write("openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.2.3\n")
+    read = mocker.spy(content_cache.utils, "read_file_content")
+
+    entry = content_cache.get(str(spec))
+
+    assert entry.version == "1.2.3"
+    assert entry.data["info"]["title"] == "Test"
+    read.assert_not_called()
+    assert "raw" not in entry.__dict__
@@ -0,0 +1,117 @@
+"""
+Unit tests for the run trace.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.kptl.helpers import tracing
+from src.kptl.helpers.tracing import Tracer
+
+
+@pytest.fixture
+def tracer():
+    """Fixture returning the enabled tracer, reset after the test."""
+    tracer = Tracer()
+    tracer.reset()
+    tracer.enable()
+    yield tracer
+    tracer.reset()
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    """
+    Test that spans are not recorded unless tracing is enabled.
+    """
+    tracer = Tracer()
+    tracer.reset()
+
+    with tracing.span("load", tracing.PHASE) as span:
+        span.set(status=200)
+
+    assert not tracer.events
+
+
+def test_spans_are_nested(tracer) -> None:
+    """
+    Test that spans record their parent and attributes.
+    """
+    with tracing.span("kptl sync", tracing.COMMAND):
+        with tracing.span("GET /portals", tracing.HTTP, method="GET") as span:
+            span.set(status=200)
+
+    request, command = tracer.events
+    assert command["name"] == "kptl sync"
+    assert "parent_id" not in command["args"]
+    assert request["args"] == {"span_id": 2, "parent_id": 1, "method": "GET", "status": 200}
+    assert request["ph"] == "X"
+    assert command["ts"] <= request["ts"]
+    assert request["dur"] <= command["dur"]
+
+
+def test_pooled_spans_are_nested(tracer) -> None:
+    """
+    Test that spans recorded in a thread pool through `in_context` are children of the
+    span that submitted the work, and of nothing else otherwise.
+    """
+    def read(name):
+        with tracing.span(name, tracing.HTTP):
+            return name
+
+    with tracing.span("kptl drift", tracing.COMMAND):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(tracing.in_context(read), ["a", "b", "c"])) == ["a", "b", "c"]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(read, "outside").result()
+
+    spans = {event["name"]: event for event in tracer.events}
+    command_id = spans["kptl drift"]["args"]["span_id"]
+    assert [spans[name]["args"]["parent_id"] for name in "abc"] == [command_id] * 3
+    assert "parent_id" not in spans["outside"]["args"]
+
+
+def test_span_records_errors(tracer) -> None:
+    """
+    Test that a span records the exception ending it, and the status of a failed exit.
+    """
+    with pytest.raises(ValueError):
+        with tracing.span("compare", tracing.PHASE):
+            raise ValueError()
+    with pytest.raises(SystemExit):
+        with tracing.span("kptl sync", tracing.COMMAND):
+            raise SystemExit(1)
+
+    assert tracer.events[0]["args"]["error"] == "ValueError"
+    assert tracer.events[1]["args"]["exit_code"] == 1
+
+
+def test_traced_methods(tracer) -> None:
+    """
+    Test that the public methods of a traced class are recorded as spans.
+    """
+    @tracing.traced(tracing.OPERATION)
+    class Client:
+        def find(self) -> str:
+            return self._get()
+
+        def _get(self) -> str:
+            return "found"
+
+    assert Client().find() == "found"
+    assert [event["name"] for event in tracer.events] == ["Client.find"]
+    assert tracer.events[0]["cat"] == tracing.OPERATION
+
+
+def test_write(tracer, tmp_path) -> None:
+    """
+    Test that the trace is written in the Chrome trace event format.
+    """
+    with tracing.span("load", tracing.PHASE):
+        pass
+    path = tmp_path / "trace.json"
+    tracer.write(str(path))
+
+    trace = json.loads(path.read_text())
+    phases = {event["ph"] for event in trace["traceEvents"]}
+    assert phases == {"M", "X"}
+    assert trace["traceEvents"][-1]["name"] == "load"
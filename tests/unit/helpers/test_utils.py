@@ -2,9 +2,12 @@
 Unit tests for utility functions.
 """
 
-from typing import List
+import json
+from typing import Any, List
 import pytest
-from src.kptl.helpers.utils import read_file_content, encode_content, sort_key_for_numbered_files, slugify
+import yaml
+from src.kptl.helpers import utils
+from src.kptl.helpers.utils import read_file_content, encode_content, sort_key_for_numbered_files, slugify, find_state_files, parse_yaml, extract_oas_version, parse_oas
 
 def test_read_file_content(tmpdir: pytest.TempPathFactory) -> None:
     """
@@ -59,4 +62,106 @@ def test_slugify() -> None:
     # Test slugifying a title with special characters
     title = "Title with special characters: @#&*()!"
     slug = slugify(title)
-    assert slug == "title-with-special-characters"
\ No newline at end of file
+    assert slug == "title-with-special-characters"
+
+def test_find_state_files(tmpdir) -> None:
+    """
+    Test expanding directories and glob patterns into state files.
+    """
+    products = tmpdir.mkdir("products")
+    products.mkdir("a").join("state.yaml").write("_version: 1.0.0\ninfo:\n  name: A\n")
+    products.mkdir("b").join("state.yml").write("_version: 1.0.0\ninfo:\n  name: B\n")
+    products.join("a", "openapi.yaml").write("openapi: 3.0.3\ninfo:\n  version: 1.0.0\n")
+    products.join("a", "README.md").write("# A")
+
+    expected = [str(products.join("a", "state.yaml")), str(products.join("b", "state.yml"))]
+
+    # Directories are walked recursively and specs are skipped
+    assert find_state_files([str(products)]) == expected
+
+    # Glob patterns are expanded and specs are skipped
+    assert find_state_files([str(products) + "/**/*.y*ml"]) == expected
+
+    # Explicit files are always kept and duplicates are removed
+    spec = str(products.join("a", "openapi.yaml"))
+    assert find_state_files([spec, spec]) == [spec]
+
+
+@pytest.mark.parametrize("spec_file", ["examples/api-specs/v1/httpbin.yaml", "examples/api-specs/v2/httpbin.yaml"])
+def test_parse_yaml_matches_pure_python_loader(spec_file: str, mocker: Any) -> None:
+    """
+    Test that the libyaml fast path, when available, parses documents like the pure-Python loader.
+    """
+    content: bytes = read_file_content(spec_file)
+    fast = parse_yaml(content)
+
+    mocker.patch.object(utils, "YAML_LOADER", yaml.SafeLoader)
+    assert parse_yaml(content) == fast == yaml.safe_load(content)
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b"openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.2.3\npaths: {}\n", "1.2.3"),
+    (b"info:\n  version: '1.0'\n", "1.0"),
+    (b"info:\n  version: 1.0\n", 1.0),
+    (b"info: {title: Test, version: 2.0.0-beta}\n", "2.0.0-beta"),
+    (b"paths:\n  /info:\n    version: nested\ninfo:\n  x: [1, {version: no}]\n  version: 3.0.0\n", "3.0.0"),
+    (b"info:\n  title: Test\n", None),
+    (b'{"openapi": "3.0.3", "info": {"title": "T", "version": "1.2.3"}, "paths": {}}', "1.2.3"),
+    (b'\xef\xbb\xbf {\n "paths": {"/info": {"version": "x"}},\n "info": {"version": "4.5.6"}\n}', "4.5.6"),
+    (b'{"openapi": "3.0.3", "paths": {}}', None),
+])
+def test_extract_oas_version(content: bytes, expected: Any) -> None:
+    """
+    Test extracting info.version from YAML and JSON specs.
+    """
+    assert extract_oas_version(content) == expected
+
+
+def test_extract_oas_version_stops_early() -> None:
+    """
+    Test that the content after info.version is not parsed.
+    """
+    assert extract_oas_version(b"info:\n  version: 1.0.0\npaths: [unterminated\n") == "1.0.0"
+    assert extract_oas_version(b'{"info": {"version": "1.0.0"}, "paths": {unterminated') == "1.0.0"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("spec_file", ["examples/api-specs/v1/httpbin.yaml", "examples/api-specs/v2/httpbin.yaml"])
+def test_parse_oas_json_matches_yaml(spec_file: str, use_orjson: bool, tmpdir, mocker: Any) -> None:
+    """
+    Test that JSON specs parse to the same document as their YAML form, with and without orjson.
+    """
+    if use_orjson and utils.orjson_module() is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        mocker.patch.object(utils, "orjson_module", return_value=None)
+    document = parse_yaml(read_file_content(spec_file))
+    json_spec = tmpdir.join("openapi.json")
+    json_spec.write(json.dumps(document, indent=2))
+    parse = mocker.spy(utils, "load_yaml")
+
+    assert parse_oas(read_file_content(str(json_spec)), str(json_spec)) == document
+    # JSON content is detected without the extension too
+    assert parse_oas(json.dumps(document).encode("utf-8")) == document
+    parse.assert_not_called()
+
+
+def test_parse_oas_falls_back_to_yaml() -> None:
+    """
+    Test that YAML content, including flow mappings that look like JSON, is parsed as YAML.
+    """
+    assert parse_oas(b"openapi: 3.0.3\ninfo: {version: 1.0.0}\n", "openapi.yaml") == {
+        "openapi": "3.0.3", "info": {"version": "1.0.0"}}
+    assert parse_oas(b"{openapi: 3.0.3, info: {version: 1.0.0}}", "openapi.json") == {
+        "openapi": "3.0.3", "info": {"version": "1.0.0"}}
+
+
+def test_check_state_raises_validation_errors() -> None:
+    """
+    Test that invalid states raise the structured validation errors instead of exiting.
+    """
+    with pytest.raises(utils.InvalidStateError) as error:
+        utils.check_state({"_version": "1.0.0", "info": {}})
+
+    assert {"path": "info.name", "message": "Missing or invalid 'info.name'"} in \
+        [validation_error.to_dict() for validation_error in error.value.errors]
@@ -1,7 +1,13 @@
+import glob
+import os
 import unittest
 from uuid import uuid4
+import yaml
+from kptl.helpers import validator as validator_module
 from kptl.helpers.validator import ProductStateValidator
 
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "examples")
+
 class TestProductStateValidator(unittest.TestCase):
 
     def test_valid_schema(self):
@@ -254,5 +260,122 @@ class TestProductStateValidator(unittest.TestCase):
         is_valid, errors = validator.validate()
         self.assertFalse(is_valid)
 
+    def test_error_paths(self):
+        schema = {
+            "_version": "1.0.0",
+            "info": {
+                "name": "Test Product"
+            },
+            "portals": [
+                {
+                    "portal_name": "Test Portal"
+                }
+            ],
+            "versions": [
+                {
+                    "spec": "spec-v1",
+                    "portals": [
+                        {
+                            "portal_name": "Test Portal",
+                            "publish_status": "draft"
+                        },
+                        {
+                            "portal_name": "Other Portal"
+                        }
+                    ]
+                }
+            ]
+        }
+        validator = ProductStateValidator(schema)
+        is_valid, errors = validator.validate()
+        self.assertFalse(is_valid)
+        self.assertEqual([error.to_dict() for error in errors], [
+            {
+                "path": "versions[0].portals[0].publish_status",
+                "message": "The 'publish_status' in 'versions[0].portals[0]' must be either 'published' or 'unpublished'."
+            },
+            {
+                "path": "versions[0].portals[1].portal_name",
+                "message": "The 'portal_name' in 'versions[0].portals[1]' does not match any portal in the root 'portals' list."
+            }
+        ])
+
+    def test_version_portals_without_root_portals(self):
+        schema = {
+            "_version": "1.0.0",
+            "info": {
+                "name": "Test Product"
+            },
+            "versions": [
+                {
+                    "spec": "spec-v1",
+                    "portals": [
+                        {
+                            "portal_id": str(uuid4())
+                        }
+                    ]
+                }
+            ]
+        }
+        validator = ProductStateValidator(schema)
+        is_valid, errors = validator.validate()
+        self.assertFalse(is_valid)
+        self.assertEqual([error.path for error in errors], ["versions[0].portals[0].portal_id"])
+
+    def test_missing_fields_and_invalid_entries(self):
+        schema = {
+            "_version": "1.0.0",
+            "info": {},
+            "versions": [
+                "spec-v1",
+                {
+                    "portals": [
+                        {
+                            "portal_name": "Test Portal",
+                            "auth_strategies": [{}]
+                        }
+                    ]
+                }
+            ]
+        }
+        validator = ProductStateValidator(schema)
+        is_valid, errors = validator.validate()
+        self.assertFalse(is_valid)
+        self.assertEqual([error.to_dict() for error in errors], [
+            {"path": "info.name", "message": "Missing or invalid 'info.name'"},
+            {"path": "versions[0]", "message": "Each version entry in 'versions' must be a dictionary. Error at index 0."},
+            {"path": "versions[1].spec", "message": "The 'spec' in 'versions[1]' is missing or not a string."},
+            {
+                "path": "versions[1].portals[0].auth_strategies[0].id",
+                "message": "The 'id' in 'versions[1].portals[0].auth_strategies[0]' is missing."
+            },
+            {
+                "path": "versions[1].portals[0].portal_name",
+                "message": "The 'portal_name' in 'versions[1].portals[0]' does not match any portal in the root 'portals' list."
+            }
+        ])
+
+    def test_example_states(self):
+        state_files = glob.glob(os.path.join(EXAMPLES_DIR, "products", "*", "*.yaml"))
+        self.assertTrue(state_files)
+        for state_file in state_files:
+            with open(state_file, encoding="utf-8") as f:
+                is_valid, errors = ProductStateValidator(yaml.safe_load(f)).validate()
+            self.assertTrue(is_valid, f"{state_file}: {errors}")
+
+    def test_schema_compiled_once(self):
+        validator_module.compiled_schema.cache_clear()
+        for _ in range(3):
+            ProductStateValidator({"_version": "1.0.0", "info": {"name": "Test Product"}}).validate()
+        self.assertEqual(validator_module.compiled_schema.cache_info().misses, 1)
+
+    def test_generated_validator_is_up_to_date(self):
+        # Run `make schema-validator` after changing the schema
+        self.assertEqual(validator_module.state_schema.SCHEMA_DIGEST, validator_module.schema_digest())
+        with open(validator_module.state_schema.__file__, encoding="utf-8") as f:
+            self.assertEqual(f.read(), validator_module.generate_validator_code())
+        validator_module.compiled_schema.cache_clear()
+        self.assertIs(validator_module.compiled_schema(), validator_module.state_schema.validate)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import hashlib
 import pytest
 from unittest.mock import MagicMock
 from src.kptl.helpers.utils import encode_content
@@ -90,7 +91,7 @@ def test_sync_pages_create_new_page(konnect_api: KonnectApi, mocker: Any) -> Non
 
 def test_sync_pages_update_existing_page(konnect_api: KonnectApi, mocker: Any) -> None:
     local_pages: List[Dict[str, Any]] = [
-        {"slug": "existing_page", "title": "Existing Page", "parent_slug": None, "content": encode_content("Updated content"), "status": "published"}
+        {"slug": "existing_page", "title": "Existing Page", "parent_slug": None, "content": encode_content("Updated content"), "digest": hashlib.sha256(b"Updated content").hexdigest(), "status": "published"}
     ]
     remote_pages: List[Dict[str, Any]] = [
         {"slug": "existing_page", "id": "existing_page_id"}
@@ -115,7 +116,7 @@ def test_sync_pages_update_existing_page(konnect_api: KonnectApi, mocker: Any) -
 
 def test_sync_pages_no_changes(konnect_api: KonnectApi, mocker: Any) -> None:
     local_pages: List[Dict[str, Any]] = [
-        {"slug": "existing_page", "title": "Existing Page", "parent_slug": None, "content": encode_content("Same content"), "status": "published"}
+        {"slug": "existing_page", "title": "Existing Page", "parent_slug": None, "content": encode_content("Same content"), "digest": hashlib.sha256(b"Same content").hexdigest(), "status": "published"}
     ]
     remote_pages: List[Dict[str, Any]] = [
         {"slug": "existing_page", "id": "existing_page_id", "title": "Existing Page", "content": "Same content", "status": "published"}
@@ -0,0 +1,72 @@
+"""
+Unit tests for the state models.
+"""
+
+import dataclasses
+
+from src.kptl.konnect.models.schema import ApiProductState, ApiProductVersionPortal, Documents, to_dict
+
+STATE = {
+    "_version": "1.0.0",
+    "info": {"name": "HTTPBin", "description": "An HTTP test service"},
+    "documents": {"sync": True, "dir": "docs"},
+    "portals": [
+        {"portal_name": "prod"},
+        {"portal_id": "a2e6f8d4-1f6b-4b8e-9c1f-0c3b5b7d9e11", "portal_name": "dev"},
+    ],
+    "versions": [
+        {
+            "name": "2.0.0",
+            "spec": "v2.yaml",
+            "portals": [
+                {"portal_name": "prod", "publish_status": "unpublished"},
+                {"portal_name": "dev", "auth_strategies": [{"id": "c1f2e3d4-5b6a-4c7d-8e9f-0a1b2c3d4e5f"}]},
+            ],
+        },
+        {"name": "1.0.0", "spec": "v1.yaml", "gateway_service": {"id": None, "control_plane_id": None}},
+    ],
+}
+
+
+def test_from_dict_sorts_portals_and_versions() -> None:
+    """
+    Test that the portals and versions are sorted by name.
+    """
+    state = ApiProductState().from_dict(STATE)
+
+    assert [p.portal_name for p in state.portals] == ["dev", "prod"]
+    assert [v.name for v in state.versions] == ["1.0.0", "2.0.0"]
+    assert [p.portal_name for p in state.versions[1].portals] == ["dev", "prod"]
+    assert state.versions[1].portals[1].publish_status == "unpublished"
+    assert state.versions[1].portals[0].auth_strategies[0].id == "c1f2e3d4-5b6a-4c7d-8e9f-0a1b2c3d4e5f"
+    assert state.documents.directory == "docs"
+
+
+def test_from_dict_without_portals() -> None:
+    """
+    Test that a state without portals, which the schema allows, has no portals.
+    """
+    state = ApiProductState().from_dict({"_version": "1.0.0", "info": {"name": "HTTPBin"}})
+
+    assert state.portals == []
+    assert state.versions == []
+
+
+def test_to_dict_matches_asdict() -> None:
+    """
+    Test that to_dict builds the same dictionaries as dataclasses.asdict.
+    """
+    state = ApiProductState().from_dict(STATE)
+    state.documents.set_data([{"slug": "parent/child", "title": "Child", "content": "Q2hpbGQ=", "status": "published"}])
+
+    assert state.to_dict() == dataclasses.asdict(state)
+    assert state.to_dict()["documents"]["data"][0]["slug"] == "child"
+    assert to_dict(state.versions) == [dataclasses.asdict(v) for v in state.versions]
+
+
+def test_models_are_slotted() -> None:
+    """
+    Test that model instances have no __dict__.
+    """
+    for model in (ApiProductState(), Documents(), ApiProductVersionPortal()):
+        assert not hasattr(model, "__dict__")
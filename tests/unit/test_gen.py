@@ -0,0 +1,115 @@
+"""
+Unit tests for the synthetic fixture generator.
+"""
+
+import os
+import subprocess
+import sys
+
+import yaml
+
+from src.kptl import gen
+from src.kptl.helpers import api_product_documents
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def read_tree(directory) -> dict:
+    """
+    Read the files of a directory tree by relative path.
+    """
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                files[os.path.relpath(os.path.join(root, name), directory)] = f.read()
+    return files
+
+
+def test_synthetic_spec_size() -> None:
+    """
+    Test that specs have the requested number of paths and schemas, and valid references.
+    """
+    spec = gen.synthetic_spec(paths=30, schemas=7, version="2.0.0")
+
+    assert len(spec["paths"]) == 30
+    assert len(spec["components"]["schemas"]) == 7
+    assert spec["info"]["version"] == "2.0.0"
+    refs = {path["get"]["responses"]["200"]["content"]["application/json"]["schema"]["$ref"]
+            for path in spec["paths"].values()}
+    assert refs == {f"#/components/schemas/Model{i}" for i in range(7)}
+
+
+def test_synthetic_spec_seed() -> None:
+    """
+    Test that specs only depend on their seed.
+    """
+    assert gen.synthetic_spec(20, 5, seed=1) == gen.synthetic_spec(20, 5, seed=1)
+    assert gen.synthetic_spec(20, 5, seed=1) != gen.synthetic_spec(20, 5, seed=2)
+
+
+def test_portal_names() -> None:
+    """
+    Test that portals are named as the portals of the mock server.
+    """
+    assert gen.portal_names(1) == ["dev_portal"]
+    assert gen.portal_names(4) == ["dev_portal", "prod_portal", "portal_2", "portal_3"]
+
+
+def test_write_docs_hierarchy(tmp_path) -> None:
+    """
+    Test that documents are named with their hierarchy and unpublished marker.
+    """
+    names = gen.write_docs(str(tmp_path), docs=10, size=100, children=2, unpublished=0.5, seed=3)
+
+    assert [name.split("_")[0] for name in names] == ["0", "0.1", "0.2", "1", "1.1", "1.2", "2", "2.1", "2.2", "3"]
+    assert sorted(os.listdir(tmp_path)) == sorted(names)
+    assert 0 < sum(name.endswith("__unpublished.md") for name in names) < 10
+
+    pages = api_product_documents.parse_directory(str(tmp_path), with_content=False)
+    children = [page for page in pages if page["parent_slug"]]
+    assert len(pages) == 10
+    assert len(children) == 6
+    assert all(page["parent_slug"].split("-")[0] == page["slug"].split("-")[0] for page in children)
+
+
+def test_write_docs_size(tmp_path) -> None:
+    """
+    Test that documents have about the requested size.
+    """
+    gen.write_docs(str(tmp_path), docs=5, size=4096)
+
+    for path in tmp_path.iterdir():
+        assert 4096 <= path.stat().st_size < 4096 * 2
+
+
+def test_write_product_deterministic(tmp_path) -> None:
+    """
+    Test that products only depend on their arguments.
+    """
+    gen.write_product(str(tmp_path / "a"), docs=8, versions=2, paths=10, seed=5)
+    gen.write_product(str(tmp_path / "b"), docs=8, versions=2, paths=10, seed=5)
+    gen.write_product(str(tmp_path / "c"), docs=8, versions=2, paths=10, seed=6)
+
+    first, second, third = (read_tree(tmp_path / name) for name in "abc")
+    del first["state.yaml"], second["state.yaml"], third["state.yaml"]
+    assert first == second
+    assert first != third
+
+
+def test_write_product_state(tmp_path) -> None:
+    """
+    Test that products publish every version on every portal and pass `kptl validate`.
+    """
+    state_path = gen.write_product(str(tmp_path), docs=5, versions=3, portals=3, paths=10, spec_format="json")
+
+    with open(state_path, encoding="utf-8") as f:
+        state = yaml.safe_load(f)
+    assert [version["name"] for version in state["versions"]] == ["1.0.0", "2.0.0", "3.0.0"]
+    assert all(version["spec"].endswith(".json") for version in state["versions"])
+    assert all(len(version["portals"]) == 3 for version in state["versions"])
+
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT_DIR, "src"))
+    result = subprocess.run([sys.executable, "-m", "kptl.main", "validate", state_path],
+                            capture_output=True, text=True, env=env, check=False)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,50 @@
+"""
+Unit tests for the CLI entry point.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+STATE_FILE = os.path.join(ROOT_DIR, "examples", "products", "httpbin", "state.yaml")
+
+
+def imported_modules(argv) -> set:
+    """
+    Run the CLI with the given arguments in a fresh interpreter and return the imported modules.
+    """
+    code = (
+        "import sys\n"
+        "from kptl.main import main\n"
+        f"sys.argv = {['kptl'] + argv!r}\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stdout.write('\\n' + ' '.join(sys.modules))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT_DIR, "src"))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, env=env, cwd=ROOT_DIR, check=True)
+    return set(result.stdout.splitlines()[-1].split())
+
+
+@pytest.mark.parametrize("argv", [
+    ["--version"],
+    ["validate", STATE_FILE],
+    ["explain", STATE_FILE],
+])
+def test_offline_commands_do_not_import_network_dependencies(argv) -> None:
+    """
+    Test that offline commands do not import the HTTP client, the diff library or unused commands.
+    """
+    modules = imported_modules(argv)
+
+    assert "requests" not in modules
+    assert "deepdiff" not in modules
+    assert "kptl.konnect.api" not in modules
+    assert "kptl.commands.sync" not in modules
+    assert "orjson" not in modules
@@ -0,0 +1,57 @@
+"""
+Unit tests for the stores and the fault injection of the mock Konnect API.
+"""
+
+import random
+import pytest
+from mock.faults import Faults, parse_latency
+from mock.store import Store
+
+
+def test_store_filters_by_index() -> None:
+    """
+    Test that items are found by their indexed fields, and re-indexed when they change.
+    """
+    store = Store(["api_product_id"])
+    first = store.create({"api_product_id": "p1", "slug": "intro"})
+    second = store.create({"api_product_id": "p1", "slug": "guide"})
+    store.create({"api_product_id": "p2", "slug": "intro"})
+
+    assert store.get(first["id"]) is first
+    assert store.filter({"api_product_id": "p1"}) == [first, second]
+    assert store.filter({"api_product_id": "p1", "slug": "guide"}) == [second]
+    assert store.find({"slug": "intro"}) is first
+
+    store.update(second, {"api_product_id": "p2"})
+    assert store.filter({"api_product_id": "p1"}) == [first]
+    assert len(store.filter({"api_product_id": "p2"})) == 2
+
+    assert store.delete(first["id"])
+    assert not store.delete(first["id"])
+    assert store.filter({"api_product_id": "p1"}) == []
+    assert "p1" not in store.indexes["api_product_id"]
+
+
+def test_parse_latency() -> None:
+    """
+    Test the latency distributions, sampled in seconds and never negative.
+    """
+    rng = random.Random(1)
+    assert parse_latency("constant:20", rng)() == 0.02
+    assert 0.01 <= parse_latency("uniform:10:50", rng)() <= 0.05
+    assert all(parse_latency("normal:0:100", rng)() >= 0 for _ in range(100))
+    with pytest.raises(ValueError):
+        parse_latency("normal:20", rng)
+
+
+def test_faults_from_env() -> None:
+    """
+    Test that the configured share of requests gets 429 errors with a Retry-After header.
+    """
+    faults = Faults.from_env({"MOCK_RATE_429": "0.5", "MOCK_RETRY_AFTER": "2", "MOCK_SEED": "3"})
+
+    results = [faults.fault() for _ in range(1000)]
+
+    assert all(result == (429, {"Retry-After": "2"}) for result in results if result)
+    assert 400 < sum(1 for result in results if result) < 600
+    assert Faults.from_env({}).fault() is None